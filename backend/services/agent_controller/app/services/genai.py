@@ -51,7 +51,11 @@ class GenAI:
             "model": self.model,
             "temperature": self.temperature,
         }
-        headers = {"Content-Type": "application/json"}
+        headers = {
+            "Content-Type": "application/json",
+            # Pipeline stage label for gen_ai_provider latency/token/cost metrics
+            "X-Caller-Stage": "rag_chat",
+        }
 
         try:
             client = await get_http_client()
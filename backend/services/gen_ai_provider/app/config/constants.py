@@ -1,3 +1,4 @@
+import json
 import os
 
 SERVICE_NAME = os.getenv("SERVICE_NAME", "gen-ai-service")
@@ -22,3 +23,112 @@ MAPPING_AI_PROVIDER_TO_MODEL = {
     "ollama": "Ollama",
     "gemini": "Gemini",
 }
+
+# Model registry (model -> provider routing)
+MODEL_REGISTRY_TTL_SECONDS = int(os.getenv("MODEL_REGISTRY_TTL_SECONDS", 300))
+MODEL_REGISTRY_REFRESH_INTERVAL = int(os.getenv("MODEL_REGISTRY_REFRESH_INTERVAL", 240))
+MODEL_REGISTRY_MISS_REFRESH_INTERVAL = int(os.getenv("MODEL_REGISTRY_MISS_REFRESH_INTERVAL", 30))
+MODEL_REGISTRY_PROVIDER_TIMEOUT = float(os.getenv("MODEL_REGISTRY_PROVIDER_TIMEOUT", 5))
+
+# Response caches (persistent tier: "redis", "disk" or "none")
+GENAI_CACHE_BACKEND = os.getenv("GENAI_CACHE_BACKEND", "disk").lower()
+GENAI_CACHE_DIR = os.getenv("GENAI_CACHE_DIR", "/tmp/genai_cache")
+# Disk tier: rows kept per cache (oldest evicted first) and how often expired rows are purged
+GENAI_DISK_CACHE_MAX_ROWS = int(os.getenv("GENAI_DISK_CACHE_MAX_ROWS", 20000))
+GENAI_DISK_CACHE_PURGE_INTERVAL = int(os.getenv("GENAI_DISK_CACHE_PURGE_INTERVAL", 600))
+REDIS_HOST = os.getenv("REDIS_HOST", "redis")
+REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
+REDIS_DB = int(os.getenv("REDIS_DB", 1))
+CHAT_CACHE_ENABLED = os.getenv("CHAT_CACHE_ENABLED", "true").lower() == "true"
+CHAT_CACHE_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_MAX_ENTRIES", 1024))
+CHAT_CACHE_TTL_SECONDS = int(os.getenv("CHAT_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", 5000))
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+# Embedding micro-batching
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", 256))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", 5))
+EMBEDDING_BATCH_MAX_TOKENS = int(os.getenv("EMBEDDING_BATCH_MAX_TOKENS", 250000))
+
+# Provider scheduling
+# Priority classes, lower value is served first
+PRIORITY_CLASSES = {"interactive": 0, "cv_parsing": 1, "bulk": 2}
+DEFAULT_PRIORITY = os.getenv("DEFAULT_REQUEST_PRIORITY", "interactive")
+PROVIDER_MAX_CONCURRENCY = int(os.getenv("PROVIDER_MAX_CONCURRENCY", 64))
+# JSON map of provider class or model name -> {"concurrency": int, "rpm": int, "tpm": int}
+# e.g. {"OpenAIService": {"rpm": 3000, "tpm": 1000000}, "gpt-4o": {"concurrency": 16}}
+PROVIDER_RATE_LIMITS = json.loads(os.getenv("PROVIDER_RATE_LIMITS", "{}"))
+SCHEDULER_MAX_QUEUE_WAIT_SECONDS = float(os.getenv("SCHEDULER_MAX_QUEUE_WAIT_SECONDS", 120))
+# Completion tokens assumed when reserving the tokens-per-minute budget for a chat call
+CHAT_COMPLETION_TOKENS_ESTIMATE = int(os.getenv("CHAT_COMPLETION_TOKENS_ESTIMATE", 512))
+
+# Chat resilience
+# JSON map of model -> fallback model used for failover and hedging, e.g. {"gpt-4o": "gpt-4o-mini"}
+CHAT_FALLBACK_MODELS = json.loads(os.getenv("CHAT_FALLBACK_MODELS", "{}"))
+# Hedging: duplicate a call still running after the rolling latency percentile of its model
+HEDGING_ENABLED = os.getenv("HEDGING_ENABLED", "false").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 0.95))
+HEDGE_LATENCY_WINDOW = int(os.getenv("HEDGE_LATENCY_WINDOW", 200))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+HEDGE_MIN_DELAY_SECONDS = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", 1.0))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+
+# Single-flight: identical concurrent requests share one upstream call
+SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+# Cross-replica coalescing of cacheable chat calls through a Redis lock (needs GENAI_CACHE_BACKEND=redis)
+SINGLE_FLIGHT_REDIS_ENABLED = os.getenv("SINGLE_FLIGHT_REDIS_ENABLED", "false").lower() == "true"
+SINGLE_FLIGHT_LOCK_TTL_SECONDS = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL_SECONDS", 120))
+SINGLE_FLIGHT_POLL_INTERVAL_MS = int(os.getenv("SINGLE_FLIGHT_POLL_INTERVAL_MS", 250))
+
+# Batch chat
+CHAT_BATCH_MAX_ITEMS = int(os.getenv("CHAT_BATCH_MAX_ITEMS", 100))
+# Items of one batch running at the same time (the provider scheduler still applies)
+CHAT_BATCH_MAX_CONCURRENCY = int(os.getenv("CHAT_BATCH_MAX_CONCURRENCY", 16))
+
+# Local stub provider for offline load tests
+# "off", "on" (stub models listed next to the real providers) or "all" (stub answers every model)
+LOCAL_STUB_MODE = os.getenv("LOCAL_STUB_MODE", "off").lower()
+LOCAL_STUB_CHAT_MODEL = os.getenv("LOCAL_STUB_CHAT_MODEL", "local-stub")
+LOCAL_STUB_EMBEDDING_MODEL = os.getenv("LOCAL_STUB_EMBEDDING_MODEL", "local-stub-embedding")
+LOCAL_STUB_EMBEDDING_DIMENSIONS = int(os.getenv("LOCAL_STUB_EMBEDDING_DIMENSIONS", 3072))
+# Latency is log-normal: median in ms, sigma 0 for a fixed delay
+LOCAL_STUB_LATENCY_MS = float(os.getenv("LOCAL_STUB_LATENCY_MS", 800))
+LOCAL_STUB_LATENCY_SIGMA = float(os.getenv("LOCAL_STUB_LATENCY_SIGMA", 0.5))
+LOCAL_STUB_EMBEDDING_LATENCY_MS = float(os.getenv("LOCAL_STUB_EMBEDDING_LATENCY_MS", 50))
+LOCAL_STUB_STREAM_CHUNK_MS = float(os.getenv("LOCAL_STUB_STREAM_CHUNK_MS", 20))
+LOCAL_STUB_ERROR_RATE = float(os.getenv("LOCAL_STUB_ERROR_RATE", 0.0))
+LOCAL_STUB_RATE_LIMIT_RATE = float(os.getenv("LOCAL_STUB_RATE_LIMIT_RATE", 0.0))
+
+# Usage accounting
+# Pipeline stages accepted in X-Caller-Stage (metrics label); other values are reported as "other"
+CALLER_STAGES = {"cv_parse", "match", "approve_summary", "interview_questions", "rag_chat"}
+# JSON map of model -> USD per million tokens {"prompt": float, "completion": float}
+MODEL_PRICING = json.loads(
+    os.getenv(
+        "MODEL_PRICING",
+        json.dumps(
+            {
+                "gpt-4o": {"prompt": 2.5, "completion": 10.0},
+                "gpt-4o-mini": {"prompt": 0.15, "completion": 0.6},
+                "text-embedding-3-small": {"prompt": 0.02},
+                "text-embedding-3-large": {"prompt": 0.13},
+            }
+        ),
+    )
+)
+
+# Ollama
+OLLAMA_URL = os.getenv("OLLAMA_URL", f"{SCHEMA}://ollama:11434")
+# How long Ollama keeps a model loaded after a request: a duration ("30m", "-1m" keeps it loaded)
+# or a number of seconds ("-1" keeps it loaded). Ollama rejects numbers sent as strings, so they go out as ints
+_OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m").strip()
+OLLAMA_KEEP_ALIVE = int(_OLLAMA_KEEP_ALIVE) if _OLLAMA_KEEP_ALIVE.lstrip("-").isdigit() else _OLLAMA_KEEP_ALIVE
+# Context window; unset keeps the model default
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX")) if os.getenv("OLLAMA_NUM_CTX") else None
+OLLAMA_REQUEST_TIMEOUT = float(os.getenv("OLLAMA_REQUEST_TIMEOUT", 900))
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", 10))
+OLLAMA_CATALOG_TIMEOUT = float(os.getenv("OLLAMA_CATALOG_TIMEOUT", 10))
+OLLAMA_POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", 20))
+# Comma-separated models loaded into memory at startup
+OLLAMA_PRELOAD_MODELS = [m.strip() for m in os.getenv("OLLAMA_PRELOAD_MODELS", "").split(",") if m.strip()]
@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from routers import router
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,6 +9,11 @@ from config.constants import *
 from metrics.otel_setup import setup_otel
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
+from services.service_factory import model_registry
+from services.ollama_service import (
+    close_async_client as close_ollama_client,
+    preload_models as preload_ollama_models,
+)
 
 logger = AppLogger(__name__)
 
@@ -22,6 +28,26 @@ app = FastAPI(
 )
 
 
+_background_tasks = set()
+
+
+@app.on_event("startup")
+async def start_background_services():
+    # Load the model catalog in the background so the first chat call does not pay for it
+    model_registry.start()
+    if OLLAMA_PRELOAD_MODELS and LOCAL_STUB_MODE != "all":
+        # Warm up self-hosted models without delaying startup
+        task = asyncio.create_task(preload_ollama_models(OLLAMA_PRELOAD_MODELS))
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+
+@app.on_event("shutdown")
+async def shutdown_clients():
+    model_registry.stop()
+    await close_ollama_client()
+
+
 @app.get("/metrics")
 def metrics():
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
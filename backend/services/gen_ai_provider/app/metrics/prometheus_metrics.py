@@ -1,6 +1,51 @@
-from prometheus_client import Counter
+from prometheus_client import Counter, Gauge, Histogram
 
 GET_MODELS_REQUESTS = Counter("genai_get_models_requests_total", "Total get_available_models calls", ["provider"])
 GET_MODELS_ERRORS = Counter("genai_get_models_errors_total", "Total errors in get_available_models", ["provider"])
 CHAT_REQUESTS = Counter("genai_chat_requests_total", "Total chat requests", ["provider"])
-CHAT_ERRORS = Counter("genai_chat_errors_total", "Total chat request errors", ["provider"])
\ No newline at end of file
+CHAT_ERRORS = Counter("genai_chat_errors_total", "Total chat request errors", ["provider"])
+
+# Model registry
+MODEL_REGISTRY_HITS = Counter("genai_model_registry_hits_total", "Model lookups resolved from the cached catalog")
+MODEL_REGISTRY_MISSES = Counter("genai_model_registry_misses_total", "Model lookups not found in the cached catalog")
+MODEL_CATALOG_LAST_REFRESH = Gauge("genai_model_catalog_last_refresh_timestamp_seconds", "Unix time of the last successful catalog refresh", ["provider"])
+MODEL_CATALOG_SIZE = Gauge("genai_model_catalog_models", "Number of models currently routed to a provider", ["provider"])
+
+# Chat response cache
+CHAT_CACHE_HITS = Counter("genai_chat_cache_hits_total", "Chat completions served from cache", ["tier"])
+CHAT_CACHE_MISSES = Counter("genai_chat_cache_misses_total", "Cacheable chat completions not found in cache")
+
+# Embedding cache
+EMBEDDING_CACHE_LOOKUPS = Counter("genai_embedding_cache_lookups_total", "Texts looked up in the embedding cache", ["model"])
+EMBEDDING_CACHE_HITS = Counter("genai_embedding_cache_hits_total", "Texts whose embedding was served from cache", ["model", "tier"])
+EMBEDDING_BATCHES = Counter("genai_embedding_batches_total", "Upstream embedding calls made by the batcher", ["model"])
+EMBEDDING_BATCHED_REQUESTS = Counter("genai_embedding_batched_requests_total", "Embedding requests coalesced into upstream batches", ["model"])
+
+# Provider scheduler
+SCHEDULER_QUEUE_DEPTH = Gauge("genai_scheduler_queue_depth", "Requests waiting for a provider slot", ["provider", "priority"])
+SCHEDULER_WAIT_SECONDS = Histogram("genai_scheduler_wait_seconds", "Time spent waiting for a provider slot", ["provider", "priority"], buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0])
+SCHEDULER_REJECTED = Counter("genai_scheduler_rejected_total", "Requests rejected after waiting too long for a slot", ["provider"])
+PROVIDER_RATE_LIMITED = Counter("genai_provider_rate_limited_total", "HTTP 429 responses received from providers", ["provider"])
+
+# Chat resilience
+HEDGED_REQUESTS = Counter("genai_hedged_requests_total", "Chat calls duplicated to a hedge", ["reason"])
+HEDGE_WINS = Counter("genai_hedge_wins_total", "Hedged chat calls answered by the hedge first")
+CHAT_FAILOVERS = Counter("genai_chat_failovers_total", "Chat calls failed over to the fallback model", ["model", "fallback"])
+CIRCUIT_BREAKER_STATE = Gauge("genai_circuit_breaker_state", "Provider circuit breaker state (0 closed, 1 half-open, 2 open)", ["provider"])
+
+# Single-flight
+SINGLE_FLIGHT_COALESCED = Counter("genai_single_flight_coalesced_total", "Requests served by joining an identical in-flight call", ["kind", "scope"])
+
+# Batch chat
+CHAT_BATCH_SIZE = Histogram("genai_chat_batch_size", "Requests per /chat/batch call", buckets=[1, 2, 5, 10, 20, 50, 100])
+
+# Latency, tokens and cost per provider, model and caller stage (X-Caller-Stage)
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0]
+TOKEN_BUCKETS = [16, 64, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768]
+LLM_TTFB_SECONDS = Histogram("genai_llm_time_to_first_byte_seconds", "Time until the first streamed token", ["provider", "model", "stage"], buckets=LATENCY_BUCKETS)
+LLM_LATENCY_SECONDS = Histogram("genai_llm_latency_seconds", "Provider call duration", ["provider", "model", "stage"], buckets=LATENCY_BUCKETS)
+LLM_PROMPT_TOKENS = Histogram("genai_llm_prompt_tokens", "Prompt tokens per provider call", ["provider", "model", "stage"], buckets=TOKEN_BUCKETS)
+LLM_COMPLETION_TOKENS = Histogram("genai_llm_completion_tokens", "Completion tokens per provider call", ["provider", "model", "stage"], buckets=TOKEN_BUCKETS)
+LLM_TOKENS = Counter("genai_llm_tokens_total", "Tokens consumed", ["provider", "model", "stage", "kind"])
+LLM_COST_USD = Counter("genai_llm_cost_usd_total", "Estimated spend from MODEL_PRICING", ["provider", "model", "stage"])
+EMBEDDING_BATCH_SIZE = Histogram("genai_embedding_batch_size", "Texts per upstream embedding call", ["model"], buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048])
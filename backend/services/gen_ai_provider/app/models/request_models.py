@@ -1,14 +1,36 @@
-from typing import List, Dict, Optional, Union
+from typing import Any, List, Dict, Literal, Optional, Union
 from pydantic import BaseModel, Field
 from config.constants import DEFAULT_MODEL_NAME, DEFAULT_EMBEDDING_MODEL
 
 
+class ResponseFormat(BaseModel):
+    """Structured output, in the shape of OpenAI's ``response_format``."""
+
+    type: Literal["text", "json_object", "json_schema"] = "text"
+    json_schema: Optional[Dict[str, Any]] = Field(
+        None, description='For type json_schema: {"name": ..., "schema": {...}, "strict": true}'
+    )
+
+
 class ChatRequest(BaseModel):
     model: str = DEFAULT_MODEL_NAME
     messages: List[Dict[str, str]] = Field([{"role": "user", "content": "Hello"}])
     temperature: float = 0.5
+    response_format: Optional[ResponseFormat] = None
+
+
+class BatchChatRequest(BaseModel):
+    model: str = DEFAULT_MODEL_NAME
+    requests: List[List[Dict[str, str]]] = Field(
+        ..., min_length=1, description="Independent message lists, answered in the same order"
+    )
+    temperature: float = 0.5
+    response_format: Optional[ResponseFormat] = None
 
 
 class EmbeddingRequest(BaseModel):
     model: str = DEFAULT_EMBEDDING_MODEL
     input: Union[str, List[str]] = Field(..., description="Text or list of texts to embed")
+    dimensions: Optional[int] = Field(
+        None, gt=0, description="Output dimension for models that support shortening (text-embedding-3-*)"
+    )
@@ -5,3 +5,4 @@ class StandardResponse(BaseModel):
     message: Optional[str] = None
     data: Optional[Any] = None
     error: Optional[Any] = None
+    usage: Optional[Any] = None
@@ -1,32 +1,95 @@
+import asyncio
+from typing import Optional
 from config.log_config import AppLogger
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse, StreamingResponse, Response
 from models.response_models import StandardResponse
-from models.request_models import ChatRequest, EmbeddingRequest
+from models.request_models import ChatRequest, BatchChatRequest, EmbeddingRequest
 from services.gen_ai_service import GenAIService
+from services.rate_limiter import ProviderRateLimitError
+from config.constants import CHAT_BATCH_MAX_ITEMS
+from utils.usage import Usage, set_caller_stage, start_request_usage
+from utils.streaming import (
+    SSE_MEDIA_TYPE,
+    NDJSON_MEDIA_TYPE,
+    format_sse,
+    format_ndjson,
+)
+from utils.embedding_codec import (
+    OCTET_STREAM_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPES,
+    encode_octet_stream,
+    encode_msgpack,
+)
 
 router = APIRouter()
 logger = AppLogger(__name__)
 
 
+def _bypass_cache(request: Request) -> bool:
+    """Clients opt out of cached replies with Cache-Control: no-cache or X-Cache-Bypass: true."""
+    cache_control = request.headers.get("cache-control", "").lower()
+    return (
+        "no-cache" in cache_control
+        or request.headers.get("x-cache-bypass", "").lower() == "true"
+    )
+
+
+def _priority(request: Request):
+    """Scheduling class from the X-Request-Priority header (interactive, cv_parsing or bulk)."""
+    return request.headers.get("x-request-priority")
+
+
+def _start_request(request: Request) -> Usage:
+    """Labels metrics with the X-Caller-Stage pipeline stage and starts the request's usage."""
+    set_caller_stage(request.headers.get("x-caller-stage"))
+    return start_request_usage()
+
+
+def _rate_limited_response(e: ProviderRateLimitError) -> JSONResponse:
+    retry_after = max(1, int(round(e.retry_after or 1)))
+    return JSONResponse(
+        content=StandardResponse(
+            status="error",
+            message="Provider rate limited, retry later",
+            error=str(e),
+        ).dict(),
+        status_code=429,
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+def _response_format(request_model) -> Optional[dict]:
+    response_format = request_model.response_format
+    return response_format.dict(exclude_none=True) if response_format else None
+
+
 @router.post("/chat")
-def chat(chat_request: ChatRequest):
+async def chat(chat_request: ChatRequest, request: Request):
     """Processes a chat message and returns a response."""
+    usage = _start_request(request)
     try:
         logger.debug(f"Chat request: {chat_request}")
-        response = GenAIService.chat(
+        response = await GenAIService.achat(
             messages=chat_request.messages,
             model=chat_request.model,
             temperature=chat_request.temperature,
+            response_format=_response_format(chat_request),
+            bypass_cache=_bypass_cache(request),
+            priority=_priority(request),
         )
         logger.debug(f"Chat response: {response}")
         return JSONResponse(
             content=StandardResponse(
                 status="success",
                 data=response,
+                usage=usage.as_dict(),
             ).dict(),
             status_code=200,
         )
+    except ProviderRateLimitError as e:
+        logger.warn(str(e))
+        return _rate_limited_response(e)
     except Exception as e:
         logger.exception(e)
     return JSONResponse(
@@ -38,17 +101,112 @@ def chat(chat_request: ChatRequest):
     )
 
 
+@router.post("/chat/batch")
+async def chat_batch(batch_request: BatchChatRequest, request: Request):
+    """
+    Answers several independent chat requests in one round trip.
+
+    Items run concurrently under the provider scheduler and are returned in
+    request order, each with its own status so one failure does not fail the batch.
+    """
+    if len(batch_request.requests) > CHAT_BATCH_MAX_ITEMS:
+        return JSONResponse(
+            content=StandardResponse(
+                status="error",
+                message=f"A batch holds at most {CHAT_BATCH_MAX_ITEMS} requests",
+            ).dict(),
+            status_code=400,
+        )
+    usage = _start_request(request)
+    try:
+        logger.debug(f"Chat batch request: {len(batch_request.requests)} items for {batch_request.model}")
+        results = await GenAIService.achat_batch(
+            model=batch_request.model,
+            requests=batch_request.requests,
+            temperature=batch_request.temperature,
+            response_format=_response_format(batch_request),
+            bypass_cache=_bypass_cache(request),
+            priority=_priority(request),
+        )
+        return JSONResponse(
+            content=StandardResponse(
+                status="success",
+                data=results,
+                usage=usage.as_dict(),
+            ).dict(),
+            status_code=200,
+        )
+    except Exception as e:
+        logger.exception(e)
+        return JSONResponse(
+            content=StandardResponse(
+                status="error",
+                message="Error processing chat batch request",
+                error=str(e),
+            ).dict(),
+            status_code=500,
+        )
+
+
+@router.post("/chat/stream")
+async def chat_stream(chat_request: ChatRequest, request: Request):
+    """
+    Streams the chat reply as it is generated.
+
+    Emits Server-Sent Events by default, or newline-delimited JSON when the
+    client sends ``Accept: application/x-ndjson``. Every provider produces the
+    same events: ``delta`` chunks followed by a final ``usage`` (or ``error``) event.
+    """
+    logger.debug(f"Chat stream request: {chat_request}")
+    use_ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+    formatter = format_ndjson if use_ndjson else format_sse
+
+    async def event_stream():
+        _start_request(request)
+        async for event in GenAIService.astream(
+            messages=chat_request.messages,
+            model=chat_request.model,
+            temperature=chat_request.temperature,
+            response_format=_response_format(chat_request),
+            priority=_priority(request),
+        ):
+            yield formatter(event)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type=NDJSON_MEDIA_TYPE if use_ndjson else SSE_MEDIA_TYPE,
+        # Disable proxy buffering so the first tokens reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/models", response_model=StandardResponse)
-async def models():
-    """Retrieve supported models."""
+async def models(request: Request):
+    """
+    Retrieve supported models.
+
+    The catalog carries an ETag; a matching If-None-Match gets 304. When some
+    provider failed or timed out on the last refresh its previous catalog is
+    served and X-Catalog-Partial is set.
+    """
     try:
-        models_data = GenAIService.get_available_models()
+        catalog = await asyncio.to_thread(GenAIService.get_model_catalog)
+        etag = f'"{catalog["etag"]}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "X-Catalog-Partial": "true" if catalog["partial"] else "false",
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            return Response(status_code=304, headers=headers)
         return JSONResponse(
             content=StandardResponse(
                 status="success",
-                data=models_data,
+                data=catalog["models"],
             ).dict(),
             status_code=200,
+            headers=headers,
         )
     except Exception as e:
         logger.exception(e)
@@ -62,23 +220,76 @@ async def models():
         )
 
 
+@router.get("/models/status", response_model=StandardResponse)
+async def models_status():
+    """Per-provider status of the last model catalog refresh."""
+    catalog = await asyncio.to_thread(GenAIService.get_model_catalog)
+    return JSONResponse(
+        content=StandardResponse(
+            status="success",
+            data={
+                "etag": catalog["etag"],
+                "loaded_at": catalog["loaded_at"],
+                "stale": catalog["stale"],
+                "partial": catalog["partial"],
+                "models": len(catalog["models"]),
+                "providers": catalog["providers"],
+            },
+        ).dict(),
+        status_code=200,
+    )
+
+
 @router.post("/embeddings")
-def embeddings(embedding_request: EmbeddingRequest):
-    """Creates embeddings for the given input text(s)."""
+async def embeddings(embedding_request: EmbeddingRequest, request: Request):
+    """
+    Creates embeddings for the given input text(s).
+
+    The response format is negotiated with the Accept header:
+    ``application/octet-stream`` returns a uint32 rows/dims header followed by
+    the little-endian float32 matrix, ``application/msgpack`` returns a map with
+    ``shape``, ``dtype`` and the same packed ``data``. Anything else gets JSON.
+    Errors are always returned as JSON.
+    """
+    usage = _start_request(request)
     try:
         logger.debug(f"Embedding request: {embedding_request}")
-        embeddings_data = GenAIService.embed(
+        embeddings_data = await GenAIService.aembed(
             input=embedding_request.input,
             model=embedding_request.model,
+            dimensions=embedding_request.dimensions,
+            priority=_priority(request),
         )
         logger.debug(f"Embedding response: {len(embeddings_data)} vectors")
+        accept = request.headers.get("accept", "")
+        # Binary bodies carry the usage in headers
+        usage_headers = {
+            "X-Usage-Prompt-Tokens": str(usage.prompt_tokens),
+            "X-Usage-Cached": str(usage.cached).lower(),
+        }
+        if OCTET_STREAM_MEDIA_TYPE in accept:
+            return Response(
+                content=encode_octet_stream(embeddings_data),
+                media_type=OCTET_STREAM_MEDIA_TYPE,
+                headers=usage_headers,
+            )
+        if any(media_type in accept for media_type in MSGPACK_MEDIA_TYPES):
+            return Response(
+                content=encode_msgpack(embeddings_data),
+                media_type=MSGPACK_MEDIA_TYPES[0],
+                headers=usage_headers,
+            )
         return JSONResponse(
             content=StandardResponse(
                 status="success",
                 data={"embeddings": embeddings_data},
+                usage=usage.as_dict(),
             ).dict(),
             status_code=200,
         )
+    except ProviderRateLimitError as e:
+        logger.warn(str(e))
+        return _rate_limited_response(e)
     except Exception as e:
         logger.exception(e)
         return JSONResponse(
@@ -1,7 +1,12 @@
 import os
-from anthropic import Anthropic
+from typing import AsyncIterator, Optional
+from anthropic import Anthropic, AsyncAnthropic
 from services.base_ai_service import BaseAIService
+from services.rate_limiter import is_rate_limited
 from config.log_config import AppLogger
+from utils.streaming import delta_event, usage_event
+from utils.usage import record_usage
+from utils.response_format import with_json_instruction
 
 logger = AppLogger(__name__)
 
@@ -10,21 +15,87 @@ class AnthropicAIService(BaseAIService):
         super().__init__(model)
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         self.client = Anthropic(api_key=api_key)
+        self.async_client = AsyncAnthropic(api_key=api_key)
 
-    def chat(self, messages: list) -> str:
+    def chat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
         """
         Chat with Claude using user/assistant role structure.
         System instructions should be included in the first user message.
+        Claude has no JSON mode; a requested format is added as an instruction.
         """
         try:
             response = self.client.messages.create(
-                model=self.model, messages=messages, max_tokens=128000
+                model=self.model,
+                messages=with_json_instruction(messages, response_format),
+                max_tokens=128000,
+                **self._sampling_options(temperature),
             )
+            record_usage(response.usage.input_tokens, response.usage.output_tokens)
             return response.content[0].text.strip()
         except Exception as e:
+            if is_rate_limited(e):
+                # Let the scheduler pause the provider and honour Retry-After
+                raise
             logger.error(f"Anthropic chat error: {e}")
             return "Error querying Claude."
 
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        Chat with Claude over the async client without blocking the event loop.
+
+        :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (None keeps Claude's default)
+        :param response_format: JSON mode or JSON schema, added as an instruction
+        :return: Claude's reply
+        """
+        # The SDK refuses non-streaming requests this large, so collect the stream instead
+        async with self.async_client.messages.stream(
+            model=self.model,
+            messages=with_json_instruction(messages, response_format),
+            max_tokens=128000,
+            **self._sampling_options(temperature),
+        ) as stream:
+            response = await stream.get_final_message()
+        record_usage(response.usage.input_tokens, response.usage.output_tokens)
+        return response.content[0].text.strip()
+
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streams Claude's reply token by token.
+
+        :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (None keeps Claude's default)
+        :param response_format: JSON mode or JSON schema, added as an instruction
+        :yield: Delta events followed by a usage event
+        """
+        async with self.async_client.messages.stream(
+            model=self.model,
+            messages=with_json_instruction(messages, response_format),
+            max_tokens=128000,
+            **self._sampling_options(temperature),
+        ) as stream:
+            async for text in stream.text_stream:
+                yield delta_event(text)
+            final_message = await stream.get_final_message()
+        yield usage_event(
+            final_message.usage.input_tokens, final_message.usage.output_tokens
+        )
+
     def get_available_models(self):
         return [
             {"name": "claude-3-opus", "model": "claude-3-opus-20240229"},
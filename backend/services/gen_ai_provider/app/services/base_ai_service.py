@@ -1,4 +1,8 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Optional
+
+from utils.streaming import delta_event, usage_event
 
 
 class BaseAIService(ABC):
@@ -6,9 +10,64 @@ class BaseAIService(ABC):
         self.model = model
 
     @abstractmethod
-    def chat(self, messages: list) -> str:
+    def chat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        :param temperature: Sampling temperature; None keeps the provider's default.
+        :param response_format: Structured output request in OpenAI's shape
+            (see utils.response_format); providers map it to their native JSON mode.
+        """
         pass
 
+    @staticmethod
+    def _sampling_options(temperature: Optional[float]) -> dict:
+        """Keyword arguments carrying the sampling temperature, when one was requested."""
+        return {"temperature": temperature} if temperature is not None else {}
+
     @abstractmethod
     def get_available_models(self):
         pass
+
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        Asynchronous chat. Providers with a native async client override this;
+        the default runs the blocking ``chat`` in a worker thread.
+        """
+        return await asyncio.to_thread(
+            self.chat, messages, temperature=temperature, response_format=response_format
+        )
+
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the reply as delta events followed by a final usage event
+        (see utils.streaming). Providers without native streaming emit the
+        whole reply as a single delta.
+        """
+        content = await self.achat(
+            messages, temperature=temperature, response_format=response_format
+        )
+        yield delta_event(content)
+        yield usage_event()
+
+    async def aembed(self, input, model: str, dimensions=None):
+        """
+        Asynchronous embeddings. Only available for providers implementing ``embed``.
+        """
+        embed = getattr(self, "embed", None)
+        if embed is None:
+            raise NotImplementedError(f"{self.__class__.__name__} does not support embeddings")
+        return await asyncio.to_thread(embed, input, model, dimensions)
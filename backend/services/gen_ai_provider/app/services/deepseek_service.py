@@ -1,12 +1,20 @@
 import os
-from openai import OpenAI
+from typing import AsyncIterator, Optional, Tuple
+from openai import OpenAI, AsyncOpenAI
 from services.base_ai_service import BaseAIService
+from services.openai_service import stream_chat_completion
+from services.rate_limiter import is_rate_limited
 from config.log_config import AppLogger
+from utils.usage import record_usage
+from utils.response_format import get_schema, wants_json, with_json_instruction
 
 logger = AppLogger(__name__)
 
 
 class DeepSeekAIService(BaseAIService):
+    # Used when the caller does not ask for a temperature
+    DEFAULT_TEMPERATURE = 0.7
+
     def __init__(self, model: str = "deepseek-chat"):
         """
         Initializes the DeepSeek AI service using OpenAI-compatible SDK.
@@ -18,23 +26,107 @@ class DeepSeekAIService(BaseAIService):
         base_url = os.environ.get("DEEPSEEK_API_BASE", "https://api.deepseek.com/v1")
 
         self.client = OpenAI(api_key=api_key, base_url=base_url)
+        self.async_client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+
+    @classmethod
+    def _temperature(cls, temperature: Optional[float]) -> float:
+        return cls.DEFAULT_TEMPERATURE if temperature is None else temperature
+
+    @staticmethod
+    def _structured(messages: list, response_format: Optional[dict]) -> Tuple[list, dict]:
+        """
+        DeepSeek only has JSON mode; a requested schema is passed in the prompt instead.
+        """
+        if not wants_json(response_format):
+            return messages, {}
+        if get_schema(response_format):
+            messages = with_json_instruction(messages, response_format)
+        return messages, {"response_format": {"type": "json_object"}}
 
-    def chat(self, messages: list) -> str:
+    def chat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
         """
         Sends a message to DeepSeek API and returns the response.
 
         :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (default DEFAULT_TEMPERATURE)
+        :param response_format: JSON mode or JSON schema
         :return: Model-generated reply
         """
         try:
+            messages, options = self._structured(messages, response_format)
             response = self.client.chat.completions.create(
-                model=self.model, messages=messages, max_tokens=2048, temperature=0.7
+                model=self.model,
+                messages=messages,
+                max_tokens=2048,
+                temperature=self._temperature(temperature),
+                **options,
             )
+            if response.usage:
+                record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
             return response.choices[0].message.content
         except Exception as e:
+            if is_rate_limited(e):
+                # Let the scheduler pause the provider and honour Retry-After
+                raise
             logger.error(f"DeepSeek chat error: {e}")
             return "Error querying DeepSeek model."
 
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        Sends a message to DeepSeek API over the async client.
+
+        :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (default DEFAULT_TEMPERATURE)
+        :param response_format: JSON mode or JSON schema
+        :return: Model-generated reply
+        """
+        messages, options = self._structured(messages, response_format)
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            max_tokens=2048,
+            temperature=self._temperature(temperature),
+            **options,
+        )
+        if response.usage:
+            record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+        return response.choices[0].message.content
+
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the DeepSeek reply token by token.
+
+        :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (default DEFAULT_TEMPERATURE)
+        :param response_format: JSON mode or JSON schema
+        :yield: Delta events followed by a usage event
+        """
+        messages, options = self._structured(messages, response_format)
+        async for event in stream_chat_completion(
+            self.async_client,
+            self.model,
+            messages,
+            max_tokens=2048,
+            temperature=self._temperature(temperature),
+            **options,
+        ):
+            yield event
+
     def get_available_models(self):
         """
         Returns a list of DeepSeek models (manually defined since listing is not supported).
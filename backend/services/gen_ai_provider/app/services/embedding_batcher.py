@@ -0,0 +1,196 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.constants import (
+    PRIORITY_CLASSES,
+    DEFAULT_PRIORITY,
+    EMBEDDING_BATCH_MAX_SIZE,
+    EMBEDDING_BATCH_MAX_WAIT_MS,
+    EMBEDDING_BATCH_MAX_TOKENS,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+
+logger = AppLogger(__name__)
+
+# Returns the vectors, the prompt tokens reported by the provider (None when not reported)
+# and the seconds the provider call took
+EmbedFn = Callable[
+    [List[str], str, Optional[int], str],
+    Awaitable[Tuple[List[List[float]], Optional[int], float]],
+]
+BatchKey = Tuple[str, Optional[int]]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used to keep batches under the provider limit."""
+    return len(text) // 4 + 1
+
+
+class _PendingBatch:
+    def __init__(self):
+        self.items: List[Tuple[List[str], int, asyncio.Future]] = []
+        self.size = 0
+        self.tokens = 0
+        self.priority: Optional[str] = None
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    def add_priority(self, priority: str) -> None:
+        # A batch is scheduled with the most urgent priority of its callers
+        if self.priority is None or PRIORITY_CLASSES[priority] < PRIORITY_CLASSES[self.priority]:
+            self.priority = priority
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests for the same model into one provider call.
+
+    Requests are queued per (model, dimensions) and flushed when the batch reaches
+    ``max_batch_size`` texts or ``max_batch_tokens`` estimated tokens, or when
+    the oldest request has waited ``max_wait_ms``. Each caller gets back the
+    slice of the batch result matching its own texts, its share of the
+    batch's prompt tokens and the batch's provider latency.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS,
+        max_batch_tokens: int = EMBEDDING_BATCH_MAX_TOKENS,
+    ):
+        self._embed_fn = embed_fn
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._max_batch_tokens = max_batch_tokens
+        self._pending: Dict[BatchKey, _PendingBatch] = {}
+        # Keep references to in-flight batches so they are not garbage collected
+        self._tasks = set()
+
+    async def submit(
+        self,
+        texts: List[str],
+        model: str,
+        dimensions: Optional[int] = None,
+        priority: Optional[str] = None,
+    ) -> Tuple[List[List[float]], int, float]:
+        """
+        Queues ``texts`` for the next batch of ``model`` and waits for their vectors.
+        Requests over the batch limits are split into chunks that each fit a batch;
+        the vectors come back in the order of ``texts``.
+
+        :return: The vectors, the prompt tokens of ``texts`` (their share of the tokens
+            the provider reported for each batch, or the estimate when it reported none)
+            and the provider latency of the slowest batch they were sent in.
+        """
+        if not texts:
+            return [], 0, 0.0
+        key = (model, dimensions)
+        priority = priority if priority in PRIORITY_CLASSES else DEFAULT_PRIORITY
+        futures = [
+            self._enqueue(key, chunk, tokens, priority) for chunk, tokens in self._split(texts)
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+        vectors, prompt_tokens, elapsed = [], 0, 0.0
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+            vectors.extend(result[0])
+            prompt_tokens += result[1]
+            # Chunks are sent concurrently, so the slowest one is what the caller waited for
+            elapsed = max(elapsed, result[2])
+        return vectors, prompt_tokens, elapsed
+
+    def _split(self, texts: List[str]) -> List[Tuple[List[str], int]]:
+        """
+        Cuts ``texts`` into chunks within ``max_batch_size`` and ``max_batch_tokens``,
+        with their token estimates. A single text over the token limit is its own chunk.
+        """
+        chunks = []
+        chunk, chunk_tokens = [], 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if chunk and (
+                len(chunk) >= self._max_batch_size
+                or chunk_tokens + tokens > self._max_batch_tokens
+            ):
+                chunks.append((chunk, chunk_tokens))
+                chunk, chunk_tokens = [], 0
+            chunk.append(text)
+            chunk_tokens += tokens
+        chunks.append((chunk, chunk_tokens))
+        return chunks
+
+    def _enqueue(
+        self, key: BatchKey, texts: List[str], tokens: int, priority: str
+    ) -> asyncio.Future:
+        """
+        Adds one chunk to the open batch of ``key``; the future resolves to
+        (vectors, tokens, elapsed).
+        """
+        batch = self._pending.get(key)
+
+        # Flush first if this chunk would push the open batch over its limits
+        if batch and (
+            batch.size + len(texts) > self._max_batch_size
+            or batch.tokens + tokens > self._max_batch_tokens
+        ):
+            self._flush(key)
+            batch = None
+
+        if batch is None:
+            batch = _PendingBatch()
+            self._pending[key] = batch
+            batch.timer = asyncio.get_running_loop().call_later(
+                self._max_wait, self._flush, key
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        batch.items.append((texts, tokens, future))
+        batch.size += len(texts)
+        batch.tokens += tokens
+        batch.add_priority(priority)
+
+        if batch.size >= self._max_batch_size or batch.tokens >= self._max_batch_tokens:
+            self._flush(key)
+
+        return future
+
+    def _flush(self, key: BatchKey) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer:
+            batch.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._run(key, batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: BatchKey, batch: _PendingBatch) -> None:
+        model, dimensions = key
+        texts = [text for item_texts, _, _ in batch.items for text in item_texts]
+        EMBEDDING_BATCHES.labels(model=model).inc()
+        EMBEDDING_BATCHED_REQUESTS.labels(model=model).inc(len(batch.items))
+        EMBEDDING_BATCH_SIZE.labels(model=model).observe(len(texts))
+        try:
+            vectors, reported_tokens, elapsed = await self._embed_fn(texts, model, dimensions, batch.priority)
+            if len(vectors) != len(texts):
+                raise RuntimeError(
+                    f"Provider returned {len(vectors)} embeddings for {len(texts)} inputs"
+                )
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(texts)} texts failed for {model}: {e}")
+            for _, _, future in batch.items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        start = 0
+        for item_texts, item_tokens, future in batch.items:
+            end = start + len(item_texts)
+            if reported_tokens:
+                # Split the reported count in proportion to each caller's estimated share
+                item_tokens = round(reported_tokens * item_tokens / batch.tokens)
+            if not future.done():
+                future.set_result((vectors[start:end], item_tokens, elapsed))
+            start = end
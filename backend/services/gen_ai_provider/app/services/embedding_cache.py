@@ -0,0 +1,94 @@
+import asyncio
+import hashlib
+from typing import List, Optional
+
+from config.constants import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+    EMBEDDING_CACHE_TTL_SECONDS,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+from utils.cache_store import LRUCache, create_cache_store
+from utils.embedding_codec import pack_float32, unpack_float32
+
+logger = AppLogger(__name__)
+
+
+class EmbeddingCache:
+    """
+    Embedding vectors keyed by (model, dimensions, sha256(text)).
+
+    Vectors are stored as float32 blobs (4 bytes per dimension) in a bounded
+    in-memory LRU in front of the shared persistent tier.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = EMBEDDING_CACHE_ENABLED,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        ttl: int = EMBEDDING_CACHE_TTL_SECONDS,
+    ):
+        self.enabled = enabled
+        self._ttl = ttl
+        self._memory = LRUCache(max_entries, ttl)
+        self._store = create_cache_store("embeddings") if enabled else None
+
+    @staticmethod
+    def make_key(model: str, dimensions: Optional[int], text: str) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{dimensions or 0}:{text_hash}"
+
+    async def get_many(
+        self, model: str, dimensions: Optional[int], texts: List[str]
+    ) -> List[Optional[List[float]]]:
+        """Returns the cached vector of each text, or None for misses."""
+        keys = [self.make_key(model, dimensions, text) for text in texts]
+        blobs = [self._memory.get(key) for key in keys]
+        memory_hits = sum(1 for blob in blobs if blob is not None)
+
+        missing = [i for i, blob in enumerate(blobs) if blob is None]
+        persistent_hits = 0
+        if missing and self._store is not None:
+            try:
+                stored = await asyncio.to_thread(
+                    self._store.get_many, [keys[i] for i in missing]
+                )
+            except Exception as e:
+                logger.error(f"Embedding cache lookup failed: {e}")
+                stored = [None] * len(missing)
+            for i, blob in zip(missing, stored):
+                if blob is not None:
+                    blobs[i] = blob
+                    self._memory.set(keys[i], blob)
+                    persistent_hits += 1
+
+        EMBEDDING_CACHE_LOOKUPS.labels(model=model).inc(len(texts))
+        if memory_hits:
+            EMBEDDING_CACHE_HITS.labels(model=model, tier="memory").inc(memory_hits)
+        if persistent_hits:
+            EMBEDDING_CACHE_HITS.labels(model=model, tier="persistent").inc(persistent_hits)
+
+        return [unpack_float32(blob) if blob is not None else None for blob in blobs]
+
+    async def set_many(
+        self,
+        model: str,
+        dimensions: Optional[int],
+        texts: List[str],
+        vectors: List[List[float]],
+    ) -> None:
+        items = {
+            self.make_key(model, dimensions, text): pack_float32(vector)
+            for text, vector in zip(texts, vectors)
+        }
+        for key, blob in items.items():
+            self._memory.set(key, blob)
+        if self._store is not None:
+            try:
+                await asyncio.to_thread(self._store.set_many, items, self._ttl)
+            except Exception as e:
+                logger.error(f"Embedding cache write failed: {e}")
+
+
+embedding_cache = EmbeddingCache()
@@ -1,8 +1,13 @@
 import os
+from typing import AsyncIterator, Optional
 import google.generativeai as genai
 from services.base_ai_service import BaseAIService
+from services.rate_limiter import is_rate_limited
 from config.constants import MAPPING_AI_PROVIDER_TO_MODEL
 from config.log_config import AppLogger
+from utils.streaming import delta_event, usage_event
+from utils.usage import record_usage
+from utils.response_format import gemini_generation_config
 
 logger = AppLogger(__name__)
 
@@ -22,23 +27,113 @@ class GeminiAIService(BaseAIService):
         genai.configure(api_key=api_key)
         self.client = genai.GenerativeModel(model)
 
-    def chat(self, messages: list) -> str:
+    def _generation_config(self, temperature: Optional[float], response_format: Optional[dict]):
+        # None lets the SDK use the model's defaults
+        config = {**gemini_generation_config(response_format), **self._sampling_options(temperature)}
+        return config or None
+
+    @staticmethod
+    def _record_usage(response) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            record_usage(usage.prompt_token_count, usage.candidates_token_count)
+
+    def chat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
         """
         Sends messages to Gemini API and returns the assistant's reply.
 
         :param messages: A list of chat messages (each with 'role' and 'content')
+        :param temperature: Sampling temperature (None keeps Gemini's default)
+        :param response_format: JSON mode or JSON schema (mapped to response_schema)
         :return: Chatbot reply as string
         """
         try:
             prompt = "\n".join(
                 f"{msg['role'].capitalize()}: {msg['content']}" for msg in messages
             )
-            response = self.client.generate_content(prompt)
+            response = self.client.generate_content(
+                prompt, generation_config=self._generation_config(temperature, response_format)
+            )
+            self._record_usage(response)
             return response.text.strip()
         except Exception as e:
+            if is_rate_limited(e):
+                # Let the scheduler pause the provider and honour Retry-After
+                raise
             logger.error(f"Error in Gemini chat: {e}")
             return "Error querying Gemini AI."
 
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        Sends messages to Gemini API asynchronously and returns the assistant's reply.
+
+        :param messages: A list of chat messages (each with 'role' and 'content')
+        :param temperature: Sampling temperature (None keeps Gemini's default)
+        :param response_format: JSON mode or JSON schema (mapped to response_schema)
+        :return: Chatbot reply as string
+        """
+        try:
+            prompt = "\n".join(
+                f"{msg['role'].capitalize()}: {msg['content']}" for msg in messages
+            )
+            response = await self.client.generate_content_async(
+                prompt, generation_config=self._generation_config(temperature, response_format)
+            )
+            self._record_usage(response)
+            return response.text.strip()
+        except Exception as e:
+            if is_rate_limited(e):
+                # Let the scheduler pause the provider and honour Retry-After
+                raise
+            logger.error(f"Error in Gemini chat: {e}")
+            return "Error querying Gemini AI."
+
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the Gemini reply chunk by chunk.
+
+        :param messages: A list of chat messages (each with 'role' and 'content')
+        :param temperature: Sampling temperature (None keeps Gemini's default)
+        :param response_format: JSON mode or JSON schema (mapped to response_schema)
+        :yield: Delta events followed by a usage event
+        """
+        prompt = "\n".join(
+            f"{msg['role'].capitalize()}: {msg['content']}" for msg in messages
+        )
+        response = await self.client.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(temperature, response_format),
+            stream=True,
+        )
+        async for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # Chunks without text parts (e.g. the final finish_reason chunk)
+                continue
+            if text:
+                yield delta_event(text)
+        usage = getattr(response, "usage_metadata", None)
+        if usage:
+            yield usage_event(usage.prompt_token_count, usage.candidates_token_count)
+        else:
+            yield usage_event()
+
     def get_available_models(self):
         """
         Returns a list of available Gemini models.
@@ -1,70 +1,450 @@
-from typing import List, Union
-from services.ollama_service import OllamaService
-from services.openai_service import OpenAIService
-from services.gemini_service import GeminiAIService
-from services.service_factory import get_ai_service
+import asyncio
+import time
+from typing import AsyncIterator, List, Optional, Tuple, Union
+from services.service_factory import get_ai_service, get_embedding_service, model_registry
+from services.response_cache import chat_response_cache
+from services.embedding_cache import embedding_cache
+from services.embedding_batcher import EmbeddingBatcher, estimate_tokens
+from services.single_flight import SingleFlight
+from services.rate_limiter import provider_scheduler, ProviderRateLimitError
+from services.resilience import (
+    CircuitOpenError,
+    get_circuit_breaker,
+    latency_tracker,
+    first_success,
+)
 from config.log_config import AppLogger
-from config.constants import DEFAULT_EMBEDDING_MODEL
+from config.constants import (
+    DEFAULT_EMBEDDING_MODEL,
+    CHAT_COMPLETION_TOKENS_ESTIMATE,
+    CHAT_FALLBACK_MODELS,
+    CHAT_BATCH_MAX_CONCURRENCY,
+    HEDGING_ENABLED,
+    HEDGE_MIN_DELAY_SECONDS,
+)
 from metrics.prometheus_metrics import *
+from utils.streaming import error_event
+from utils.response_format import strip_code_fence, wants_json
+from utils.usage import (
+    Usage,
+    start_call_usage,
+    start_request_usage,
+    get_request_usage,
+    get_caller_stage,
+    estimate_cost,
+)
 logger = AppLogger(__name__)
 
+# Providers report failures as a reply text starting with this prefix
+ERROR_REPLY_PREFIX = "Error querying"
+
+# Identical concurrent requests share one upstream call
+chat_flights = SingleFlight("chat")
+embedding_flights = SingleFlight("embedding", distributed=False)
+
+
+def _estimate_chat_tokens(messages: list) -> int:
+    prompt_tokens = sum(estimate_tokens(str(msg.get("content", ""))) for msg in messages)
+    return prompt_tokens + CHAT_COMPLETION_TOKENS_ESTIMATE
+
+
+def _observe_call(
+    provider: str, model: str, usage: Usage, elapsed: Optional[float] = None
+) -> None:
+    """Records latency, token and cost metrics of one provider call, labelled by caller stage."""
+    stage = get_caller_stage()
+    usage.cost_usd = estimate_cost(model, usage.prompt_tokens, usage.completion_tokens)
+    labels = {"provider": provider, "model": model, "stage": stage}
+    if elapsed is not None:
+        LLM_LATENCY_SECONDS.labels(**labels).observe(elapsed)
+    LLM_PROMPT_TOKENS.labels(**labels).observe(usage.prompt_tokens)
+    LLM_TOKENS.labels(kind="prompt", **labels).inc(usage.prompt_tokens)
+    # Embedding calls have no completion
+    if usage.completion_tokens:
+        LLM_COMPLETION_TOKENS.labels(**labels).observe(usage.completion_tokens)
+        LLM_TOKENS.labels(kind="completion", **labels).inc(usage.completion_tokens)
+    if usage.cost_usd:
+        LLM_COST_USD.labels(**labels).inc(usage.cost_usd)
+
+
+def _fill_estimates(usage: Usage, messages: list, reply: str) -> None:
+    # Providers that do not report usage get rough character-based estimates
+    if not usage.prompt_tokens and not usage.completion_tokens:
+        usage.add(
+            sum(estimate_tokens(str(msg.get("content", ""))) for msg in messages),
+            estimate_tokens(reply),
+        )
+
 
 class GenAIService:
     @staticmethod
-    def get_available_models():
-        services = [OllamaService(), OpenAIService(), GeminiAIService()]
-        models = []
-        for service in services:
-            provider = service.__class__.__name__
-            GET_MODELS_REQUESTS.labels(provider=provider).inc()
-            try:
-                available_models = service.get_available_models()
-                if available_models:
-                    logger.info(f"Available models from {provider}: {available_models}")
-                    models.extend(available_models)
-            except Exception as e:
-                logger.exception(f"Error getting models from {provider}: {e}")
-                GET_MODELS_ERRORS.labels(provider=provider).inc()
-        return models
+    def get_model_catalog() -> dict:
+        """Returns the cached catalog with its ETag and per-provider refresh status."""
+        return model_registry.get_catalog()
 
     @staticmethod
-    def chat(
+    async def achat(
         model: str,
         messages: list,
         temperature: float = 0.7,
+        bypass_cache: bool = False,
+        priority: Optional[str] = None,
+        response_format: Optional[dict] = None,
     ) -> str:
         """
         Chat with the specified AI provider using user/assistant role structure.
         System instructions should be included in the first user message.
+        Deterministic requests (temperature 0) are served from the response cache, and
+        identical concurrent ones share one upstream call.
+        Provider calls go through the scheduler; rate limiting surfaces as ProviderRateLimitError.
+        Failed or slow calls fail over (or are hedged) to the model's configured fallback.
+        Token usage is added to the request's usage (see utils.usage).
+
+        :param bypass_cache: Skip the cache lookup; the fresh reply still replaces the cached one.
+        :param priority: Scheduling class (interactive, cv_parsing or bulk).
+        :param response_format: Structured output (json_object or json_schema, OpenAI shape),
+            mapped to each provider's native JSON mode.
         """
         provider = "unknown"
         try:
-            service = get_ai_service(model)
+            # Resolution may refresh the catalog, keep it off the event loop
+            service = await asyncio.to_thread(get_ai_service, model)
+            if service is None:
+                raise ValueError(f"No AI service found for model: {model}")
             provider = service.__class__.__name__
-            CHAT_REQUESTS.labels(provider=provider).inc()
-            return service.chat(messages)
+
+            cache_key = None
+            if chat_response_cache.enabled and chat_response_cache.is_cacheable(temperature):
+                cache_key = chat_response_cache.make_key(
+                    provider, model, temperature, messages, response_format
+                )
+                if not bypass_cache:
+                    cached = await chat_response_cache.get(cache_key)
+                    if cached is not None:
+                        GenAIService._add_request_usage(GenAIService._cached_usage())
+                        return cached
+
+            called = False
+
+            async def call_upstream() -> Tuple[str, Usage]:
+                nonlocal called
+                called = True
+                served_by, response, usage = await GenAIService._achat_resilient(
+                    model, messages, temperature, priority, response_format
+                )
+                # Only cache replies of the requested model, not of its fallback
+                if cache_key and served_by == model:
+                    await chat_response_cache.set(cache_key, response)
+                return response, usage
+
+            async def lookup() -> Optional[Tuple[str, Usage]]:
+                # Other replicas can only pick up results that land in the shared cache
+                reply = await chat_response_cache.peek(cache_key)
+                return (reply, GenAIService._cached_usage()) if reply is not None else None
+
+            if cache_key:
+                # Only deterministic requests are coalesced; sampled replies must stay independent
+                response, usage = await chat_flights.do(cache_key, call_upstream, lookup)
+                if not called:
+                    # Joined another caller's call: served like a cache hit, no tokens charged
+                    usage = GenAIService._cached_usage()
+            else:
+                response, usage = await call_upstream()
+            GenAIService._add_request_usage(usage)
+            return response
+        except ProviderRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Chat error with provider {provider}: {e}")
-            CHAT_ERRORS.labels(provider=provider).inc()
         return "Error querying AI."
 
     @staticmethod
-    def embed(
+    def _cached_usage() -> Usage:
+        usage = Usage()
+        usage.cached = True
+        return usage
+
+    @staticmethod
+    def _add_request_usage(usage: Usage) -> None:
+        request_usage = get_request_usage()
+        if request_usage is not None:
+            request_usage.merge(usage)
+
+    @staticmethod
+    async def achat_batch(
+        model: str,
+        requests: List[list],
+        temperature: float = 0.7,
+        bypass_cache: bool = False,
+        priority: Optional[str] = None,
+        response_format: Optional[dict] = None,
+    ) -> List[dict]:
+        """
+        Answers independent chat requests concurrently, at most
+        CHAT_BATCH_MAX_CONCURRENCY at a time. One failed item does not fail the batch.
+
+        :param requests: Message lists, one per chat request.
+        :return: One result per request, in order: ``{"status": "success", "data": reply,
+            "usage": {...}}`` or ``{"status": "error", "error": message}``.
+        """
+        semaphore = asyncio.Semaphore(CHAT_BATCH_MAX_CONCURRENCY)
+        batch_usage = get_request_usage()
+
+        async def run_one(messages: list) -> dict:
+            # Each item runs in its own task, so this usage only sees the item's calls
+            item_usage = start_request_usage()
+            async with semaphore:
+                try:
+                    reply = await GenAIService.achat(
+                        model, messages, temperature, bypass_cache, priority, response_format
+                    )
+                except ProviderRateLimitError as e:
+                    return {"status": "error", "error": str(e), "retry_after": e.retry_after}
+            if batch_usage is not None:
+                batch_usage.merge(item_usage)
+            if reply.startswith(ERROR_REPLY_PREFIX):
+                return {"status": "error", "error": reply}
+            return {"status": "success", "data": reply, "usage": item_usage.as_dict()}
+
+        CHAT_BATCH_SIZE.observe(len(requests))
+        return await asyncio.gather(*(run_one(messages) for messages in requests))
+
+    @staticmethod
+    async def _achat_resilient(
+        model: str,
+        messages: list,
+        temperature: Optional[float] = None,
+        priority: Optional[str] = None,
+        response_format: Optional[dict] = None,
+    ) -> Tuple[str, str, Usage]:
+        """
+        Calls ``model``, hedging to its fallback (or a duplicate of itself) once the
+        call runs past the model's rolling p95 latency when hedging is enabled, and
+        failing over to the fallback when the call fails or its circuit is open.
+
+        :return: The model that answered, its reply and the call's token usage.
+        """
+        fallback_model = CHAT_FALLBACK_MODELS.get(model)
+
+        def primary():
+            return GenAIService._acall_model(
+                model, messages, temperature, priority, response_format
+            )
+
+        def fallback():
+            return GenAIService._acall_model(
+                fallback_model, messages, temperature, priority, response_format
+            )
+
+        if HEDGING_ENABLED:
+            threshold = latency_tracker.percentile(model)
+            if threshold is not None:
+                return await first_success(
+                    primary,
+                    fallback if fallback_model else primary,
+                    max(threshold, HEDGE_MIN_DELAY_SECONDS),
+                )
+
+        try:
+            return await primary()
+        except Exception as e:
+            if not fallback_model:
+                raise
+            logger.warn(f"Failing over from {model} to {fallback_model}: {e}")
+            CHAT_FAILOVERS.labels(model=model, fallback=fallback_model).inc()
+            return await fallback()
+
+    @staticmethod
+    async def _acall_model(
+        model: str,
+        messages: list,
+        temperature: Optional[float] = None,
+        priority: Optional[str] = None,
+        response_format: Optional[dict] = None,
+    ) -> Tuple[str, str, Usage]:
+        """
+        One provider call guarded by the provider's circuit breaker and scheduler slot.
+        Error replies raise so that callers can fail over.
+        """
+        service = await asyncio.to_thread(get_ai_service, model)
+        if service is None:
+            raise ValueError(f"No AI service found for model: {model}")
+        provider = service.__class__.__name__
+        breaker = get_circuit_breaker(provider)
+        if not breaker.allow():
+            raise CircuitOpenError(provider)
+
+        CHAT_REQUESTS.labels(provider=provider).inc()
+        usage = start_call_usage()
+        try:
+            async with provider_scheduler.slot(
+                provider, model, _estimate_chat_tokens(messages), priority
+            ):
+                start = time.monotonic()
+                response = await service.achat(
+                    messages, temperature=temperature, response_format=response_format
+                )
+                elapsed = time.monotonic() - start
+            if not response or response.startswith(ERROR_REPLY_PREFIX):
+                raise RuntimeError(f"{provider} returned an error reply for {model}")
+            if wants_json(response_format):
+                response = strip_code_fence(response)
+        except asyncio.CancelledError:
+            # A cancelled hedge says nothing about the provider's health
+            breaker.release()
+            raise
+        except ProviderRateLimitError:
+            breaker.release()
+            CHAT_ERRORS.labels(provider=provider).inc()
+            raise
+        except Exception:
+            breaker.record_failure()
+            CHAT_ERRORS.labels(provider=provider).inc()
+            raise
+
+        breaker.record_success()
+        latency_tracker.record(model, elapsed)
+        _fill_estimates(usage, messages, response)
+        _observe_call(provider, model, usage, elapsed)
+        return model, response, usage
+
+    @staticmethod
+    async def astream(
+        model: str,
+        messages: list,
+        temperature: float = 0.7,
+        priority: Optional[str] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the reply of the provider serving ``model`` as delta events
+        followed by a final usage event, or an error event on failure.
+        Time to first byte is measured up to the first delta.
+        """
+        provider = "unknown"
+        try:
+            service = await asyncio.to_thread(get_ai_service, model)
+            if service is None:
+                raise ValueError(f"No AI service found for model: {model}")
+            provider = service.__class__.__name__
+            CHAT_REQUESTS.labels(provider=provider).inc()
+            async with provider_scheduler.slot(
+                provider, model, _estimate_chat_tokens(messages), priority
+            ):
+                start = time.monotonic()
+                first_byte = None
+                reply_parts = []
+                async for event in service.astream(
+                    messages, temperature=temperature, response_format=response_format
+                ):
+                    if event["type"] == "delta":
+                        if first_byte is None:
+                            first_byte = time.monotonic() - start
+                            LLM_TTFB_SECONDS.labels(
+                                provider=provider, model=model, stage=get_caller_stage()
+                            ).observe(first_byte)
+                        reply_parts.append(event["content"])
+                    elif event["type"] == "usage":
+                        usage = Usage()
+                        usage.add(
+                            event["usage"]["prompt_tokens"], event["usage"]["completion_tokens"]
+                        )
+                        _fill_estimates(usage, messages, "".join(reply_parts))
+                        _observe_call(provider, model, usage, time.monotonic() - start)
+                        GenAIService._add_request_usage(usage)
+                        event = {"type": "usage", "usage": usage.as_dict()}
+                    yield event
+        except ProviderRateLimitError as e:
+            CHAT_ERRORS.labels(provider=provider).inc()
+            yield error_event(str(e))
+        except Exception as e:
+            logger.error(f"Chat stream error with provider {provider}: {e}")
+            CHAT_ERRORS.labels(provider=provider).inc()
+            yield error_event("Error querying AI.")
+
+    @staticmethod
+    async def aembed(
         input: Union[str, List[str]],
         model: str = DEFAULT_EMBEDDING_MODEL,
+        dimensions: Optional[int] = None,
+        priority: Optional[str] = None,
     ) -> List[List[float]]:
         """
-        Create embeddings for the given input using OpenAI's embedding API.
+        Create embeddings for the given input using OpenAI's embedding API
+        (or the local stub provider for stubbed models). Cached vectors are reused
+        and only the distinct cache misses are sent to the provider.
 
         :param input: A string or list of strings to embed
         :param model: The embedding model to use
+        :param dimensions: Output dimension for models supporting it (default: native size)
+        :param priority: Scheduling class (interactive, cv_parsing or bulk).
         :return: List of embedding vectors
         """
+        texts = [input] if isinstance(input, str) else input
         try:
-            service = OpenAIService()
-            CHAT_REQUESTS.labels(provider="OpenAIService").inc()
-            return service.embed(input, model)
+            if embedding_cache.enabled:
+                vectors = await embedding_cache.get_many(model, dimensions, texts)
+            else:
+                vectors = [None] * len(texts)
+            misses = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+            if misses:
+
+                async def fetch(indexes: List[int]) -> List[List[float]]:
+                    pending = [misses[i] for i in indexes]
+                    fresh, prompt_tokens, elapsed = await embedding_batcher.submit(
+                        pending, model, dimensions, priority
+                    )
+                    if embedding_cache.enabled:
+                        await embedding_cache.set_many(model, dimensions, pending, fresh)
+                    # Charged to the request that sent the texts upstream
+                    # (provider-reported tokens, estimated when the provider reports none)
+                    usage = Usage()
+                    usage.add(prompt_tokens)
+                    provider = get_embedding_service(model).__class__.__name__
+                    _observe_call(provider, model, usage, elapsed)
+                    GenAIService._add_request_usage(usage)
+                    return fresh
+
+                # Texts already being embedded by a concurrent request are not sent again
+                fresh = await embedding_flights.do_many(
+                    [embedding_cache.make_key(model, dimensions, text) for text in misses], fetch
+                )
+                by_text = dict(zip(misses, fresh))
+                vectors = [v if v is not None else by_text[t] for t, v in zip(texts, vectors)]
+            else:
+                GenAIService._add_request_usage(GenAIService._cached_usage())
+            return vectors
         except Exception as e:
             logger.error(f"Embedding error: {e}")
-            CHAT_ERRORS.labels(provider="OpenAIService").inc()
             raise
+
+    @staticmethod
+    async def _aembed_upstream(
+        texts: List[str],
+        model: str,
+        dimensions: Optional[int] = None,
+        priority: Optional[str] = None,
+    ) -> Tuple[List[List[float]], Optional[int], float]:
+        """
+        One provider embedding call; returns the vectors, the prompt tokens it reported
+        and the seconds the call took (excluding the scheduler wait).
+        """
+        service = get_embedding_service(model)
+        provider = service.__class__.__name__
+        try:
+            CHAT_REQUESTS.labels(provider=provider).inc()
+            tokens = sum(estimate_tokens(text) for text in texts)
+            # The batch runs in its own task, so this usage only sees this call
+            usage = start_call_usage()
+            async with provider_scheduler.slot(provider, model, tokens, priority):
+                start = time.monotonic()
+                vectors = await service.aembed(texts, model, dimensions)
+                elapsed = time.monotonic() - start
+            return vectors, usage.prompt_tokens or None, elapsed
+        except Exception:
+            CHAT_ERRORS.labels(provider=provider).inc()
+            raise
+
+
+# Coalesces concurrent upstream embedding calls; created after GenAIService so it can wrap it
+embedding_batcher = EmbeddingBatcher(GenAIService._aembed_upstream)
@@ -0,0 +1,278 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from typing import AsyncIterator, List, Optional, Union
+
+from services.base_ai_service import BaseAIService
+from config.constants import (
+    LOCAL_STUB_MODE,
+    LOCAL_STUB_CHAT_MODEL,
+    LOCAL_STUB_EMBEDDING_MODEL,
+    LOCAL_STUB_EMBEDDING_DIMENSIONS,
+    LOCAL_STUB_LATENCY_MS,
+    LOCAL_STUB_LATENCY_SIGMA,
+    LOCAL_STUB_EMBEDDING_LATENCY_MS,
+    LOCAL_STUB_STREAM_CHUNK_MS,
+    LOCAL_STUB_ERROR_RATE,
+    LOCAL_STUB_RATE_LIMIT_RATE,
+)
+from config.log_config import AppLogger
+from utils.streaming import delta_event, usage_event
+from utils.usage import record_usage
+from utils.response_format import wants_json
+
+logger = AppLogger(__name__)
+
+_SKILLS = [
+    "Python", "Java", "Go", "TypeScript", "React", "FastAPI", "Django", "Spring Boot",
+    "PostgreSQL", "MongoDB", "Redis", "Kafka", "Docker", "Kubernetes", "AWS", "GCP",
+    "Terraform", "CI/CD", "Linux", "Machine Learning", "PyTorch", "SQL", "GraphQL", "gRPC",
+]
+_FIRST_NAMES = ["An", "Binh", "Chi", "Dung", "Hoa", "Khanh", "Linh", "Minh", "Nam", "Trang"]
+_LAST_NAMES = ["Nguyen", "Tran", "Le", "Pham", "Hoang", "Vo", "Dang", "Bui"]
+_LANGUAGES = ["English", "Vietnamese", "French", "Japanese", "German"]
+_CEFR = ["A2", "B1", "B2", "C1", "C2"]
+_DEGREES = ["BACHELOR", "MASTER", "PHD"]
+_TIERS = ["Top100", "Top200", "Top500", "Top1000", ">1000"]
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def serves_model(model: str) -> bool:
+    """True if requests for ``model`` are answered by the local stub."""
+    if LOCAL_STUB_MODE == "all":
+        return True
+    return LOCAL_STUB_MODE == "on" and model in (LOCAL_STUB_CHAT_MODEL, LOCAL_STUB_EMBEDDING_MODEL)
+
+
+class LocalStubError(Exception):
+    """Simulated provider failure. ``status_code`` 429 exercises the rate-limit path."""
+
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class LocalStubService(BaseAIService):
+    """
+    Offline, deterministic stand-in for an LLM and embedding provider, for load tests.
+
+    Replies depend only on the prompt: the CV parsing, JD matching and interview
+    question prompts of recruitment_agent get schema-valid JSON, anything else
+    a short plain-text answer. Embeddings use the hashing trick, so texts sharing
+    words get similar vectors at any dimension. Latency (log-normal around
+    LOCAL_STUB_LATENCY_MS) and error rates are configurable; they are random,
+    the content is not.
+    """
+
+    def __init__(self, model: str = LOCAL_STUB_CHAT_MODEL):
+        super().__init__(model)
+
+    # --- simulated provider behaviour ---
+
+    @staticmethod
+    def _latency(median_ms: float) -> float:
+        if median_ms <= 0:
+            return 0.0
+        return median_ms / 1000.0 * math.exp(random.gauss(0.0, LOCAL_STUB_LATENCY_SIGMA))
+
+    @staticmethod
+    def _maybe_fail() -> None:
+        roll = random.random()
+        if roll < LOCAL_STUB_RATE_LIMIT_RATE:
+            raise LocalStubError("Simulated rate limit", status_code=429)
+        if roll < LOCAL_STUB_RATE_LIMIT_RATE + LOCAL_STUB_ERROR_RATE:
+            raise LocalStubError("Simulated provider error")
+
+    @staticmethod
+    def _rng(text: str) -> random.Random:
+        return random.Random(hashlib.sha256(text.encode("utf-8")).digest())
+
+    # --- replies ---
+
+    @staticmethod
+    def _prompt(messages: list) -> str:
+        return "\n".join(str(msg.get("content", "")) for msg in messages)
+
+    def _reply(self, prompt: str, response_format: Optional[dict] = None) -> str:
+        reply = self._generate(prompt)
+        if wants_json(response_format) and not reply.startswith(("{", "[")):
+            reply = json.dumps({"text": reply})
+        record_usage(len(prompt) // 4 + 1, len(reply) // 4 + 1)
+        return reply
+
+    def _generate(self, prompt: str) -> str:
+        rng = self._rng(prompt)
+        if "highest_degree_level" in prompt and "university_evaluation" in prompt:
+            return json.dumps(self._parsed_cv(rng))
+        if "JSON array of objects with keys: language, proficiency_cefr" in prompt:
+            return json.dumps(self._languages(rng))
+        if "ATS scoring assistant" in prompt:
+            return json.dumps(self._match_scores(rng))
+        if "interview questions" in prompt:
+            count = re.search(r"Generate (\d+)", prompt)
+            return json.dumps(self._interview_questions(rng, int(count.group(1)) if count else 5))
+        return self._text(rng)
+
+    @staticmethod
+    def _languages(rng: random.Random) -> List[dict]:
+        return [
+            {"language": language, "proficiency_cefr": rng.choice(_CEFR)}
+            for language in rng.sample(_LANGUAGES, rng.randint(1, 3))
+        ]
+
+    def _parsed_cv(self, rng: random.Random) -> dict:
+        first, last = rng.choice(_FIRST_NAMES), rng.choice(_LAST_NAMES)
+        start_year = rng.randint(2005, 2018)
+        return {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}{rng.randint(1, 999)}@example.com",
+            "skills": rng.sample(_SKILLS, rng.randint(4, 10)),
+            "experience_years": rng.randint(0, 15),
+            "education": [
+                {
+                    "degree": "Bachelor of Engineering",
+                    "major": "Computer Science",
+                    "institution": "Example University of Technology",
+                    "country": "Vietnam",
+                    "start_date": f"{start_year}-09",
+                    "end_date": f"{start_year + 4}-06",
+                    "gpa": round(rng.uniform(2.5, 4.0), 2),
+                    "gpa_scale": 4.0,
+                }
+            ],
+            "highest_degree_level": rng.choice(_DEGREES),
+            "certifications": [
+                {
+                    "name": "Certified Kubernetes Administrator",
+                    "issuer": "CNCF",
+                    "date": f"{start_year + 6}-03",
+                    "credential_id": None,
+                }
+            ],
+            "languages": self._languages(rng),
+            "university_evaluation": {
+                "best_institution": "Example University of Technology",
+                "rank_tier": rng.choice(_TIERS),
+                "estimated_score": rng.randint(40, 90),
+                "rationale": "Deterministic stub evaluation.",
+                "confidence": round(rng.uniform(0.5, 0.95), 2),
+            },
+        }
+
+    @staticmethod
+    def _match_scores(rng: random.Random) -> dict:
+        main = round(rng.uniform(30.0, 80.0), 1)
+        extra = round(rng.uniform(5.0, 20.0), 1)
+        return {
+            "main_skills_score": main,
+            "extras_score": extra,
+            "total_score": round(main + extra, 1),
+            "rationale": "Deterministic stub score.",
+            "justification": "Skills overlap with the JD was estimated by the local stub provider.",
+        }
+
+    @staticmethod
+    def _interview_questions(rng: random.Random, count: int) -> List[dict]:
+        skills = rng.sample(_SKILLS, min(count, len(_SKILLS)))
+        return [
+            {
+                "question": f"How have you used {skills[i % len(skills)]} in a production system?",
+                "answers": [f"A structured answer describing a concrete {skills[i % len(skills)]} project."],
+            }
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def _text(rng: random.Random) -> str:
+        skills = rng.sample(_SKILLS, 3)
+        return (
+            f"The candidate has hands-on experience with {skills[0]}, {skills[1]} and {skills[2]}. "
+            "They have delivered production systems and collaborate well in cross-functional teams. "
+            "This reply was generated by the local stub provider."
+        )
+
+    # --- BaseAIService ---
+
+    def chat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        time.sleep(self._latency(LOCAL_STUB_LATENCY_MS))
+        self._maybe_fail()
+        return self._reply(self._prompt(messages), response_format)
+
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        await asyncio.sleep(self._latency(LOCAL_STUB_LATENCY_MS))
+        self._maybe_fail()
+        return self._reply(self._prompt(messages), response_format)
+
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """Streams the reply word by word; the first chunk arrives after the simulated latency."""
+        prompt = self._prompt(messages)
+        await asyncio.sleep(self._latency(LOCAL_STUB_LATENCY_MS))
+        self._maybe_fail()
+        reply = self._reply(prompt, response_format)
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            if i:
+                await asyncio.sleep(LOCAL_STUB_STREAM_CHUNK_MS / 1000.0)
+            yield delta_event(word if i == len(words) - 1 else word + " ")
+        yield usage_event(len(prompt) // 4 + 1, len(reply) // 4 + 1)
+
+    def get_available_models(self) -> List[dict]:
+        return [
+            {"name": f"LocalStub:{LOCAL_STUB_CHAT_MODEL}", "model": LOCAL_STUB_CHAT_MODEL},
+            {"name": f"LocalStub:{LOCAL_STUB_EMBEDDING_MODEL}", "model": LOCAL_STUB_EMBEDDING_MODEL},
+        ]
+
+    # --- embeddings ---
+
+    @staticmethod
+    def hash_embedding(text: str, dimensions: int) -> List[float]:
+        """Feature-hashed bag of words, L2-normalized."""
+        vector = [0.0] * dimensions
+        tokens = _TOKEN_RE.findall(text.lower()) or [text]
+        for token in tokens:
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % dimensions] += 1.0 if value >> 63 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed(
+        self,
+        input: Union[str, List[str]],
+        model: str = LOCAL_STUB_EMBEDDING_MODEL,
+        dimensions: Optional[int] = None,
+    ) -> List[List[float]]:
+        texts = [input] if isinstance(input, str) else input
+        time.sleep(self._latency(LOCAL_STUB_EMBEDDING_LATENCY_MS))
+        self._maybe_fail()
+        return [self.hash_embedding(text, dimensions or LOCAL_STUB_EMBEDDING_DIMENSIONS) for text in texts]
+
+    async def aembed(
+        self,
+        input: Union[str, List[str]],
+        model: str = LOCAL_STUB_EMBEDDING_MODEL,
+        dimensions: Optional[int] = None,
+    ) -> List[List[float]]:
+        texts = [input] if isinstance(input, str) else input
+        await asyncio.sleep(self._latency(LOCAL_STUB_EMBEDDING_LATENCY_MS))
+        self._maybe_fail()
+        return [self.hash_embedding(text, dimensions or LOCAL_STUB_EMBEDDING_DIMENSIONS) for text in texts]
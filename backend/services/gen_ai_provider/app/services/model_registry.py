@@ -0,0 +1,289 @@
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Type
+
+from services.base_ai_service import BaseAIService
+from config.constants import (
+    MODEL_REGISTRY_TTL_SECONDS,
+    MODEL_REGISTRY_REFRESH_INTERVAL,
+    MODEL_REGISTRY_MISS_REFRESH_INTERVAL,
+    MODEL_REGISTRY_PROVIDER_TIMEOUT,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+
+logger = AppLogger(__name__)
+
+
+class ModelRegistry:
+    """
+    Cached model -> provider routing table.
+
+    The catalog of every provider is loaded in the background and kept for
+    ``ttl`` seconds, so resolving a model is a dictionary lookup instead of a
+    list-models call to each provider. Providers are queried concurrently, each
+    with a deadline; a provider that fails or times out keeps serving its last
+    known catalog and does not hold up the others. Once loaded, a stale catalog
+    keeps being served while it is revalidated in the background.
+    """
+
+    def __init__(
+        self,
+        providers: List[Type[BaseAIService]],
+        ttl: int = MODEL_REGISTRY_TTL_SECONDS,
+        refresh_interval: int = MODEL_REGISTRY_REFRESH_INTERVAL,
+        miss_refresh_interval: int = MODEL_REGISTRY_MISS_REFRESH_INTERVAL,
+        provider_timeout: float = MODEL_REGISTRY_PROVIDER_TIMEOUT,
+    ):
+        """
+        :param providers: Provider classes in routing priority order.
+        :param ttl: Seconds after which the catalog is considered stale.
+        :param refresh_interval: Seconds between background refreshes.
+        :param miss_refresh_interval: Minimum seconds between refreshes triggered by unknown models.
+        :param provider_timeout: Seconds a refresh waits for each provider's catalog.
+        """
+        self._providers = providers
+        self._ttl = ttl
+        self._refresh_interval = refresh_interval
+        self._miss_refresh_interval = miss_refresh_interval
+        self._provider_timeout = provider_timeout
+
+        self._catalogs: Dict[str, List[dict]] = {}
+        self._refreshed_at: Dict[str, float] = {}
+        self._routes: Dict[str, Type[BaseAIService]] = {}
+        self._instances: Dict[str, BaseAIService] = {}
+        self._status: Dict[str, dict] = {}
+        self._etag = ""
+        self._loaded_at = 0.0
+        self._last_miss_refresh = 0.0
+
+        # One worker per provider; a hung provider only ever occupies its own worker
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, len(providers)), thread_name_prefix="model-catalog"
+        )
+        self._pending: Dict[str, Future] = {}
+        self._revalidating = False
+
+        self._lock = threading.Lock()
+        # Reentrant: a late catalog callback runs inline when its future finished in the meantime
+        self._refresh_lock = threading.RLock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Starts the background refresh thread (idempotent)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="model-registry-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops the background refresh thread."""
+        self._stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            self.refresh()
+            self._stop_event.wait(self._refresh_interval)
+
+    def _list_models(self, ServiceClass: Type[BaseAIService]) -> List[dict]:
+        GET_MODELS_REQUESTS.labels(provider=ServiceClass.__name__).inc()
+        return ServiceClass().get_available_models()
+
+    def _apply(self, provider: str, future: Future, started_at: float) -> None:
+        """Stores a provider's catalog (or keeps the stale one) and records its status."""
+        status = {"duration_ms": int((time.time() - started_at) * 1000)}
+        try:
+            models = future.result()
+        except Exception as e:
+            logger.exception(f"Error getting models from {provider}: {e}")
+            GET_MODELS_ERRORS.labels(provider=provider).inc()
+            models, status["status"], status["error"] = None, "error", str(e)
+        else:
+            status["status"] = "ok" if models else "empty"
+
+        with self._lock:
+            if models:
+                self._catalogs[provider] = models
+                self._refreshed_at[provider] = time.time()
+            elif provider in self._catalogs:
+                # Keep the stale catalog rather than dropping the provider's routes
+                logger.warn(f"Keeping stale model catalog for {provider}")
+            status["models"] = len(self._catalogs.get(provider, []))
+            status["refreshed_at"] = self._refreshed_at.get(provider)
+            self._status[provider] = status
+        if models:
+            MODEL_CATALOG_LAST_REFRESH.labels(provider=provider).set_to_current_time()
+            MODEL_CATALOG_SIZE.labels(provider=provider).set(len(models))
+
+    def refresh(self, force: bool = True) -> None:
+        """
+        Reloads the catalog of every provider concurrently and rebuilds the routing
+        table. Waits at most ``provider_timeout`` seconds; providers that have not
+        answered keep their previous catalog and are applied when they finish.
+
+        :param force: Reload even if another caller refreshed the catalog meanwhile.
+        """
+        with self._refresh_lock:
+            if not force and not self._is_stale():
+                return
+            started_at = time.time()
+            futures: Dict[str, Future] = {}
+            submitted = set()
+            for ServiceClass in self._providers:
+                provider = ServiceClass.__name__
+                pending = self._pending.get(provider)
+                if pending is not None and not pending.done():
+                    # The previous fetch is still hanging, do not pile up another one
+                    futures[provider] = pending
+                    continue
+                future = self._executor.submit(self._list_models, ServiceClass)
+                self._pending[provider] = future
+                futures[provider] = future
+                submitted.add(provider)
+
+            done, _ = wait(futures.values(), timeout=self._provider_timeout)
+            for provider, future in futures.items():
+                if future in done:
+                    self._apply(provider, future, started_at)
+                    continue
+                logger.warn(f"Model catalog of {provider} timed out after {self._provider_timeout}s")
+                with self._lock:
+                    self._status[provider] = {
+                        "status": "timeout",
+                        "models": len(self._catalogs.get(provider, [])),
+                        "refreshed_at": self._refreshed_at.get(provider),
+                    }
+                if provider in submitted:
+                    # Late answers still update the catalog
+                    future.add_done_callback(
+                        lambda f, provider=provider: self._apply_late(provider, f, started_at)
+                    )
+
+            self._rebuild_routes()
+
+    def _apply_late(self, provider: str, future: Future, started_at: float) -> None:
+        # Serialized with refresh() so a late answer cannot interleave with a rebuild
+        with self._refresh_lock:
+            self._apply(provider, future, started_at)
+            self._rebuild_routes()
+
+    def revalidate(self) -> None:
+        """Refreshes the catalog in a background thread unless a revalidation is already running."""
+        with self._lock:
+            if self._revalidating:
+                return
+            self._revalidating = True
+
+        def run() -> None:
+            try:
+                self.refresh(force=False)
+            finally:
+                with self._lock:
+                    self._revalidating = False
+
+        threading.Thread(target=run, name="model-registry-revalidate", daemon=True).start()
+
+    def _ensure_fresh(self) -> None:
+        # Block only until something is loaded; afterwards serve stale data while revalidating
+        if self._loaded_at == 0.0:
+            self.refresh(force=False)
+        elif self._is_stale():
+            self.revalidate()
+
+    def _rebuild_routes(self) -> None:
+        routes: Dict[str, Type[BaseAIService]] = {}
+        # Walk in reverse so that the first provider in priority order wins
+        for ServiceClass in reversed(self._providers):
+            for m in self._catalogs.get(ServiceClass.__name__, []):
+                routes[m["model"]] = ServiceClass
+
+        with self._lock:
+            # Drop cached instances whose model moved to another provider or disappeared
+            self._instances = {
+                model: instance
+                for model, instance in self._instances.items()
+                if routes.get(model) is type(instance)
+            }
+            self._routes = routes
+            self._loaded_at = time.time()
+            models = [
+                m
+                for ServiceClass in self._providers
+                for m in self._catalogs.get(ServiceClass.__name__, [])
+            ]
+            self._etag = hashlib.sha256(
+                json.dumps(models, sort_keys=True, default=str).encode("utf-8")
+            ).hexdigest()[:32]
+        logger.info(f"Model registry loaded {len(routes)} models")
+
+    def _is_stale(self) -> bool:
+        return time.time() - self._loaded_at > self._ttl
+
+    def resolve(self, model: str) -> Optional[BaseAIService]:
+        """
+        Returns the provider instance serving ``model``, or None if no provider lists it.
+        Unknown models trigger a rate-limited refresh before giving up.
+        """
+        self._ensure_fresh()
+
+        with self._lock:
+            instance = self._instances.get(model)
+            ServiceClass = self._routes.get(model)
+
+        if instance is None and ServiceClass is None:
+            MODEL_REGISTRY_MISSES.inc()
+            now = time.time()
+            with self._lock:
+                if now - self._last_miss_refresh < self._miss_refresh_interval:
+                    return None
+                self._last_miss_refresh = now
+            logger.info(f"Model {model} not in catalog, refreshing registry")
+            self.refresh()
+            with self._lock:
+                ServiceClass = self._routes.get(model)
+            if ServiceClass is None:
+                return None
+        else:
+            MODEL_REGISTRY_HITS.inc()
+
+        if instance is None:
+            with self._lock:
+                instance = self._instances.get(model)
+                if instance is None:
+                    instance = ServiceClass(model)
+                    self._instances[model] = instance
+        return instance
+
+    def get_catalog(self) -> dict:
+        """
+        Returns the merged catalog with its ETag and per-provider status
+        (ok, empty, error or timeout). ``partial`` is set when any provider
+        is not serving a fresh catalog.
+        """
+        self._ensure_fresh()
+        with self._lock:
+            models = [
+                m
+                for ServiceClass in self._providers
+                for m in self._catalogs.get(ServiceClass.__name__, [])
+            ]
+            providers = {
+                ServiceClass.__name__: dict(self._status.get(ServiceClass.__name__, {"status": "pending"}))
+                for ServiceClass in self._providers
+            }
+            return {
+                "models": models,
+                "etag": self._etag,
+                "loaded_at": self._loaded_at,
+                "stale": self._is_stale(),
+                "partial": any(p["status"] != "ok" for p in providers.values()),
+                "providers": providers,
+            }
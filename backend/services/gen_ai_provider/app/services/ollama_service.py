@@ -1,14 +1,91 @@
-import os
+import asyncio
+import json
+import threading
 import requests
 import httpx
-from typing import Optional, List, Generator
+from requests.adapters import HTTPAdapter
+from typing import Optional, List, AsyncIterator
 
 from services.base_ai_service import BaseAIService
-from config.constants import MAPPING_AI_PROVIDER_TO_MODEL, SCHEMA
+from services.rate_limiter import is_rate_limited
+from config.constants import (
+    MAPPING_AI_PROVIDER_TO_MODEL,
+    OLLAMA_URL,
+    OLLAMA_KEEP_ALIVE,
+    OLLAMA_NUM_CTX,
+    OLLAMA_REQUEST_TIMEOUT,
+    OLLAMA_CONNECT_TIMEOUT,
+    OLLAMA_CATALOG_TIMEOUT,
+    OLLAMA_POOL_SIZE,
+)
 from config.log_config import AppLogger
+from utils.streaming import delta_event, usage_event
+from utils.usage import record_usage
+from utils.response_format import ollama_format
 
 logger = AppLogger(__name__)
 
+# Shared clients so requests reuse pooled keep-alive connections to Ollama
+_async_client: Optional[httpx.AsyncClient] = None
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get or create the process-wide async HTTP client for Ollama."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(OLLAMA_REQUEST_TIMEOUT, connect=OLLAMA_CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_keepalive_connections=OLLAMA_POOL_SIZE, max_connections=100),
+        )
+    return _async_client
+
+
+def get_session() -> requests.Session:
+    """Get or create the process-wide pooled session for blocking calls to Ollama (thread-safe)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OLLAMA_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+async def close_async_client():
+    """Close the shared clients (call on shutdown)."""
+    global _async_client, _session
+    if _async_client:
+        await _async_client.aclose()
+        _async_client = None
+    if _session:
+        _session.close()
+        _session = None
+
+
+async def preload_models(models: List[str]) -> None:
+    """
+    Loads ``models`` into Ollama's memory so the first chat does not pay the
+    cold load. A generate request without a prompt only loads the model.
+    """
+
+    async def preload(model: str) -> None:
+        try:
+            response = await get_async_client().post(
+                f"{OLLAMA_URL}/api/generate",
+                json={"model": model, "keep_alive": OLLAMA_KEEP_ALIVE},
+            )
+            response.raise_for_status()
+            logger.info(f"Preloaded Ollama model {model} (keep_alive={OLLAMA_KEEP_ALIVE})")
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to preload Ollama model {model}: {e}")
+
+    await asyncio.gather(*(preload(model) for model in models))
+
 
 class OllamaService(BaseAIService):
     def __init__(self, model: str = "mistral"):
@@ -16,64 +93,131 @@ class OllamaService(BaseAIService):
         Initializes the Ollama AI service with the provided model.
         """
         super().__init__(model)
-        self.OLLAMA_URL = os.environ.get("OLLAMA_URL", f"{SCHEMA}://ollama:11434")
+        self.OLLAMA_URL = OLLAMA_URL
 
-    async def chat_stream(
+    def _payload(
         self,
         messages: list,
-        temperature: Optional[float] = 0.5,
-    ) -> Generator[str, None, None]:
+        temperature: Optional[float],
+        stream: bool,
+        response_format: Optional[dict] = None,
+    ) -> dict:
+        """
+        Chat request body. Sampling settings belong in ``options``; Ollama ignores them top-level.
+        A requested JSON format becomes ``format`` ("json" or the schema itself).
+        """
+        options = {}
+        if temperature is not None:
+            options["temperature"] = temperature
+        if OLLAMA_NUM_CTX:
+            options["num_ctx"] = OLLAMA_NUM_CTX
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "options": options,
+            "keep_alive": OLLAMA_KEEP_ALIVE,
+            "stream": stream,
+        }
+        output_format = ollama_format(response_format)
+        if output_format:
+            payload["format"] = output_format
+        return payload
+
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
         """
         Asynchronous generator to stream responses from Ollama API.
 
         :param messages: Chat messages (list of dicts).
-        :param temperature: Sampling temperature (default 0.5).
-        :yield: Partial streamed response chunks.
+        :param temperature: Sampling temperature (None keeps the model's default).
+        :param response_format: JSON mode or JSON schema (mapped to ``format``).
+        :yield: Delta events followed by a usage event.
         """
-        try:
-            async with httpx.AsyncClient(timeout=900.0) as client:
-                async with client.stream(
-                    "POST",
-                    f"{self.OLLAMA_URL}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": messages,
-                        "temperature": temperature,
-                        "stream": True,
-                    },
-                ) as response:
-                    async for chunk in response.aiter_text():
-                        yield chunk
-        except httpx.RequestError as e:
-            logger.error(f"Streaming error with Ollama API: {e}")
-            yield "Error during streaming."
+        client = get_async_client()
+        async with client.stream(
+            "POST",
+            f"{self.OLLAMA_URL}/api/chat",
+            json=self._payload(messages, temperature, stream=True, response_format=response_format),
+        ) as response:
+            response.raise_for_status()
+            # Ollama streams one JSON object per line; the last one has done=true and the token counts
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                content = data.get("message", {}).get("content", "")
+                if content:
+                    yield delta_event(content)
+                if data.get("done"):
+                    yield usage_event(
+                        data.get("prompt_eval_count"), data.get("eval_count")
+                    )
+                    return
+        yield usage_event()
 
     def chat(
         self,
         messages: list,
-        temperature: Optional[float] = 0.5,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
     ) -> str:
         """
         Synchronous chat request to Ollama API.
 
         :param messages: List of messages to send.
-        :param temperature: Sampling temperature.
+        :param temperature: Sampling temperature (None keeps the model's default).
+        :param response_format: JSON mode or JSON schema (mapped to ``format``).
         :return: Response text.
         """
         url = f"{self.OLLAMA_URL}/api/chat"
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": temperature,
-            "stream": False,
-        }
+        payload = self._payload(messages, temperature, stream=False, response_format=response_format)
 
         try:
-            response = requests.post(url, json=payload, timeout=900.0)
+            response = get_session().post(
+                url, json=payload, timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_REQUEST_TIMEOUT)
+            )
             response.raise_for_status()
             data = response.json()
+            record_usage(data.get("prompt_eval_count"), data.get("eval_count"))
             return data.get("message", {}).get("content", "")
         except requests.exceptions.RequestException as e:
+            if is_rate_limited(e):
+                # Let the scheduler pause the provider and honour Retry-After
+                raise
+            logger.error(f"Ollama API request failed: {e}")
+            return "Error querying Ollama API."
+
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        Asynchronous chat request to Ollama API over the shared client.
+
+        :param messages: List of messages to send.
+        :param temperature: Sampling temperature (None keeps the model's default).
+        :param response_format: JSON mode or JSON schema (mapped to ``format``).
+        :return: Response text.
+        """
+        url = f"{self.OLLAMA_URL}/api/chat"
+        payload = self._payload(messages, temperature, stream=False, response_format=response_format)
+
+        try:
+            response = await get_async_client().post(url, json=payload)
+            response.raise_for_status()
+            data = response.json()
+            record_usage(data.get("prompt_eval_count"), data.get("eval_count"))
+            return data.get("message", {}).get("content", "")
+        except httpx.HTTPError as e:
+            if is_rate_limited(e):
+                # Let the scheduler pause the provider and honour Retry-After
+                raise
             logger.error(f"Ollama API request failed: {e}")
             return "Error querying Ollama API."
 
@@ -84,7 +228,10 @@ class OllamaService(BaseAIService):
         :return: List of dicts with model details.
         """
         try:
-            response = requests.get(f"{self.OLLAMA_URL}/api/tags")
+            response = get_session().get(
+                f"{self.OLLAMA_URL}/api/tags",
+                timeout=(OLLAMA_CONNECT_TIMEOUT, OLLAMA_CATALOG_TIMEOUT),
+            )
             response.raise_for_status()
             raw_models = response.json().get("models", [])
             return [
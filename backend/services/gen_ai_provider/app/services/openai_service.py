@@ -1,15 +1,58 @@
 import os
-from typing import List, Union
-from openai import OpenAI
+import threading
+from typing import AsyncIterator, List, Optional, Union
+from openai import OpenAI, AsyncOpenAI
 from services.base_ai_service import BaseAIService
 from config.constants import (
     MAPPING_AI_PROVIDER_TO_MODEL,
     DEFAULT_EMBEDDING_MODEL,
 )
 from config.log_config import AppLogger
+from utils.streaming import delta_event, usage_event
+from utils.usage import record_usage
+from utils.response_format import openai_response_format
 
 logger = AppLogger(__name__)
 
+# Shared async client; it owns the connection pool reused by all requests
+_async_client: Optional[AsyncOpenAI] = None
+_async_client_lock = threading.Lock()
+
+
+def get_async_client() -> AsyncOpenAI:
+    """Get or create the process-wide AsyncOpenAI client (thread-safe)."""
+    global _async_client
+    if _async_client is None:
+        with _async_client_lock:
+            if _async_client is None:
+                _async_client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+    return _async_client
+
+
+async def stream_chat_completion(
+    client: AsyncOpenAI, model: str, messages: list, **kwargs
+) -> AsyncIterator[dict]:
+    """
+    Streams an OpenAI-compatible chat completion as delta events followed by a usage event.
+    """
+    stream = await client.chat.completions.create(
+        model=model,
+        messages=messages,
+        stream=True,
+        stream_options={"include_usage": True},
+        **kwargs,
+    )
+    usage = None
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield delta_event(chunk.choices[0].delta.content)
+        if chunk.usage:
+            usage = chunk.usage
+    if usage:
+        yield usage_event(usage.prompt_tokens, usage.completion_tokens)
+    else:
+        yield usage_event()
+
 
 class OpenAIService(BaseAIService):
     def __init__(self, model: str = "gpt-4-turbo"):
@@ -23,19 +66,79 @@ class OpenAIService(BaseAIService):
         api_key = os.environ.get("OPENAI_API_KEY")
         self.client = OpenAI(api_key=api_key)
 
-    def chat(self, messages: list) -> str:
+    def chat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
         """
         Sends a message to OpenAI API and returns the response.
 
         :param user_message: User input message
+        :param temperature: Sampling temperature (None keeps OpenAI's default)
+        :param response_format: JSON mode or JSON schema (structured outputs)
         :return: Chatbot response
         """
         response = self.client.chat.completions.create(
-            model=self.model, messages=messages
+            model=self.model,
+            messages=messages,
+            **self._sampling_options(temperature),
+            **openai_response_format(response_format),
+        )
+        if response.usage:
+            record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+
+        return response.choices[0].message.content
+
+    async def achat(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """
+        Sends a message to OpenAI API without blocking the event loop.
+
+        :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (None keeps OpenAI's default)
+        :param response_format: JSON mode or JSON schema (structured outputs)
+        :return: Chatbot response
+        """
+        response = await get_async_client().chat.completions.create(
+            model=self.model,
+            messages=messages,
+            **self._sampling_options(temperature),
+            **openai_response_format(response_format),
         )
+        if response.usage:
+            record_usage(response.usage.prompt_tokens, response.usage.completion_tokens)
 
         return response.choices[0].message.content
 
+    async def astream(
+        self,
+        messages: list,
+        temperature: Optional[float] = None,
+        response_format: Optional[dict] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        Streams the response from OpenAI API token by token.
+
+        :param messages: List of chat messages (role + content)
+        :param temperature: Sampling temperature (None keeps OpenAI's default)
+        :param response_format: JSON mode or JSON schema (structured outputs)
+        :yield: Delta events followed by a usage event
+        """
+        async for event in stream_chat_completion(
+            get_async_client(),
+            self.model,
+            messages,
+            **self._sampling_options(temperature),
+            **openai_response_format(response_format),
+        ):
+            yield event
+
     def get_available_models(self):
         """
         Returns a list of available OpenAI models.
@@ -53,18 +156,61 @@ class OpenAIService(BaseAIService):
             logger.exception(e)
         return []
 
-    def embed(self, input: Union[str, List[str]], model: str = DEFAULT_EMBEDDING_MODEL) -> List[List[float]]:
+    @staticmethod
+    def _embedding_options(model: str, dimensions: Optional[int]) -> dict:
+        # Only text-embedding-3 models accept a reduced output dimension
+        if dimensions and model.startswith("text-embedding-3"):
+            return {"dimensions": dimensions}
+        return {}
+
+    def embed(
+        self,
+        input: Union[str, List[str]],
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        dimensions: Optional[int] = None,
+    ) -> List[List[float]]:
         """
         Creates embeddings for the given input text(s).
 
         :param input: A string or list of strings to embed
         :param model: The embedding model to use
+        :param dimensions: Output dimension for models supporting it (default: native size)
         :return: List of embedding vectors
         """
         try:
             # Ensure input is a list
             texts = [input] if isinstance(input, str) else input
-            response = self.client.embeddings.create(model=model, input=texts)
+            response = self.client.embeddings.create(
+                model=model, input=texts, **self._embedding_options(model, dimensions)
+            )
+            if response.usage:
+                record_usage(response.usage.prompt_tokens, 0)
+            return [item.embedding for item in response.data]
+        except Exception as e:
+            logger.exception(f"Error creating embeddings: {e}")
+            raise
+
+    async def aembed(
+        self,
+        input: Union[str, List[str]],
+        model: str = DEFAULT_EMBEDDING_MODEL,
+        dimensions: Optional[int] = None,
+    ) -> List[List[float]]:
+        """
+        Creates embeddings for the given input text(s) without blocking the event loop.
+
+        :param input: A string or list of strings to embed
+        :param model: The embedding model to use
+        :param dimensions: Output dimension for models supporting it (default: native size)
+        :return: List of embedding vectors
+        """
+        try:
+            texts = [input] if isinstance(input, str) else input
+            response = await get_async_client().embeddings.create(
+                model=model, input=texts, **self._embedding_options(model, dimensions)
+            )
+            if response.usage:
+                record_usage(response.usage.prompt_tokens, 0)
             return [item.embedding for item in response.data]
         except Exception as e:
             logger.exception(f"Error creating embeddings: {e}")
@@ -0,0 +1,273 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from config.constants import (
+    PRIORITY_CLASSES,
+    DEFAULT_PRIORITY,
+    PROVIDER_MAX_CONCURRENCY,
+    PROVIDER_RATE_LIMITS,
+    SCHEDULER_MAX_QUEUE_WAIT_SECONDS,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+
+logger = AppLogger(__name__)
+
+
+class ProviderRateLimitError(Exception):
+    """Raised when a provider is rate limited, or a request waited too long for a slot."""
+
+    def __init__(self, provider: str, retry_after: Optional[float] = None):
+        self.provider = provider
+        self.retry_after = retry_after
+        super().__init__(f"{provider} is rate limited (retry after {retry_after}s)")
+
+
+def retry_after_from_exception(e: Exception) -> Optional[float]:
+    """
+    Returns the Retry-After delay if ``e`` is an HTTP 429 from a provider SDK
+    (OpenAI/Anthropic status errors, httpx/requests errors, Google ResourceExhausted), else None.
+    """
+    status = getattr(e, "status_code", None)
+    response = getattr(e, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+    if status is None:
+        # google.api_core errors carry the HTTP status as ``code``
+        status = getattr(e, "code", None)
+    if status != 429:
+        return None
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def is_rate_limited(e: Exception) -> bool:
+    """True if ``e`` is a provider 429 that ProviderScheduler.slot should handle."""
+    return retry_after_from_exception(e) is not None
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if available now)."""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= min(amount, self.capacity)
+
+
+class _Limit:
+    """Concurrency cap plus optional requests/tokens per minute for one provider or model."""
+
+    def __init__(self, concurrency: int, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.concurrency = concurrency
+        self.active = 0
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def wait_time(self, tokens: int) -> Optional[float]:
+        """None if the concurrency cap is reached, else seconds until the budgets allow the request."""
+        if self.active >= self.concurrency:
+            return None
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.wait_time(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.wait_time(tokens))
+        return wait
+
+    def acquire(self, tokens: int) -> None:
+        self.active += 1
+        if self.requests:
+            self.requests.consume(1)
+        if self.tokens:
+            self.tokens.consume(tokens)
+
+
+class _Waiter:
+    def __init__(self, priority: int, seq: int, model: str, tokens: int, future: asyncio.Future):
+        self.priority = priority
+        self.seq = seq
+        self.model = model
+        self.tokens = tokens
+        self.future = future
+        self.enqueued_at = time.monotonic()
+
+    def __lt__(self, other: "_Waiter") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _ProviderQueue:
+    def __init__(self, provider: str):
+        self.provider = provider
+        self.limit = self._make_limit(provider, PROVIDER_MAX_CONCURRENCY)
+        self.model_limits: Dict[str, _Limit] = {}
+        self.waiters: List[_Waiter] = []
+        self.paused_until = 0.0
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+    @staticmethod
+    def _make_limit(key: str, default_concurrency: int) -> _Limit:
+        config = PROVIDER_RATE_LIMITS.get(key, {})
+        return _Limit(
+            concurrency=int(config.get("concurrency", default_concurrency)),
+            rpm=config.get("rpm"),
+            tpm=config.get("tpm"),
+        )
+
+    def model_limit(self, model: str) -> _Limit:
+        if model not in self.model_limits:
+            self.model_limits[model] = self._make_limit(model, self.limit.concurrency)
+        return self.model_limits[model]
+
+
+class ProviderScheduler:
+    """
+    Admission control in front of the AI providers.
+
+    Every call takes a slot for its provider and model. Slots are limited by
+    concurrency, requests per minute and tokens per minute (PROVIDER_RATE_LIMITS,
+    keyed by provider class or model name). Waiting requests are served by
+    priority class (interactive > cv_parsing > bulk), then FIFO. A provider
+    answering 429 is paused for its Retry-After delay.
+    """
+
+    def __init__(self, max_queue_wait: float = SCHEDULER_MAX_QUEUE_WAIT_SECONDS):
+        self._max_queue_wait = max_queue_wait
+        self._queues: Dict[str, _ProviderQueue] = {}
+        self._seq = itertools.count()
+
+    def _queue(self, provider: str) -> _ProviderQueue:
+        if provider not in self._queues:
+            self._queues[provider] = _ProviderQueue(provider)
+        return self._queues[provider]
+
+    @staticmethod
+    def priority_value(priority: Optional[str]) -> int:
+        return PRIORITY_CLASSES.get(priority or DEFAULT_PRIORITY, PRIORITY_CLASSES[DEFAULT_PRIORITY])
+
+    @asynccontextmanager
+    async def slot(self, provider: str, model: str, tokens: int = 1, priority: Optional[str] = None):
+        """
+        Waits for a slot for ``model`` on ``provider`` and holds it for the duration of the block.
+        A 429 raised inside the block pauses the provider and surfaces as ProviderRateLimitError.
+        """
+        priority_name = priority if priority in PRIORITY_CLASSES else DEFAULT_PRIORITY
+        queue = self._queue(provider)
+        await self._acquire(queue, model, tokens, priority_name)
+        try:
+            yield
+        except ProviderRateLimitError:
+            raise
+        except Exception as e:
+            retry_after = retry_after_from_exception(e)
+            if retry_after is None:
+                raise
+            self.pause(provider, retry_after)
+            raise ProviderRateLimitError(provider, retry_after) from e
+        finally:
+            queue.limit.active -= 1
+            queue.model_limit(model).active -= 1
+            self._dispatch(queue)
+
+    async def _acquire(self, queue: _ProviderQueue, model: str, tokens: int, priority_name: str) -> None:
+        loop = asyncio.get_running_loop()
+        waiter = _Waiter(
+            self.priority_value(priority_name), next(self._seq), model, tokens, loop.create_future()
+        )
+        heapq.heappush(queue.waiters, waiter)
+        SCHEDULER_QUEUE_DEPTH.labels(provider=queue.provider, priority=priority_name).inc()
+        try:
+            self._dispatch(queue)
+            await asyncio.wait_for(asyncio.shield(waiter.future), self._max_queue_wait)
+        except asyncio.TimeoutError:
+            if waiter.future.done():
+                # Granted at the same time the wait expired; keep the slot
+                return
+            waiter.future.cancel()
+            SCHEDULER_REJECTED.labels(provider=queue.provider).inc()
+            raise ProviderRateLimitError(
+                queue.provider, max(queue.paused_until - time.monotonic(), 1.0)
+            )
+        except asyncio.CancelledError:
+            # Caller went away; give the slot back if it had been granted
+            if waiter.future.done() and not waiter.future.cancelled():
+                queue.limit.active -= 1
+                queue.model_limit(model).active -= 1
+                self._dispatch(queue)
+            waiter.future.cancel()
+            raise
+        finally:
+            SCHEDULER_QUEUE_DEPTH.labels(provider=queue.provider, priority=priority_name).dec()
+            SCHEDULER_WAIT_SECONDS.labels(provider=queue.provider, priority=priority_name).observe(
+                time.monotonic() - waiter.enqueued_at
+            )
+
+    def _dispatch(self, queue: _ProviderQueue) -> None:
+        """Grants slots to eligible waiters in priority order and schedules a retry for the rest."""
+        if queue.timer:
+            queue.timer.cancel()
+            queue.timer = None
+
+        now = time.monotonic()
+        retry_in = queue.paused_until - now if queue.paused_until > now else None
+        if retry_in is None:
+            pending: List[_Waiter] = []
+            while queue.waiters:
+                waiter = heapq.heappop(queue.waiters)
+                if waiter.future.done():
+                    continue
+                provider_wait = queue.limit.wait_time(waiter.tokens)
+                model_limit = queue.model_limit(waiter.model)
+                model_wait = model_limit.wait_time(waiter.tokens)
+                if provider_wait == 0.0 and model_wait == 0.0:
+                    queue.limit.acquire(waiter.tokens)
+                    model_limit.acquire(waiter.tokens)
+                    waiter.future.set_result(None)
+                    continue
+                pending.append(waiter)
+                # Concurrency-bound waiters are woken by a release, budget-bound ones by a timer
+                for wait in (provider_wait, model_wait):
+                    if wait:
+                        retry_in = wait if retry_in is None else min(retry_in, wait)
+                if provider_wait is None:
+                    break
+            for waiter in pending:
+                heapq.heappush(queue.waiters, waiter)
+
+        if retry_in and queue.waiters:
+            queue.timer = asyncio.get_running_loop().call_later(retry_in, self._dispatch, queue)
+
+    def pause(self, provider: str, seconds: float) -> None:
+        """Stops granting slots for ``provider`` for ``seconds`` (honours Retry-After)."""
+        queue = self._queue(provider)
+        queue.paused_until = max(queue.paused_until, time.monotonic() + seconds)
+        PROVIDER_RATE_LIMITED.labels(provider=provider).inc()
+        logger.warn(f"{provider} rate limited, pausing for {seconds:.1f}s")
+
+
+provider_scheduler = ProviderScheduler()
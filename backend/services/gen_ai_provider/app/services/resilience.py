@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from config.constants import (
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_SECONDS,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+
+logger = AppLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the provider's circuit breaker is open."""
+
+    def __init__(self, provider: str):
+        self.provider = provider
+        super().__init__(f"Circuit breaker open for {provider}")
+
+
+class LatencyTracker:
+    """Rolling window of successful call latencies per model."""
+
+    def __init__(self, window: int = HEDGE_LATENCY_WINDOW, min_samples: int = HEDGE_MIN_SAMPLES):
+        self._window = window
+        self._min_samples = min_samples
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float) -> None:
+        with self._lock:
+            if key not in self._samples:
+                self._samples[key] = deque(maxlen=self._window)
+            self._samples[key].append(seconds)
+
+    def percentile(self, key: str, q: float = HEDGE_PERCENTILE) -> Optional[float]:
+        """Returns the ``q`` quantile of recent latencies, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self._min_samples:
+            return None
+        index = min(len(samples) - 1, int(q * len(samples)))
+        return samples[index]
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one provider.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    are refused for ``reset_timeout`` seconds. Then a single trial call is let
+    through (half-open): success closes the circuit, failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+    _STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_SECONDS,
+    ):
+        self.name = name
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+
+    def _set_state(self, state: str) -> None:
+        if state != self.state:
+            logger.info(f"Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
+        CIRCUIT_BREAKER_STATE.labels(provider=self.name).set(self._STATE_VALUES[state])
+
+    def allow(self) -> bool:
+        """Returns True if a call may be made now."""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self._reset_timeout:
+                    return False
+                self._set_state(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    return False
+                self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            self._set_state(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(self.OPEN)
+
+    def release(self) -> None:
+        """Frees a half-open trial slot without judging the provider (e.g. the call was cancelled)."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Returns the shared circuit breaker of ``provider``."""
+    with _circuit_breakers_lock:
+        if provider not in _circuit_breakers:
+            _circuit_breakers[provider] = CircuitBreaker(provider)
+        return _circuit_breakers[provider]
+
+
+async def first_success(
+    primary: Callable[[], Awaitable[T]],
+    hedge: Optional[Callable[[], Awaitable[T]]] = None,
+    hedge_after: Optional[float] = None,
+) -> T:
+    """
+    Runs ``primary`` and, if it has not finished after ``hedge_after`` seconds
+    (or fails earlier), starts ``hedge`` as well. Returns the first successful
+    result and cancels the other call. Raises the primary's error if both fail.
+    """
+    primary_task = asyncio.ensure_future(primary())
+    if hedge is None:
+        return await primary_task
+
+    try:
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_after)
+    except asyncio.CancelledError:
+        primary_task.cancel()
+        raise
+    if primary_task in done and primary_task.exception() is None:
+        return primary_task.result()
+
+    HEDGED_REQUESTS.labels(reason="error" if done else "slow").inc()
+    hedge_task = asyncio.ensure_future(hedge())
+    pending = {hedge_task} if done else {primary_task, hedge_task}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is hedge_task:
+                        HEDGE_WINS.inc()
+                    return task.result()
+    finally:
+        for task in (primary_task, hedge_task):
+            if not task.done():
+                task.cancel()
+    raise primary_task.exception()
+
+
+latency_tracker = LatencyTracker()
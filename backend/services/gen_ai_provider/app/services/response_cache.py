@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import json
+from typing import Optional
+
+from config.constants import (
+    CHAT_CACHE_ENABLED,
+    CHAT_CACHE_MAX_ENTRIES,
+    CHAT_CACHE_TTL_SECONDS,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+from utils.cache_store import LRUCache, create_cache_store
+
+logger = AppLogger(__name__)
+
+
+class ChatResponseCache:
+    """
+    Content-addressed cache of chat completions.
+
+    Only deterministic requests (temperature 0) are cacheable. Lookups hit a
+    bounded in-memory LRU first, then the persistent tier (Redis or on-disk),
+    promoting persistent hits into memory.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = CHAT_CACHE_ENABLED,
+        max_entries: int = CHAT_CACHE_MAX_ENTRIES,
+        ttl: int = CHAT_CACHE_TTL_SECONDS,
+    ):
+        self.enabled = enabled
+        self._ttl = ttl
+        self._memory = LRUCache(max_entries, ttl)
+        self._store = create_cache_store("chat_responses") if enabled else None
+
+    @staticmethod
+    def is_cacheable(temperature: float) -> bool:
+        return temperature == 0
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        temperature: float,
+        messages: list,
+        response_format: Optional[dict] = None,
+    ) -> str:
+        """Hashes the request after normalizing roles, line endings and surrounding whitespace."""
+        normalized = [
+            {
+                "role": str(msg.get("role", "")).strip().lower(),
+                "content": str(msg.get("content", "")).replace("\r\n", "\n").strip(),
+            }
+            for msg in messages
+        ]
+        request = [provider, model, float(temperature), normalized]
+        if response_format:
+            # Appended only when set so plain-text keys stay unchanged
+            request.append(response_format)
+        raw = json.dumps(
+            request,
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._memory.get(key)
+        if value is not None:
+            CHAT_CACHE_HITS.labels(tier="memory").inc()
+            return value
+
+        if self._store is not None:
+            try:
+                raw = await asyncio.to_thread(self._store.get, key)
+            except Exception as e:
+                logger.error(f"Chat cache lookup failed: {e}")
+                raw = None
+            if raw is not None:
+                value = raw.decode("utf-8")
+                self._memory.set(key, value)
+                CHAT_CACHE_HITS.labels(tier="persistent").inc()
+                return value
+
+        CHAT_CACHE_MISSES.inc()
+        return None
+
+    async def peek(self, key: str) -> Optional[str]:
+        """Reads the persistent tier without touching metrics (used while polling)."""
+        if self._store is None:
+            return None
+        try:
+            raw = await asyncio.to_thread(self._store.get, key)
+        except Exception as e:
+            logger.error(f"Chat cache lookup failed: {e}")
+            return None
+        return raw.decode("utf-8") if raw is not None else None
+
+    async def set(self, key: str, value: str) -> None:
+        self._memory.set(key, value)
+        if self._store is not None:
+            try:
+                await asyncio.to_thread(self._store.set, key, value.encode("utf-8"), self._ttl)
+            except Exception as e:
+                logger.error(f"Chat cache write failed: {e}")
+
+
+chat_response_cache = ChatResponseCache()
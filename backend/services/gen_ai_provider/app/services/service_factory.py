@@ -1,27 +1,61 @@
 from typing import Optional
+from services.base_ai_service import BaseAIService
 from services.openai_service import OpenAIService
 from services.ollama_service import OllamaService
 from services.gemini_service import GeminiAIService
+from services.local_stub_service import LocalStubService, serves_model
+from services.model_registry import ModelRegistry
+from config.constants import LOCAL_STUB_MODE
 from config.log_config import AppLogger
 
 logger = AppLogger(__name__)
 
+# Available services in routing priority order
+AI_SERVICES = [OpenAIService, OllamaService, GeminiAIService]
+if LOCAL_STUB_MODE == "all":
+    # Offline load testing: no real provider is contacted
+    AI_SERVICES = [LocalStubService]
+elif LOCAL_STUB_MODE == "on":
+    AI_SERVICES = [LocalStubService] + AI_SERVICES
 
-def get_ai_service(model: str) -> Optional[object]:
+model_registry = ModelRegistry(AI_SERVICES)
+
+
+_stub_services = {}
+_embedding_service: Optional[OpenAIService] = None
+
+
+def _get_stub_service(model: str) -> LocalStubService:
+    if model not in _stub_services:
+        _stub_services[model] = LocalStubService(model)
+    return _stub_services[model]
+
+
+def get_embedding_service(model: str) -> BaseAIService:
+    """Returns the provider serving embeddings for ``model`` (OpenAI unless stubbed)."""
+    if serves_model(model):
+        return _get_stub_service(model)
+    return _get_openai_embedding_service()
+
+
+def _get_openai_embedding_service() -> OpenAIService:
+    global _embedding_service
+    if _embedding_service is None:
+        _embedding_service = OpenAIService()
+    return _embedding_service
+
+
+def get_ai_service(model: str) -> Optional[BaseAIService]:
     """
     Returns an instance of the appropriate AI service class based on the model name.
     """
-    # Define available services and their classes
-    services = [OpenAIService, OllamaService, GeminiAIService]
-
-    for ServiceClass in services:
-        service_instance = ServiceClass(model)
-        available_models = [m["model"] for m in service_instance.get_available_models()]
-        logger.info(f"{ServiceClass.__name__} supports: {available_models}")
+    if LOCAL_STUB_MODE == "all":
+        return _get_stub_service(model)
 
-        if model in available_models:
-            logger.info(f"Using {ServiceClass.__name__} for model: {model}")
-            return service_instance
+    service_instance = model_registry.resolve(model)
+    if service_instance is None:
+        logger.warn(f"No AI service found for model: {model}")
+        return None
 
-    logger.warn(f"No AI service found for model: {model}")
-    return None
+    logger.debug(f"Using {service_instance.__class__.__name__} for model: {model}")
+    return service_instance
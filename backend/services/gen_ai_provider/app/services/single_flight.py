@@ -0,0 +1,155 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config.constants import (
+    SINGLE_FLIGHT_ENABLED,
+    SINGLE_FLIGHT_REDIS_ENABLED,
+    SINGLE_FLIGHT_LOCK_TTL_SECONDS,
+    SINGLE_FLIGHT_POLL_INTERVAL_MS,
+)
+from config.log_config import AppLogger
+from metrics.prometheus_metrics import *
+from utils.cache_store import get_redis_connection
+
+logger = AppLogger(__name__)
+
+# In-flight call and the position of the key's result in that call's output (None for a single result)
+_Entry = Tuple[asyncio.Future, Optional[int]]
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls into one.
+
+    The first caller for a key starts the call as a shared task; callers
+    arriving while it runs await the same task instead of repeating it.
+    A caller that goes away does not cancel the call for the others.
+
+    With ``distributed`` set, ``do`` also takes a Redis lock per key so that
+    replicas waiting on another replica's call poll ``lookup`` (typically the
+    shared cache) for its result instead of calling upstream themselves.
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        enabled: bool = SINGLE_FLIGHT_ENABLED,
+        distributed: bool = SINGLE_FLIGHT_REDIS_ENABLED,
+        lock_ttl: int = SINGLE_FLIGHT_LOCK_TTL_SECONDS,
+        poll_interval_ms: int = SINGLE_FLIGHT_POLL_INTERVAL_MS,
+    ):
+        self._kind = kind
+        self.enabled = enabled
+        self._distributed = distributed
+        self._lock_ttl = lock_ttl
+        self._poll_interval = poll_interval_ms / 1000.0
+        self._inflight: Dict[str, _Entry] = {}
+
+    def _start(self, keys: List[str], call: Awaitable, indexed: bool) -> asyncio.Future:
+        task = asyncio.ensure_future(call)
+        for i, key in enumerate(keys):
+            self._inflight[key] = (task, i if indexed else None)
+
+        def _done(t: asyncio.Future) -> None:
+            for key in keys:
+                if self._inflight.get(key, (None,))[0] is t:
+                    del self._inflight[key]
+            # Mark the error as retrieved in case every caller went away
+            if not t.cancelled():
+                t.exception()
+
+        task.add_done_callback(_done)
+        return task
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        lookup: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Any:
+        """
+        Returns ``fn()``, sharing the call with concurrent callers of the same key.
+
+        :param lookup: Reads the result another replica stored (distributed mode only).
+        """
+        if not self.enabled:
+            return await fn()
+        entry = self._inflight.get(key)
+        if entry is not None:
+            SINGLE_FLIGHT_COALESCED.labels(kind=self._kind, scope="local").inc()
+            return await asyncio.shield(entry[0])
+
+        call = fn()
+        if self._distributed and lookup is not None:
+            call = self._run_locked(key, call, lookup)
+        return await asyncio.shield(self._start([key], call, indexed=False))
+
+    async def do_many(
+        self, keys: List[str], fn: Callable[[List[int]], Awaitable[List[Any]]]
+    ) -> List[Any]:
+        """
+        Returns one result per key. Keys already in flight join those calls;
+        the rest are computed by a single ``fn(indexes)`` call, which returns the
+        results of ``keys[i]`` for the given indexes, in order. Keys must be unique.
+        """
+        if not self.enabled:
+            return await fn(list(range(len(keys))))
+
+        joined: Dict[int, _Entry] = {}
+        own: List[int] = []
+        for i, key in enumerate(keys):
+            entry = self._inflight.get(key)
+            if entry is not None:
+                joined[i] = entry
+            else:
+                own.append(i)
+        if joined:
+            SINGLE_FLIGHT_COALESCED.labels(kind=self._kind, scope="local").inc(len(joined))
+
+        results: List[Any] = [None] * len(keys)
+        if own:
+            task = self._start([keys[i] for i in own], fn(own), indexed=True)
+            for position, i in enumerate(own):
+                joined[i] = (task, position)
+
+        for i, (task, position) in joined.items():
+            value = await asyncio.shield(task)
+            results[i] = value if position is None else value[position]
+        return results
+
+    async def _run_locked(
+        self, key: str, call: Awaitable, lookup: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Runs ``call`` under the key's Redis lock, or reuses the lock holder's stored result."""
+        try:
+            lock = get_redis_connection().lock(
+                f"genai:single_flight:{self._kind}:{key}", timeout=self._lock_ttl
+            )
+            acquired = await asyncio.to_thread(lock.acquire, blocking=False)
+        except Exception as e:
+            logger.error(f"Single-flight lock unavailable, calling upstream: {e}")
+            return await call
+
+        if not acquired:
+            # Another replica is making this call; wait for its result
+            deadline = time.monotonic() + self._lock_ttl
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self._poll_interval)
+                released = not await asyncio.to_thread(lock.locked)
+                result = await lookup()
+                if result is not None:
+                    SINGLE_FLIGHT_COALESCED.labels(kind=self._kind, scope="redis").inc()
+                    call.close()
+                    return result
+                if released:
+                    break
+            return await call
+
+        try:
+            return await call
+        finally:
+            try:
+                await asyncio.to_thread(lock.release)
+            except Exception as e:
+                logger.warn(f"Failed to release single-flight lock: {e}")
@@ -0,0 +1,205 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import redis
+
+from config.constants import (
+    GENAI_CACHE_BACKEND,
+    GENAI_CACHE_DIR,
+    GENAI_DISK_CACHE_MAX_ROWS,
+    GENAI_DISK_CACHE_PURGE_INTERVAL,
+    REDIS_HOST,
+    REDIS_PORT,
+    REDIS_DB,
+)
+from config.log_config import AppLogger
+
+logger = AppLogger(__name__)
+
+
+class LRUCache:
+    """Bounded, thread-safe in-memory LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._data[key] = (value, time.time() + self._ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self._max_entries:
+                self._data.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStore:
+    """Persistent byte store shared across requests (and replicas for Redis)."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        raise NotImplementedError
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self.get(key) for key in keys]
+
+    def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+
+_redis_conn: Optional[redis.StrictRedis] = None
+_redis_lock = threading.Lock()
+
+
+def get_redis_connection() -> redis.StrictRedis:
+    """Returns the Redis connection shared by the cache stores and single-flight locks."""
+    global _redis_conn
+    if _redis_conn is None:
+        with _redis_lock:
+            if _redis_conn is None:
+                _redis_conn = redis.StrictRedis(
+                    connection_pool=redis.ConnectionPool(
+                        host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, max_connections=20
+                    )
+                )
+    return _redis_conn
+
+
+class RedisCacheStore(CacheStore):
+    def __init__(self, namespace: str):
+        self._prefix = f"genai:{namespace}:"
+        self._conn = get_redis_connection()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._conn.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._conn.set(self._prefix + key, value, ex=ttl)
+
+    def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return self._conn.mget([self._prefix + key for key in keys])
+
+    def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        pipe = self._conn.pipeline(transaction=False)
+        for key, value in items.items():
+            pipe.set(self._prefix + key, value, ex=ttl)
+        pipe.execute()
+
+
+class DiskCacheStore(CacheStore):
+    """
+    SQLite-backed store, one table per namespace. Expired rows are deleted when
+    read and purged every ``purge_interval`` seconds; beyond ``max_rows`` the rows
+    closest to expiry (the oldest, since a namespace uses one TTL) are evicted.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        directory: str = GENAI_CACHE_DIR,
+        max_rows: int = GENAI_DISK_CACHE_MAX_ROWS,
+        purge_interval: int = GENAI_DISK_CACHE_PURGE_INTERVAL,
+    ):
+        os.makedirs(directory, exist_ok=True)
+        self._table = namespace
+        self._max_rows = max_rows
+        self._purge_interval = purge_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "genai_cache.db"), check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self._table} "
+                "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {self._table}_expires_at ON {self._table} (expires_at)"
+            )
+            self._purge()
+
+    def _purge(self) -> None:
+        """Deletes expired rows and evicts the oldest beyond ``max_rows`` (call with the lock held)."""
+        self._conn.execute(f"DELETE FROM {self._table} WHERE expires_at < ?", (time.time(),))
+        rows = self._conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+        if rows > self._max_rows:
+            self._conn.execute(
+                f"DELETE FROM {self._table} WHERE key IN "
+                f"(SELECT key FROM {self._table} ORDER BY expires_at LIMIT ?)",
+                (rows - self._max_rows,),
+            )
+            rows = self._max_rows
+        self._conn.commit()
+        # Upper bound of the row count until the next purge (replaced keys count twice)
+        self._rows = rows
+        self._purged_at = time.monotonic()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self._table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] < time.time():
+                self._conn.execute(f"DELETE FROM {self._table} WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+        return row[0] if row is not None else None
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, bytes], ttl: int) -> None:
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self._table} (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, value, expires_at) for key, value in items.items()],
+            )
+            self._conn.commit()
+            self._rows += len(items)
+            if (
+                self._rows > self._max_rows
+                or time.monotonic() - self._purged_at > self._purge_interval
+            ):
+                self._purge()
+
+
+def create_cache_store(namespace: str) -> Optional[CacheStore]:
+    """
+    Creates the persistent tier configured by GENAI_CACHE_BACKEND
+    ("redis", "disk" or "none"). Returns None when disabled or unavailable.
+    """
+    try:
+        if GENAI_CACHE_BACKEND == "redis":
+            return RedisCacheStore(namespace)
+        if GENAI_CACHE_BACKEND == "disk":
+            return DiskCacheStore(namespace)
+    except Exception as e:
+        logger.error(f"Failed to initialize {GENAI_CACHE_BACKEND} cache store for {namespace}: {e}")
+    return None
@@ -0,0 +1,57 @@
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import List
+
+import msgpack
+
+OCTET_STREAM_MEDIA_TYPE = "application/octet-stream"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Binary layout: uint32 rows, uint32 dims, then rows * dims little-endian float32 values
+SHAPE_HEADER = struct.Struct("<II")
+
+
+def pack_float32(values) -> bytes:
+    """Packs a flat sequence of floats as little-endian float32."""
+    packed = array("f", values)
+    if sys.byteorder != "little":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def unpack_float32(blob: bytes) -> List[float]:
+    """Inverse of ``pack_float32``."""
+    unpacked = array("f")
+    unpacked.frombytes(blob)
+    if sys.byteorder != "little":
+        unpacked.byteswap()
+    return unpacked.tolist()
+
+
+def _shape(vectors: List[List[float]]):
+    rows = len(vectors)
+    dims = len(vectors[0]) if rows else 0
+    if any(len(vector) != dims for vector in vectors):
+        raise ValueError("All embeddings must have the same dimension")
+    return rows, dims
+
+
+def encode_octet_stream(vectors: List[List[float]]) -> bytes:
+    """Encodes embeddings as a shape header followed by the packed float32 matrix."""
+    rows, dims = _shape(vectors)
+    return SHAPE_HEADER.pack(rows, dims) + pack_float32(chain.from_iterable(vectors))
+
+
+def encode_msgpack(vectors: List[List[float]]) -> bytes:
+    """Encodes embeddings as a msgpack map carrying the shape, dtype and packed float32 matrix."""
+    rows, dims = _shape(vectors)
+    return msgpack.packb(
+        {
+            "shape": [rows, dims],
+            "dtype": "<f4",
+            "data": pack_float32(chain.from_iterable(vectors)),
+        },
+        use_bin_type=True,
+    )
@@ -0,0 +1,103 @@
+import json
+import re
+from typing import Optional, Union
+
+# Keys of JSON Schema that Gemini's response_schema (an OpenAPI subset) rejects
+_GEMINI_UNSUPPORTED_KEYS = {"additionalProperties", "$schema", "$id", "title", "default", "examples", "strict"}
+# Keywords mapping names to subschemas
+_SCHEMA_MAP_KEYS = {"properties", "patternProperties", "$defs", "definitions"}
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL)
+
+
+def wants_json(response_format: Optional[dict]) -> bool:
+    """True if the caller asked for a JSON reply (json_object or json_schema)."""
+    return bool(response_format) and response_format.get("type") in ("json_object", "json_schema")
+
+
+def get_schema(response_format: Optional[dict]) -> Optional[dict]:
+    """The JSON schema of a json_schema response format, if any."""
+    if not response_format or response_format.get("type") != "json_schema":
+        return None
+    return (response_format.get("json_schema") or {}).get("schema")
+
+
+def openai_response_format(response_format: Optional[dict]) -> dict:
+    """
+    ``response_format`` argument for OpenAI chat completions (empty when plain text).
+    Schemas get the name OpenAI requires when the caller did not give one.
+    """
+    if not wants_json(response_format):
+        return {}
+    if response_format["type"] == "json_object":
+        return {"response_format": {"type": "json_object"}}
+    json_schema = {"name": "response", **(response_format.get("json_schema") or {})}
+    return {"response_format": {"type": "json_schema", "json_schema": json_schema}}
+
+
+def _gemini_schema(schema):
+    """Drops unsupported keywords from a schema and its subschemas; property names are kept."""
+    if isinstance(schema, list):
+        return [_gemini_schema(v) for v in schema]
+    if not isinstance(schema, dict):
+        return schema
+    cleaned = {}
+    for key, value in schema.items():
+        if key in _GEMINI_UNSUPPORTED_KEYS:
+            continue
+        if key in _SCHEMA_MAP_KEYS and isinstance(value, dict):
+            # Keys here are user field names (a field may be called "title"), values are subschemas
+            cleaned[key] = {name: _gemini_schema(subschema) for name, subschema in value.items()}
+        else:
+            cleaned[key] = _gemini_schema(value)
+    return cleaned
+
+
+def gemini_generation_config(response_format: Optional[dict]) -> dict:
+    """``generation_config`` for Gemini: JSON mime type plus ``response_schema`` when given."""
+    if not wants_json(response_format):
+        return {}
+    config = {"response_mime_type": "application/json"}
+    schema = get_schema(response_format)
+    if schema:
+        config["response_schema"] = _gemini_schema(schema)
+    return config
+
+
+def ollama_format(response_format: Optional[dict]) -> Optional[Union[str, dict]]:
+    """Ollama ``format``: the schema itself, or "json" for plain JSON mode."""
+    if not wants_json(response_format):
+        return None
+    return get_schema(response_format) or "json"
+
+
+def json_instruction(response_format: Optional[dict]) -> Optional[str]:
+    """
+    Prompt instruction for providers without native structured output,
+    so they still answer with bare JSON.
+    """
+    if not wants_json(response_format):
+        return None
+    schema = get_schema(response_format)
+    if schema:
+        return (
+            "Respond with a single JSON value matching this JSON schema, without prose or code fences:\n"
+            + json.dumps(schema, ensure_ascii=False)
+        )
+    return "Respond with a single valid JSON object, without prose or code fences."
+
+
+def with_json_instruction(messages: list, response_format: Optional[dict]) -> list:
+    """Returns ``messages`` with the JSON instruction appended to the last user message."""
+    instruction = json_instruction(response_format)
+    if not instruction or not messages:
+        return messages
+    messages = [dict(msg) for msg in messages]
+    last = messages[-1]
+    last["content"] = f"{last.get('content', '')}\n\n{instruction}"
+    return messages
+
+
+def strip_code_fence(reply: str) -> str:
+    """Removes a surrounding ```json fence that some models add even in JSON mode."""
+    match = _FENCE_RE.match(reply.strip())
+    return match.group(1) if match else reply
@@ -0,0 +1,41 @@
+import json
+from typing import Optional
+
+SSE_MEDIA_TYPE = "text/event-stream"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def delta_event(content: str) -> dict:
+    """A chunk of generated text."""
+    return {"type": "delta", "content": content}
+
+
+def usage_event(
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+) -> dict:
+    """Final event of a successful stream, carrying the token usage reported by the provider."""
+    total_tokens = None
+    if prompt_tokens is not None or completion_tokens is not None:
+        total_tokens = (prompt_tokens or 0) + (completion_tokens or 0)
+    return {
+        "type": "usage",
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+        },
+    }
+
+
+def error_event(message: str) -> dict:
+    """Final event of a failed stream."""
+    return {"type": "error", "message": message}
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def format_ndjson(event: dict) -> str:
+    return json.dumps(event, ensure_ascii=False) + "\n"
@@ -0,0 +1,90 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from config.constants import CALLER_STAGES, MODEL_PRICING
+
+
+class Usage:
+    """Token usage accumulated over the provider calls made for one request."""
+
+    def __init__(self):
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.cached = False
+
+    def add(self, prompt_tokens: int = 0, completion_tokens: int = 0, cost_usd: float = 0.0) -> None:
+        self.prompt_tokens += prompt_tokens or 0
+        self.completion_tokens += completion_tokens or 0
+        self.cost_usd += cost_usd
+
+    def merge(self, other: "Usage") -> None:
+        self.add(other.prompt_tokens, other.completion_tokens, other.cost_usd)
+        self.cached = self.cached or other.cached
+
+    def as_dict(self) -> dict:
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "total_tokens": self.prompt_tokens + self.completion_tokens,
+            "cost_usd": round(self.cost_usd, 8),
+            "cached": self.cached,
+        }
+
+
+# Usage of the current request and of the provider call in progress
+_request_usage: ContextVar[Optional[Usage]] = ContextVar("request_usage", default=None)
+_call_usage: ContextVar[Optional[Usage]] = ContextVar("call_usage", default=None)
+_caller_stage: ContextVar[str] = ContextVar("caller_stage", default="unknown")
+
+
+def start_request_usage() -> Usage:
+    """Starts accumulating usage for the current request (or batch item) and returns it."""
+    usage = Usage()
+    _request_usage.set(usage)
+    return usage
+
+
+def get_request_usage() -> Optional[Usage]:
+    return _request_usage.get()
+
+
+def start_call_usage() -> Usage:
+    """Starts collecting the usage that providers report for the next call."""
+    usage = Usage()
+    _call_usage.set(usage)
+    return usage
+
+
+def record_usage(prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """Called by providers with the token counts reported by the upstream API."""
+    usage = _call_usage.get()
+    if usage is not None:
+        usage.add(prompt_tokens or 0, completion_tokens or 0)
+
+
+def set_caller_stage(stage: Optional[str]) -> str:
+    """Sets the pipeline stage label from X-Caller-Stage; unknown values map to "other"."""
+    if not stage:
+        label = "unknown"
+    else:
+        label = stage.strip().lower()
+        if label not in CALLER_STAGES:
+            label = "other"
+    _caller_stage.set(label)
+    return label
+
+
+def get_caller_stage() -> str:
+    return _caller_stage.get()
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """USD cost from MODEL_PRICING (per million tokens); 0 for unpriced models."""
+    pricing = MODEL_PRICING.get(model)
+    if not pricing:
+        return 0.0
+    return (
+        prompt_tokens * pricing.get("prompt", 0.0)
+        + completion_tokens * pricing.get("completion", 0.0)
+    ) / 1_000_000
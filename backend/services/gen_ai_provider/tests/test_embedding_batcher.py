@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+
+from services.embedding_batcher import EmbeddingBatcher, estimate_tokens
+
+
+class FakeProvider:
+    """Embeds each text as [len(text)] and reports a fixed token count per call."""
+
+    def __init__(self, reported_tokens=None):
+        self.reported_tokens = reported_tokens
+        self.calls = []
+
+    async def __call__(self, texts, model, dimensions, priority):
+        self.calls.append(list(texts))
+        await asyncio.sleep(0)
+        return [[float(len(text))] for text in texts], self.reported_tokens, 0.25
+
+
+class TestEmbeddingBatcher(unittest.IsolatedAsyncioTestCase):
+    async def test_large_request_is_split_and_order_kept(self):
+        provider = FakeProvider()
+        batcher = EmbeddingBatcher(provider, max_batch_size=2, max_wait_ms=1)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        vectors, tokens, elapsed = await batcher.submit(texts, "m")
+
+        self.assertEqual(vectors, [[1.0], [2.0], [3.0], [4.0], [5.0]])
+        self.assertTrue(all(len(call) <= 2 for call in provider.calls))
+        self.assertEqual(sum(len(call) for call in provider.calls), len(texts))
+        self.assertEqual(tokens, sum(estimate_tokens(text) for text in texts))
+        self.assertEqual(elapsed, 0.25)
+
+    async def test_split_respects_token_limit(self):
+        provider = FakeProvider()
+        batcher = EmbeddingBatcher(provider, max_batch_size=100, max_wait_ms=1, max_batch_tokens=5)
+        texts = ["x" * 12, "y" * 12, "z" * 40]  # 4, 4 and 11 estimated tokens
+
+        vectors, _, _ = await batcher.submit(texts, "m")
+
+        self.assertEqual(provider.calls, [["x" * 12], ["y" * 12], ["z" * 40]])
+        self.assertEqual(vectors, [[12.0], [12.0], [40.0]])
+
+    async def test_concurrent_callers_share_one_call(self):
+        provider = FakeProvider()
+        batcher = EmbeddingBatcher(provider, max_batch_size=10, max_wait_ms=20)
+
+        first, second = await asyncio.gather(
+            batcher.submit(["a", "bb"], "m"), batcher.submit(["ccc"], "m")
+        )
+
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual(first[0], [[1.0], [2.0]])
+        self.assertEqual(second[0], [[3.0]])
+
+    async def test_reported_tokens_are_apportioned_by_estimate(self):
+        provider = FakeProvider(reported_tokens=60)
+        batcher = EmbeddingBatcher(provider, max_batch_size=10, max_wait_ms=20)
+        # Estimated 2 and 4 tokens: a third and two thirds of the batch
+        small, large = "a" * 4, "b" * 12
+
+        (_, small_tokens, _), (_, large_tokens, _) = await asyncio.gather(
+            batcher.submit([small], "m"), batcher.submit([large], "m")
+        )
+
+        self.assertEqual(len(provider.calls), 1)
+        self.assertEqual((small_tokens, large_tokens), (20, 40))
+
+    async def test_provider_error_reaches_every_caller(self):
+        async def failing(texts, model, dimensions, priority):
+            raise RuntimeError("provider down")
+
+        batcher = EmbeddingBatcher(failing, max_batch_size=10, max_wait_ms=1)
+        results = await asyncio.gather(
+            batcher.submit(["a"], "m"), batcher.submit(["b"], "m"), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
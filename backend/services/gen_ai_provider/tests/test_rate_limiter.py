@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import asyncio
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+from services import rate_limiter
+from services.rate_limiter import ProviderRateLimitError, ProviderScheduler
+
+
+def rate_limited_error(retry_after: str) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://provider/chat")
+    response = httpx.Response(429, headers={"retry-after": retry_after}, request=request)
+    return httpx.HTTPStatusError("Too Many Requests", request=request, response=response)
+
+
+class TestProviderScheduler(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(
+            rate_limiter,
+            "PROVIDER_RATE_LIMITS",
+            {"single": {"concurrency": 1}, "budget": {"concurrency": 1, "tpm": 600}},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scheduler = ProviderScheduler(max_queue_wait=1)
+
+    async def test_waiters_are_served_by_priority_then_fifo(self):
+        order = []
+        release = asyncio.Event()
+
+        async def hold():
+            async with self.scheduler.slot("single", "m"):
+                await release.wait()
+
+        async def call(name, priority):
+            async with self.scheduler.slot("single", "m", priority=priority):
+                order.append(name)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        tasks = [
+            asyncio.create_task(call("bulk", "bulk")),
+            asyncio.create_task(call("parse-1", "cv_parsing")),
+            asyncio.create_task(call("chat", "interactive")),
+            asyncio.create_task(call("parse-2", "cv_parsing")),
+        ]
+        await asyncio.sleep(0.01)
+        self.assertEqual(order, [])
+
+        release.set()
+        await asyncio.gather(holder, *tasks)
+        self.assertEqual(order, ["chat", "parse-1", "parse-2", "bulk"])
+
+    async def test_429_pauses_provider_for_retry_after(self):
+        with self.assertRaises(ProviderRateLimitError) as ctx:
+            async with self.scheduler.slot("single", "m"):
+                raise rate_limited_error("5")
+        self.assertEqual(ctx.exception.retry_after, 5.0)
+        self.assertIsInstance(ctx.exception.__cause__, httpx.HTTPStatusError)
+
+        queue = self.scheduler._queue("single")
+        self.assertGreater(queue.paused_until, time.monotonic() + 4)
+        self.assertEqual(queue.limit.active, 0)
+
+        # Nothing is granted while paused; the caller gives up after the queue wait
+        self.scheduler._max_queue_wait = 0.05
+        with self.assertRaises(ProviderRateLimitError):
+            async with self.scheduler.slot("single", "m"):
+                self.fail("slot granted while the provider is paused")
+
+    async def test_other_errors_pass_through(self):
+        with self.assertRaises(ValueError):
+            async with self.scheduler.slot("single", "m"):
+                raise ValueError("bad request")
+        self.assertEqual(self.scheduler._queue("single").paused_until, 0.0)
+
+    async def test_cancelled_waiter_takes_no_slot_or_tokens(self):
+        release = asyncio.Event()
+
+        async def hold():
+            async with self.scheduler.slot("budget", "m", tokens=100):
+                await release.wait()
+
+        async def wait_for_slot():
+            async with self.scheduler.slot("budget", "m", tokens=100):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        queue = self.scheduler._queue("budget")
+        tokens_after_holder = queue.limit.tokens.tokens
+
+        waiter = asyncio.create_task(wait_for_slot())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+        release.set()
+        await holder
+        self.assertEqual(queue.limit.active, 0)
+        self.assertEqual(queue.model_limit("m").active, 0)
+        self.assertEqual(queue.waiters, [])
+        # Only the holder's tokens were spent (allowing for refill)
+        self.assertGreaterEqual(queue.limit.tokens.tokens, tokens_after_holder)
+
+    async def test_cancelled_holder_releases_slot(self):
+        entered = asyncio.Event()
+
+        async def hold():
+            async with self.scheduler.slot("single", "m"):
+                entered.set()
+                await asyncio.sleep(10)
+
+        holder = asyncio.create_task(hold())
+        await entered.wait()
+        holder.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await holder
+
+        queue = self.scheduler._queue("single")
+        self.assertEqual(queue.limit.active, 0)
+        async with self.scheduler.slot("single", "m"):
+            self.assertEqual(queue.limit.active, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
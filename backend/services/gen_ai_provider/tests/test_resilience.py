@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+from unittest import mock
+
+from services import resilience
+from services.resilience import CircuitBreaker, first_success
+
+
+class TestFirstSuccess(unittest.IsolatedAsyncioTestCase):
+    async def test_fast_primary_does_not_start_hedge(self):
+        hedge = mock.AsyncMock(return_value="hedge")
+
+        async def primary():
+            return "primary"
+
+        self.assertEqual(await first_success(primary, hedge, hedge_after=1), "primary")
+        hedge.assert_not_called()
+
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        cancelled = asyncio.Event()
+
+        async def primary():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def hedge():
+            return "hedge"
+
+        self.assertEqual(await first_success(primary, hedge, hedge_after=0.01), "hedge")
+        await asyncio.sleep(0)
+        self.assertTrue(cancelled.is_set())
+
+    async def test_failed_primary_falls_back_to_hedge(self):
+        async def primary():
+            raise RuntimeError("primary failed")
+
+        async def hedge():
+            return "hedge"
+
+        self.assertEqual(await first_success(primary, hedge, hedge_after=10), "hedge")
+
+    async def test_both_failing_raises_primary_error(self):
+        async def primary():
+            raise RuntimeError("primary failed")
+
+        async def hedge():
+            raise ValueError("hedge failed")
+
+        with self.assertRaisesRegex(RuntimeError, "primary failed"):
+            await first_success(primary, hedge, hedge_after=10)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(resilience.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=30)
+
+    def open_breaker(self):
+        for _ in range(3):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        # A success resets the count
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_allows_a_single_trial(self):
+        self.open_breaker()
+        self.now += 31
+
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_trial_success_closes(self):
+        self.open_breaker()
+        self.now += 31
+        self.breaker.allow()
+        self.breaker.record_success()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+
+    def test_trial_failure_reopens(self):
+        self.open_breaker()
+        self.now += 31
+        self.breaker.allow()
+        self.breaker.record_failure()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+
+    def test_release_frees_the_trial(self):
+        self.open_breaker()
+        self.now += 31
+        self.assertTrue(self.breaker.allow())
+        self.breaker.release()
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+import asyncio
+import unittest
+
+from services.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.flights = SingleFlight("test", enabled=True, distributed=False)
+        self.calls = 0
+
+    async def slow_call(self, value="result"):
+        self.calls += 1
+        await asyncio.sleep(0.02)
+        return value
+
+    async def test_concurrent_callers_join_the_inflight_call(self):
+        results = await asyncio.gather(
+            *(self.flights.do("key", self.slow_call) for _ in range(5))
+        )
+        self.assertEqual(results, ["result"] * 5)
+        self.assertEqual(self.calls, 1)
+
+    async def test_different_keys_are_not_coalesced(self):
+        await asyncio.gather(
+            self.flights.do("a", self.slow_call), self.flights.do("b", self.slow_call)
+        )
+        self.assertEqual(self.calls, 2)
+
+    async def test_finished_call_is_not_reused(self):
+        await self.flights.do("key", self.slow_call)
+        await self.flights.do("key", self.slow_call)
+        self.assertEqual(self.calls, 2)
+
+    async def test_error_is_shared_and_forgotten(self):
+        async def failing():
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream failed")
+
+        results = await asyncio.gather(
+            self.flights.do("key", failing), self.flights.do("key", failing), return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(await self.flights.do("key", self.slow_call), "result")
+
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        first = asyncio.create_task(self.flights.do("key", self.slow_call))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(self.flights.do("key", self.slow_call))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "result")
+        self.assertEqual(self.calls, 1)
+
+    async def test_disabled_calls_every_time(self):
+        flights = SingleFlight("test", enabled=False, distributed=False)
+        await asyncio.gather(flights.do("key", self.slow_call), flights.do("key", self.slow_call))
+        self.assertEqual(self.calls, 2)
+
+    async def test_do_many_joins_inflight_keys(self):
+        requested = []
+
+        async def fetch(keys, indexes):
+            requested.append([keys[i] for i in indexes])
+            await asyncio.sleep(0.02)
+            return [keys[i].upper() for i in indexes]
+
+        first = asyncio.create_task(
+            self.flights.do_many(["a", "b"], lambda idx: fetch(["a", "b"], idx))
+        )
+        await asyncio.sleep(0)
+        second = await self.flights.do_many(["b", "c"], lambda idx: fetch(["b", "c"], idx))
+
+        self.assertEqual(await first, ["A", "B"])
+        self.assertEqual(second, ["B", "C"])
+        self.assertEqual(requested, [["a", "b"], ["c"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,33 @@
+import json
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 DEFAULT_COLLECTION_NAME = "knowledge_base"
 DEFAULT_EMBEDDING_MODEL = "text-embedding-3-large"
+# Vector size used when creating a collection without an explicit dimension
+DEFAULT_EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", 3072))
+
+# Hybrid retrieval: new collections also store a BM25 sparse vector, searches fuse both with RRF
+HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() == "true"
+SPARSE_VECTOR_NAME = "bm25"
+BM25_K1 = float(os.getenv("BM25_K1", 1.2))
+BM25_B = float(os.getenv("BM25_B", 0.75))
+# Average chunk length in tokens, for BM25 length normalization
+BM25_AVG_DOC_LENGTH = float(os.getenv("BM25_AVG_DOC_LENGTH", 200))
+# Each hybrid branch fetches top_k * this many candidates before fusion
+HYBRID_PREFETCH_MULTIPLIER = int(os.getenv("HYBRID_PREFETCH_MULTIPLIER", 4))
+
+# Paging of stored documents
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", 1000))
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 256))
+# Maximum number of queries in one batch search
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", 32))
 
 MESSAGE_ADD_DOCUMENT_SUCCESS = "Document added successfully"
 MESSAGE_ADD_DOCUMENT_FAILED = "Failed to add document"
+MESSAGE_REPLACE_DOCUMENT_SUCCESS = "Document replaced successfully"
+MESSAGE_REPLACE_DOCUMENT_FAILED = "Failed to replace document"
 # Configurations
 SERVICE_NAME = os.getenv("SERVICE_NAME", "knowledge_base_service")
 SERVICE_PORT = int(os.getenv("SERVICE_PORT", 8006))
@@ -27,3 +48,27 @@ LOG_VERSION = "1.0.0"
 
 # OpenTelemetry Configuration
 OTEL_ENDPOINT = os.getenv("OTEL_ENDPOINT", "otel-collector:4317")
+
+# Qdrant Configuration
+QDRANT_HOST = os.getenv("QDRANT_HOST", "qdrant")
+QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
+# gRPC avoids JSON encoding of vectors; needs the gRPC port reachable
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+QDRANT_TLS_ENABLED = os.getenv("QDRANT_TLS_ENABLED", "false").lower() == "true"
+QDRANT_TIMEOUT = int(os.getenv("QDRANT_TIMEOUT", 30))
+# Payload indexes per collection ("*" applies to every collection), created on first use.
+# Types: keyword, integer, float, bool, datetime, text, uuid
+PAYLOAD_INDEXES = json.loads(
+    os.getenv(
+        "PAYLOAD_INDEXES",
+        '{"*": {"candidate_id": "integer", "position": "keyword", "email": "keyword"}}',
+    )
+)
+# Storage settings per collection ("*" applies to every collection), e.g.
+# {"cv": {"quantization": {"type": "scalar"}, "on_disk": true, "hnsw": {"m": 16, "ef_construct": 200},
+#         "search": {"rescore": true, "oversampling": 2.0}}}
+# quantization/on_disk/hnsw apply when a collection is created; search applies to every query.
+COLLECTION_SETTINGS = json.loads(os.getenv("COLLECTION_SETTINGS", "{}"))
+# Collection metadata is re-read from Qdrant after this many seconds (0 disables the cache)
+COLLECTION_INFO_TTL_SECONDS = int(os.getenv("COLLECTION_INFO_TTL_SECONDS", 300))
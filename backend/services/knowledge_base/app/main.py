@@ -8,6 +8,8 @@ import uvicorn
 from metrics.otel_setup import setup_otel
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from starlette.responses import Response
+from services.qdrant import close_qdrant_clients
+from services.embedding import close_http_clients
 
 logger = AppLogger(__name__)
 
@@ -42,6 +44,12 @@ setup_otel(app=app, service_name=SERVICE_NAME, otlp_endpoint=OTEL_ENDPOINT)
 # Mount router
 app.include_router(router, prefix=API_PREFIX, tags=["Knowledge Base API"])
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_qdrant_clients()
+    await close_http_clients()
+
 if __name__ == "__main__":
     if TLS_ENABLED:
         logger.info(f"Starting Knowledge Base API over HTTPS on port {SERVICE_PORT}")
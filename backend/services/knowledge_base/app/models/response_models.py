@@ -1,14 +1,17 @@
-from typing import List, Any, Optional, Dict
+from typing import List, Any, Literal, Optional, Dict, Union
 from pydantic import BaseModel, validator
-from config.constants import DEFAULT_COLLECTION_NAME, DEFAULT_EMBEDDING_MODEL
+from config.constants import DEFAULT_COLLECTION_NAME, DEFAULT_EMBEDDING_MODEL, MAX_BATCH_QUERIES
 
 
 class QueryRequest(BaseModel):
     query: str
     collection_name: str = DEFAULT_COLLECTION_NAME
     embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    embedding_dimensions: Optional[int] = None
     top_k: int = 3
     filters: Optional[Dict[str, Any]] = None
+    # Fuse dense and BM25 results when the collection has sparse vectors
+    hybrid: bool = True
 
     @validator("top_k")
     def top_k_must_be_positive(cls, value):
@@ -16,13 +19,91 @@ class QueryRequest(BaseModel):
             raise ValueError("top_k must be a positive integer")
         return value
 
+    @validator("embedding_dimensions")
+    def embedding_dimensions_must_be_positive(cls, value):
+        if value is not None and value <= 0:
+            raise ValueError("embedding_dimensions must be a positive integer")
+        return value
+
+
+class BatchQueryItem(BaseModel):
+    query: str
+    top_k: int = 3
+    filters: Optional[Dict[str, Any]] = None
+
+    @validator("top_k")
+    def top_k_must_be_positive(cls, value):
+        if value <= 0:
+            raise ValueError("top_k must be a positive integer")
+        return value
+
+
+class BatchQueryRequest(BaseModel):
+    queries: List[BatchQueryItem]
+    collection_name: str = DEFAULT_COLLECTION_NAME
+    embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    embedding_dimensions: Optional[int] = None
+    hybrid: bool = True
+
+    @validator("queries")
+    def queries_within_limit(cls, value):
+        if not value:
+            raise ValueError("queries must not be empty")
+        if len(value) > MAX_BATCH_QUERIES:
+            raise ValueError(f"At most {MAX_BATCH_QUERIES} queries per batch")
+        return value
+
+    @validator("embedding_dimensions")
+    def embedding_dimensions_must_be_positive(cls, value):
+        if value is not None and value <= 0:
+            raise ValueError("embedding_dimensions must be a positive integer")
+        return value
+
 
 class AddDocumentRequest(BaseModel):
     texts: List[str]
     collection_name: str = DEFAULT_COLLECTION_NAME
     embedding_model: str = DEFAULT_EMBEDDING_MODEL
+    embedding_dimensions: Optional[int] = None
     payloads: Optional[List[Dict[str, Any]]] = None
 
+    @validator("embedding_dimensions")
+    def embedding_dimensions_must_be_positive(cls, value):
+        if value is not None and value <= 0:
+            raise ValueError("embedding_dimensions must be a positive integer")
+        return value
+
+
+class ReplaceDocumentRequest(AddDocumentRequest):
+    # Every chunk stored for this candidate is replaced by ``texts``
+    candidate_id: Union[int, str]
+
+
+class PayloadIndexRequest(BaseModel):
+    # field -> type (keyword, integer, float, bool, datetime, text, uuid); None builds the declared indexes
+    indexes: Optional[Dict[str, str]] = None
+
+
+class QuantizationSettings(BaseModel):
+    # "none" switches quantization off
+    type: Literal["scalar", "product", "binary", "none"]
+    always_ram: bool = True
+    quantile: Optional[float] = None  # scalar only
+    compression: Literal["x4", "x8", "x16", "x32", "x64"] = "x16"  # product only
+
+
+class HnswSettings(BaseModel):
+    m: Optional[int] = None
+    ef_construct: Optional[int] = None
+    on_disk: Optional[bool] = None
+
+
+class CollectionConfigRequest(BaseModel):
+    quantization: Optional[QuantizationSettings] = None
+    on_disk: Optional[bool] = None
+    hnsw: Optional[HnswSettings] = None
+
+
 class StandardResponse(BaseModel):
     status: str
     message: Optional[str] = None
@@ -1,10 +1,22 @@
+import json
+from typing import Optional
 from fastapi import HTTPException, Query
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from config.log_config import LoggingConfig, AppLogger
 router = APIRouter()
 from services.knowledge_base_service import KnowledgeBaseService
-from models.response_models import QueryRequest, AddDocumentRequest, StandardResponse
+from services.qdrant import CollectionNotFoundError
+from qdrant_client.http.exceptions import UnexpectedResponse
+from models.response_models import (
+    QueryRequest,
+    BatchQueryRequest,
+    AddDocumentRequest,
+    ReplaceDocumentRequest,
+    PayloadIndexRequest,
+    CollectionConfigRequest,
+    StandardResponse,
+)
 from config.constants import *
 
 logger = AppLogger(__name__)
@@ -13,12 +25,21 @@ async def add_document(
     request: AddDocumentRequest,
 ):
     logger.debug("Adding document to knowledge base")
-    result = KnowledgeBaseService.add(
-        texts=request.texts,
-        collection_name=request.collection_name,
-        embedding_model=request.embedding_model,
-        payloads=request.payloads,
-    )
+    try:
+        result = await KnowledgeBaseService.aadd(
+            texts=request.texts,
+            collection_name=request.collection_name,
+            embedding_model=request.embedding_model,
+            payloads=request.payloads,
+            embedding_dimensions=request.embedding_dimensions,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(
+                status="error", message=MESSAGE_ADD_DOCUMENT_FAILED, error=str(e)
+            ).dict(),
+            status_code=400,
+        )
     if not result:
         return JSONResponse(
             content=StandardResponse(
@@ -34,38 +55,259 @@ async def add_document(
     )
 
 
+@router.post("/documents/replace/")
+async def replace_document(request: ReplaceDocumentRequest):
+    """Replaces all chunks of ``candidate_id`` with the given texts (stale chunks are deleted)."""
+    logger.debug(f"Replacing document of candidate {request.candidate_id} in knowledge base")
+    try:
+        result = await KnowledgeBaseService.areplace(
+            candidate_id=request.candidate_id,
+            texts=request.texts,
+            collection_name=request.collection_name,
+            embedding_model=request.embedding_model,
+            payloads=request.payloads,
+            embedding_dimensions=request.embedding_dimensions,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(
+                status="error", message=MESSAGE_REPLACE_DOCUMENT_FAILED, error=str(e)
+            ).dict(),
+            status_code=400,
+        )
+    if not result:
+        return JSONResponse(
+            content=StandardResponse(
+                status="error", message=MESSAGE_REPLACE_DOCUMENT_FAILED
+            ).dict(),
+            status_code=400,
+        )
+    return JSONResponse(
+        content=StandardResponse(
+            status="success", message=MESSAGE_REPLACE_DOCUMENT_SUCCESS, data=result
+        ).dict(),
+        status_code=200,
+    )
+
+
 @router.post("/documents/search/")
 async def search_knowledge_base(request: QueryRequest):
     """Searches for the most relevant knowledge based on user input."""
+    try:
+        results = await KnowledgeBaseService.asearch(
+            query=request.query,
+            collection_name=request.collection_name,
+            embedding_model=request.embedding_model,
+            filters=request.filters,
+            top_k=request.top_k,
+            embedding_dimensions=request.embedding_dimensions,
+            hybrid=request.hybrid,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
+    return JSONResponse(
+        content=StandardResponse(
+            status="success",
+            data=results,
+        ).dict(),
+        status_code=200,
+    )
+
+
+@router.post("/documents/search/batch")
+async def search_knowledge_base_batch(request: BatchQueryRequest):
+    """
+    Runs several searches in one round trip: all queries are embedded in one
+    call and searched in one Qdrant batch request. Results come back in query order.
+    """
+    try:
+        results = await KnowledgeBaseService.asearch_batch(
+            queries=[item.dict() for item in request.queries],
+            collection_name=request.collection_name,
+            embedding_model=request.embedding_model,
+            embedding_dimensions=request.embedding_dimensions,
+            hybrid=request.hybrid,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
     return JSONResponse(
         content=StandardResponse(
             status="success",
-            data=KnowledgeBaseService.search(
-                query=request.query,
-                collection_name=request.collection_name,
-                embedding_model=request.embedding_model,
-                filters=request.filters,
-                top_k=request.top_k,
-            ),
+            data=results,
         ).dict(),
         status_code=200,
     )
 
 
+@router.get("/collections/{collection_name}/indexes")
+async def list_payload_indexes(collection_name: str):
+    """Lists the payload indexes of a collection with the declared and still missing ones."""
+    try:
+        indexes = await KnowledgeBaseService.alist_payload_indexes(collection_name=collection_name)
+    except CollectionNotFoundError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=404,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
+    return JSONResponse(
+        content=StandardResponse(status="success", data=indexes).dict(),
+        status_code=200,
+    )
+
+
+@router.post("/collections/{collection_name}/indexes")
+async def build_payload_indexes(collection_name: str, request: Optional[PayloadIndexRequest] = None):
+    """Creates missing payload indexes: the ones in the body, or the declared ones when omitted."""
+    try:
+        indexes = await KnowledgeBaseService.abuild_payload_indexes(
+            collection_name=collection_name,
+            indexes=request.indexes if request else None,
+        )
+    except CollectionNotFoundError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=404,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
+    return JSONResponse(
+        content=StandardResponse(status="success", data=indexes).dict(),
+        status_code=200,
+    )
+
+
+@router.get("/collections/{collection_name}/config")
+async def get_collection_config(collection_name: str):
+    """Returns the vector storage, HNSW and quantization settings of a collection."""
+    try:
+        config = await KnowledgeBaseService.aget_collection_config(collection_name=collection_name)
+    except CollectionNotFoundError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=404,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
+    return JSONResponse(
+        content=StandardResponse(status="success", data=config).dict(),
+        status_code=200,
+    )
+
+
+@router.patch("/collections/{collection_name}/config")
+async def update_collection_config(collection_name: str, request: CollectionConfigRequest):
+    """
+    Changes quantization, on-disk vectors and HNSW settings of an existing collection.
+    Qdrant re-optimizes the collection in the background.
+    """
+    try:
+        config = await KnowledgeBaseService.aupdate_collection_config(
+            collection_name=collection_name,
+            quantization=request.quantization.dict(exclude_none=True) if request.quantization else None,
+            on_disk=request.on_disk,
+            hnsw=request.hnsw.dict(exclude_none=True) if request.hnsw else None,
+        )
+    except CollectionNotFoundError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=404,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
+    except UnexpectedResponse as e:
+        # Qdrant rejected the settings; its client errors pass through, anything else is a bad request
+        status_code = e.status_code if e.status_code and 400 <= e.status_code < 500 else 400
+        return JSONResponse(
+            content=StandardResponse(
+                status="error", error=e.content.decode("utf-8", errors="replace") or str(e)
+            ).dict(),
+            status_code=status_code,
+        )
+    return JSONResponse(
+        content=StandardResponse(status="success", data=config).dict(),
+        status_code=200,
+    )
+
+
 @router.get("/documents")
 async def list_documents(
-    offset: int = Query(0, alias="page_offset"),
-    limit: int = Query(100, alias="page_size"),
+    page_offset: Optional[str] = Query(
+        None, description="next_page_offset of the previous page; omit for the first page"
+    ),
+    limit: int = Query(100, alias="page_size", ge=1, le=MAX_PAGE_SIZE),
     collection_name: str = DEFAULT_COLLECTION_NAME,
 ):
+    """Lists stored documents one page at a time (cursor pagination)."""
+    try:
+        documents = await KnowledgeBaseService.aretrieve(
+            collection_name=collection_name,
+            limit=limit,
+            page_offset=page_offset,
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
     return JSONResponse(
         content=StandardResponse(
             status="success",
-            data=KnowledgeBaseService.retrieve(
-                collection_name=collection_name,
-                limit=limit,
-                offset=offset,
-            ),
+            data=documents,
         ).dict(),
         status_code=200,
     )
+
+
+@router.get("/documents/export")
+async def export_documents(
+    collection_name: str = DEFAULT_COLLECTION_NAME,
+    with_vectors: bool = False,
+):
+    """
+    Streams every point of a collection as newline-delimited JSON
+    ({"id", "payload"} plus "vector" when with_vectors is set), one page in memory at a time.
+    """
+    try:
+        records = await KnowledgeBaseService.aexport(
+            collection_name=collection_name, with_vectors=with_vectors
+        )
+    except ValueError as e:
+        return JSONResponse(
+            content=StandardResponse(status="error", error=str(e)).dict(),
+            status_code=400,
+        )
+
+    async def ndjson():
+        try:
+            async for record in records:
+                yield json.dumps(record, ensure_ascii=False) + "\n"
+        except Exception as e:
+            # Headers are already sent; a truncated export must not look complete
+            logger.error(f"Export of {collection_name} failed: {e}")
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{collection_name}.ndjson"'},
+    )
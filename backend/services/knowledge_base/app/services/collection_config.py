@@ -0,0 +1,113 @@
+from typing import Optional, Union
+
+from qdrant_client.http.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CompressionRatio,
+    Disabled,
+    HnswConfigDiff,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+)
+
+from config.constants import COLLECTION_SETTINGS
+
+QuantizationConfig = Union[ScalarQuantization, ProductQuantization, BinaryQuantization, Disabled]
+
+
+def collection_settings(collection_name: str) -> dict:
+    """
+    Storage settings declared for a collection in COLLECTION_SETTINGS ("*" applies to
+    every collection): quantization, on_disk, hnsw and search (rescore, oversampling).
+    """
+    settings = dict(COLLECTION_SETTINGS.get("*", {}))
+    settings.update(COLLECTION_SETTINGS.get(collection_name, {}))
+    return settings
+
+
+def quantization_config(quantization: Optional[dict]) -> Optional[QuantizationConfig]:
+    """
+    Qdrant quantization config from {"type": "scalar"|"product"|"binary"|"none", ...}.
+    Returns Disabled for "none" (to switch it off on update) and None when not set.
+    Raises ValueError for unknown types.
+    """
+    if not quantization:
+        return None
+    kind = quantization.get("type")
+    always_ram = quantization.get("always_ram", True)
+    if kind == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=quantization.get("quantile"),
+                always_ram=always_ram,
+            )
+        )
+    if kind == "product":
+        return ProductQuantization(
+            product=ProductQuantizationConfig(
+                compression=CompressionRatio(quantization.get("compression", "x16")),
+                always_ram=always_ram,
+            )
+        )
+    if kind == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=always_ram))
+    if kind == "none":
+        return Disabled.DISABLED
+    raise ValueError(f"Unknown quantization type: {kind}")
+
+
+def hnsw_config(hnsw: Optional[dict]) -> Optional[HnswConfigDiff]:
+    """HNSW graph settings from {"m": ..., "ef_construct": ..., "on_disk": ...}."""
+    if not hnsw:
+        return None
+    return HnswConfigDiff(
+        m=hnsw.get("m"),
+        ef_construct=hnsw.get("ef_construct"),
+        on_disk=hnsw.get("on_disk"),
+    )
+
+
+def search_params(collection_info, settings: dict) -> Optional[SearchParams]:
+    """
+    Dense search parameters. Quantized collections search the compressed vectors,
+    fetch ``oversampling`` times more candidates and rescore them with the originals.
+    """
+    search = settings.get("search", {})
+    hnsw_ef = search.get("hnsw_ef")
+    quantization = None
+    if collection_info.config.quantization_config is not None:
+        quantization = QuantizationSearchParams(
+            rescore=search.get("rescore", True),
+            oversampling=search.get("oversampling", 2.0),
+        )
+    if quantization is None and hnsw_ef is None:
+        return None
+    return SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
+
+def describe(collection_info, settings: dict) -> dict:
+    """Current storage configuration of a collection, plus its declared search settings."""
+    config = collection_info.config
+    vectors = config.params.vectors
+    if isinstance(vectors, dict):
+        vectors = vectors.get("", next(iter(vectors.values())))
+    quantization = config.quantization_config
+    return {
+        "vectors": {"size": vectors.size, "on_disk": vectors.on_disk},
+        "hnsw": {
+            "m": config.hnsw_config.m,
+            "ef_construct": config.hnsw_config.ef_construct,
+            "on_disk": config.hnsw_config.on_disk,
+        },
+        "quantization": quantization.model_dump(exclude_none=True) if quantization is not None else None,
+        "sparse_vectors": list((config.params.sparse_vectors or {}).keys()),
+        "search": settings.get("search", {}),
+        "status": collection_info.status.value if collection_info.status else None,
+        "points_count": collection_info.points_count,
+    }
@@ -1,18 +1,36 @@
 import logging
 import ssl
+import struct
 import threading
 import httpx
+import numpy as np
 from typing import List, Optional
 
 from config.constants import GENAI_HOST, SCHEMA, TLS_ENABLED, CA_PATH
 
 logger = logging.getLogger(__file__)
 
-# Thread-safe reusable sync HTTP client with connection pooling
+OCTET_STREAM_MEDIA_TYPE = "application/octet-stream"
+# Binary embeddings layout: uint32 rows, uint32 dims, then little-endian float32 values
+SHAPE_HEADER = struct.Struct("<II")
+
+# Thread-safe reusable HTTP clients with connection pooling
 _http_client = None
+_async_http_client = None
 _http_client_lock = threading.Lock()
 
 
+def _client_options() -> dict:
+    ssl_context = None
+    if TLS_ENABLED and CA_PATH:
+        ssl_context = ssl.create_default_context(cafile=CA_PATH)
+    return {
+        "timeout": httpx.Timeout(120.0, connect=10.0),  # Longer timeout for embeddings
+        "limits": httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        "verify": ssl_context if ssl_context else True,
+    }
+
+
 def _get_http_client() -> httpx.Client:
     """Get or create a reusable HTTP client with connection pooling (thread-safe)."""
     global _http_client
@@ -20,42 +38,81 @@ def _get_http_client() -> httpx.Client:
         with _http_client_lock:
             # Double-check after acquiring lock
             if _http_client is None:
-                ssl_context = None
-                if TLS_ENABLED and CA_PATH:
-                    ssl_context = ssl.create_default_context(cafile=CA_PATH)
-
-                _http_client = httpx.Client(
-                    timeout=httpx.Timeout(120.0, connect=10.0),  # Longer timeout for embeddings
-                    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
-                    verify=ssl_context if ssl_context else True,
-                )
+                _http_client = httpx.Client(**_client_options())
     return _http_client
 
 
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Get or create the reusable async HTTP client used from request handlers."""
+    global _async_http_client
+    if _async_http_client is None:
+        with _http_client_lock:
+            if _async_http_client is None:
+                _async_http_client = httpx.AsyncClient(**_client_options())
+    return _async_http_client
+
+
+async def close_http_clients() -> None:
+    """Close the shared HTTP clients (call on shutdown)."""
+    global _http_client, _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+    if _http_client is not None:
+        _http_client.close()
+        _http_client = None
+
+
 class GenAIEmbeddingAdapter:
     """Adapter that calls gen_ai_provider service for embeddings."""
 
-    def __init__(self, model: str):
+    def __init__(self, model: str, dimensions: Optional[int] = None):
         self._model = model
-
-    def _call_embedding_api(self, input_data) -> List[List[float]]:
-        """Calls the gen_ai_provider embedding endpoint using httpx with connection pooling."""
-        url = f"{SCHEMA}://{GENAI_HOST}/api/v1/gen-ai/embeddings"
+        self._dimensions = dimensions
+
+    @staticmethod
+    def _decode_embeddings(response: httpx.Response) -> np.ndarray:
+        """Decodes a binary (or legacy JSON) embeddings response into a (rows, dims) float32 array."""
+        if response.headers.get("content-type", "").startswith(OCTET_STREAM_MEDIA_TYPE):
+            rows, dims = SHAPE_HEADER.unpack_from(response.content)
+            return np.frombuffer(
+                response.content, dtype="<f4", offset=SHAPE_HEADER.size
+            ).reshape(rows, dims)
+
+        result = response.json()
+        if result.get("status") != "success":
+            raise RuntimeError(f"Embedding API error: {result.get('message')}")
+        return np.asarray(result["data"]["embeddings"], dtype=np.float32)
+
+    def _request(self, input_data, priority: str) -> dict:
+        """Keyword arguments of the POST to the gen_ai_provider embedding endpoint."""
         payload = {
             "model": self._model,
             "input": input_data,
         }
-        headers = {"Content-Type": "application/json"}
+        if self._dimensions:
+            payload["dimensions"] = self._dimensions
+        return {
+            "url": f"{SCHEMA}://{GENAI_HOST}/api/v1/gen-ai/embeddings",
+            "json": payload,
+            "headers": {
+                "Content-Type": "application/json",
+                "Accept": f"{OCTET_STREAM_MEDIA_TYPE}, application/json",
+                "X-Request-Priority": priority,
+            },
+        }
+
+    def _call_embedding_api(self, input_data, priority: str) -> np.ndarray:
+        """
+        Calls the gen_ai_provider embedding endpoint using httpx with connection pooling.
 
+        :param priority: Scheduling class sent as X-Request-Priority (interactive or bulk).
+        """
         try:
             client = _get_http_client()
-            response = client.post(url, json=payload, headers=headers)
+            response = client.post(**self._request(input_data, priority))
             response.raise_for_status()
-            result = response.json()
-            if result.get("status") == "success":
-                return result["data"]["embeddings"]
-            else:
-                raise RuntimeError(f"Embedding API error: {result.get('message')}")
+            return self._decode_embeddings(response)
         except httpx.TimeoutException as timeout_err:
             logger.error(f"Timeout Error calling embedding API: {timeout_err}")
             raise
@@ -66,21 +123,53 @@ class GenAIEmbeddingAdapter:
             logger.error(f"Request Error: {req_err}")
             raise
 
-    def embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Embeds multiple documents."""
-        return self._call_embedding_api(texts)
+    async def _acall_embedding_api(self, input_data, priority: str) -> np.ndarray:
+        """Async variant of ``_call_embedding_api`` on the shared async client."""
+        try:
+            client = _get_async_http_client()
+            response = await client.post(**self._request(input_data, priority))
+            response.raise_for_status()
+            return self._decode_embeddings(response)
+        except httpx.TimeoutException as timeout_err:
+            logger.error(f"Timeout Error calling embedding API: {timeout_err}")
+            raise
+        except httpx.HTTPStatusError as http_err:
+            logger.error(f"HTTP Error: {http_err}")
+            raise
+        except httpx.RequestError as req_err:
+            logger.error(f"Request Error: {req_err}")
+            raise
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embeds multiple documents into a (len(texts), dims) array."""
+        # Document indexing must not delay user-facing queries
+        return self._call_embedding_api(texts, priority="bulk")
 
-    def embed_query(self, text: str) -> List[float]:
+    def embed_query(self, text: str) -> np.ndarray:
         """Embeds a single query text."""
-        embeddings = self._call_embedding_api(text)
+        embeddings = self._call_embedding_api(text, priority="interactive")
+        return embeddings[0]
+
+    async def aembed_documents(self, texts: List[str]) -> np.ndarray:
+        """Async variant of ``embed_documents``."""
+        return await self._acall_embedding_api(texts, priority="bulk")
+
+    async def aembed_query(self, text: str) -> np.ndarray:
+        """Async variant of ``embed_query``."""
+        embeddings = await self._acall_embedding_api(text, priority="interactive")
         return embeddings[0]
 
+    async def aembed_queries(self, texts: List[str]) -> np.ndarray:
+        """Embeds several query texts in one call, at interactive priority."""
+        return await self._acall_embedding_api(texts, priority="interactive")
+
 
 class Embedding:
     """Embedding service that uses gen_ai_provider for embeddings."""
 
-    def __init__(self, model_name: str = "text-embedding-3-large"):
+    def __init__(self, model_name: str = "text-embedding-3-large", dimensions: Optional[int] = None):
         self._model_name = model_name
+        self._dimensions = dimensions
         self._embedding_model: Optional[GenAIEmbeddingAdapter] = None
 
     def get_model_name(self) -> str:
@@ -97,5 +186,5 @@ class Embedding:
         """Initializes and retrieves the GenAI embedding adapter lazily."""
         if self._embedding_model is None:
             logger.info(f"Loading GenAI embedding model: {self._model_name}")
-            self._embedding_model = GenAIEmbeddingAdapter(self._model_name)
+            self._embedding_model = GenAIEmbeddingAdapter(self._model_name, self._dimensions)
         return self._embedding_model
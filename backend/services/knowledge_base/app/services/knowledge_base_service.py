@@ -1,19 +1,60 @@
-from services.qdrant import QdrantDB
-from typing import List, Optional, Dict
+from services.qdrant import QdrantDB, get_async_qdrant_client
+from services import collection_config
+from typing import Any, AsyncIterator, List, Optional, Dict
 
 
 class KnowledgeBaseService:
     @staticmethod
-    def search(query: str, collection_name: str, embedding_model: str, filters: Optional[Dict] = None, top_k: int = 3):
-        qdrantdb = QdrantDB(collection_name=collection_name)
-        return qdrantdb.search(query=query, embedding_model=embedding_model, top_k=top_k, filters=filters)
+    async def asearch(query: str, collection_name: str, embedding_model: str, filters: Optional[Dict] = None, top_k: int = 3, embedding_dimensions: Optional[int] = None, hybrid: bool = True):
+        qdrantdb = await QdrantDB.acreate(collection_name=collection_name, vector_dimension=embedding_dimensions)
+        return await qdrantdb.asearch(query=query, embedding_model=embedding_model, top_k=top_k, filters=filters, hybrid=hybrid)
 
     @staticmethod
-    def add(texts: List[str], collection_name: str, embedding_model: str, payloads: Optional[List[Dict]] = None):
-        qdrantdb = QdrantDB(collection_name=collection_name)
-        return qdrantdb.add(texts=texts, embedding_model=embedding_model, payloads=payloads)
+    async def asearch_batch(queries: List[Dict], collection_name: str, embedding_model: str, embedding_dimensions: Optional[int] = None, hybrid: bool = True):
+        qdrantdb = await QdrantDB.acreate(collection_name=collection_name, vector_dimension=embedding_dimensions)
+        return await qdrantdb.asearch_batch(queries=queries, embedding_model=embedding_model, hybrid=hybrid)
 
     @staticmethod
-    def retrieve(collection_name: str, limit: int = 100, offset: int = 0):
-        qdrantdb = QdrantDB(collection_name=collection_name)
-        return qdrantdb.retrieve(limit=limit, offset=offset)
+    async def aadd(texts: List[str], collection_name: str, embedding_model: str, payloads: Optional[List[Dict]] = None, embedding_dimensions: Optional[int] = None):
+        qdrantdb = await QdrantDB.acreate(collection_name=collection_name, vector_dimension=embedding_dimensions)
+        return await qdrantdb.aadd(texts=texts, embedding_model=embedding_model, payloads=payloads)
+
+    @staticmethod
+    async def areplace(candidate_id: Any, texts: List[str], collection_name: str, embedding_model: str, payloads: Optional[List[Dict]] = None, embedding_dimensions: Optional[int] = None):
+        qdrantdb = await QdrantDB.acreate(collection_name=collection_name, vector_dimension=embedding_dimensions)
+        return await qdrantdb.areplace(candidate_id=candidate_id, texts=texts, embedding_model=embedding_model, payloads=payloads)
+
+    @staticmethod
+    async def aretrieve(collection_name: str, limit: int = 100, page_offset: Optional[str] = None):
+        qdrantdb = await QdrantDB.acreate(collection_name=collection_name)
+        return await qdrantdb.aretrieve(limit=limit, page_offset=page_offset)
+
+    @staticmethod
+    async def aexport(collection_name: str, with_vectors: bool = False) -> AsyncIterator[dict]:
+        """Resolves the collection up front so errors surface before streaming starts."""
+        qdrantdb = await QdrantDB.acreate(collection_name=collection_name)
+        return qdrantdb.aexport(with_vectors=with_vectors)
+
+    @staticmethod
+    async def alist_payload_indexes(collection_name: str):
+        collection_info = await QdrantDB.aget_existing_collection(collection_name)
+        return QdrantDB.describe_payload_indexes(collection_name, collection_info)
+
+    @staticmethod
+    async def abuild_payload_indexes(collection_name: str, indexes: Optional[Dict[str, str]] = None):
+        """Creates the given (or the declared) payload indexes that are missing and returns the new state."""
+        collection_info = await QdrantDB.aget_existing_collection(collection_name)
+        client = get_async_qdrant_client()
+        created = await QdrantDB.aensure_payload_indexes(client, collection_name, collection_info, indexes)
+        collection_info = await QdrantDB.aget_existing_collection(collection_name)
+        return {"created": created, **QdrantDB.describe_payload_indexes(collection_name, collection_info)}
+
+    @staticmethod
+    async def aget_collection_config(collection_name: str):
+        collection_info = await QdrantDB.aget_existing_collection(collection_name)
+        return collection_config.describe(collection_info, collection_config.collection_settings(collection_name))
+
+    @staticmethod
+    async def aupdate_collection_config(collection_name: str, quantization: Optional[Dict] = None, on_disk: Optional[bool] = None, hnsw: Optional[Dict] = None):
+        await QdrantDB.aget_existing_collection(collection_name)
+        return await QdrantDB.aupdate_collection_config(collection_name, quantization=quantization, on_disk=on_disk, hnsw=hnsw)
@@ -1,5 +1,9 @@
 import uuid
+import hashlib
 import logging
+import threading
+import time
+from typing import AsyncIterator, Dict, Optional, Tuple
 import qdrant_client
 from qdrant_client.http.models import (
     Distance,
@@ -8,172 +12,691 @@ from qdrant_client.http.models import (
     Filter,
     FieldCondition,
     MatchValue,
+    HasIdCondition,
+    FilterSelector,
+    PayloadSchemaType,
+    QueryRequest,
+    Prefetch,
+    FusionQuery,
+    Fusion,
+    SparseVectorParams,
+    Modifier,
+    VectorParamsDiff,
+    Disabled,
 )
 from services.embedding import Embedding
-from config.constants import DEFAULT_COLLECTION_NAME
+from services.sparse_encoder import bm25_encoder
+from services import collection_config
+from config.constants import (
+    DEFAULT_COLLECTION_NAME,
+    DEFAULT_EMBEDDING_DIMENSIONS,
+    QDRANT_HOST,
+    QDRANT_PORT,
+    QDRANT_GRPC_PORT,
+    QDRANT_PREFER_GRPC,
+    QDRANT_TLS_ENABLED,
+    QDRANT_TIMEOUT,
+    COLLECTION_INFO_TTL_SECONDS,
+    EXPORT_BATCH_SIZE,
+    PAYLOAD_INDEXES,
+    HYBRID_SEARCH_ENABLED,
+    SPARSE_VECTOR_NAME,
+    HYBRID_PREFETCH_MULTIPLIER,
+)
 
 logger = logging.getLogger(__name__)
 
+# Process-wide Qdrant client; it owns the connection pool reused by all requests
+_async_client: Optional[qdrant_client.AsyncQdrantClient] = None
+_client_lock = threading.Lock()
+
+# Namespace of the deterministic (uuid5) point ids
+POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "soai/knowledge-base/points")
+
+
+def _client_options() -> dict:
+    if QDRANT_TLS_ENABLED:
+        # Use HTTPS when TLS is enabled
+        # Note: For self-signed certs, we use verify=False
+        # In production with proper CA, set verify=True or provide CA path via REQUESTS_CA_BUNDLE env var
+        return {
+            "url": f"https://{QDRANT_HOST}:{QDRANT_PORT}",
+            "https": True,
+            "verify": False,  # Skip certificate verification for self-signed certs
+            "timeout": QDRANT_TIMEOUT,
+        }
+    return {
+        "host": QDRANT_HOST,
+        "port": QDRANT_PORT,
+        "grpc_port": QDRANT_GRPC_PORT,
+        "prefer_grpc": QDRANT_PREFER_GRPC,
+        "timeout": QDRANT_TIMEOUT,
+    }
+
+
+def get_async_qdrant_client() -> qdrant_client.AsyncQdrantClient:
+    """Get or create the shared async Qdrant client used by request handlers (thread-safe)."""
+    global _async_client
+    if _async_client is None:
+        with _client_lock:
+            # Double-check after acquiring lock
+            if _async_client is None:
+                _async_client = qdrant_client.AsyncQdrantClient(**_client_options())
+                logger.info(
+                    f"Connected to Qdrant at {QDRANT_HOST} (grpc={QDRANT_PREFER_GRPC and not QDRANT_TLS_ENABLED})"
+                )
+    return _async_client
+
+
+async def close_qdrant_clients() -> None:
+    """Close the shared client (call on shutdown)."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+
+
+class CollectionInfoCache:
+    """
+    Caches ``get_collection`` results so that a search does not pay the
+    existence check and metadata round trips. Entries expire after ``ttl``
+    seconds and are invalidated whenever this service changes a collection
+    or an operation on it fails.
+    """
+
+    def __init__(self, ttl: int = COLLECTION_INFO_TTL_SECONDS):
+        self._ttl = ttl
+        self._entries: Dict[str, Tuple[float, object]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, collection_name: str):
+        if self._ttl <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(collection_name)
+            if entry is None:
+                return None
+            loaded_at, info = entry
+            if time.monotonic() - loaded_at > self._ttl:
+                del self._entries[collection_name]
+                return None
+            return info
+
+    def set(self, collection_name: str, info) -> None:
+        with self._lock:
+            self._entries[collection_name] = (time.monotonic(), info)
+
+    def invalidate(self, collection_name: Optional[str] = None) -> None:
+        """Drops one collection's entry, or every entry when no name is given."""
+        with self._lock:
+            if collection_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(collection_name, None)
+
+
+collection_info_cache = CollectionInfoCache()
+
+
+class CollectionNotFoundError(LookupError):
+    """Raised by operations that only act on an existing collection."""
+
 
 class QdrantDB:
-    """Handles Qdrant operations for vector database storage and retrieval."""
+    """
+    Handles Qdrant operations for vector database storage and retrieval.
+
+    Operations are coroutines on the shared async client, so request handlers
+    never block the event loop. Create instances with ``QdrantDB.acreate``.
+    """
 
-    def __init__(self, collection_name: str = DEFAULT_COLLECTION_NAME):
+    def __init__(self, collection_name: str, collection_info):
+        """
+        :param collection_name: Collection to operate on.
+        :param collection_info: Resolved collection metadata (see ``aget_or_create_qdrant_collection``).
+        """
         self.collection_name = collection_name
-        self.client, self.collection_info = self.get_or_create_qdrant_collection(
-            collection_name=collection_name
+        self.collection_info = collection_info
+        self.vector_dimension = self.get_vector_size(self.collection_info)
+        # Collections created before hybrid search have no sparse vector and stay dense-only
+        self.hybrid = self.has_sparse_vector(self.collection_info)
+        self.search_params = collection_config.search_params(
+            self.collection_info, collection_config.collection_settings(collection_name)
         )
 
-    def retrieve(self, limit=100, offset=0):
-        """Retrieves stored documents with manual pagination."""
-        documents = []
-        current_offset = 0
+    @classmethod
+    async def acreate(
+        cls, collection_name: str = DEFAULT_COLLECTION_NAME, vector_dimension: int | None = None
+    ) -> "QdrantDB":
+        """
+        Resolves (or creates) the collection and returns an instance operating on it.
 
-        try:
-            while len(documents) < limit:
-                points, next_offset = self.client.scroll(
-                    collection_name=self.collection_name,
-                    with_payload=True,
-                    limit=100,  # Retrieve in chunks
+        :param vector_dimension: Expected vector size; used when creating the collection
+            and validated against an existing one. None accepts the collection's size.
+        """
+        collection_info = await cls.aget_or_create_qdrant_collection(
+            collection_name=collection_name,
+            vector_dimension=vector_dimension,
+        )
+        return cls(collection_name, collection_info)
+
+    @property
+    def async_client(self) -> qdrant_client.AsyncQdrantClient:
+        return get_async_qdrant_client()
+
+    # --- shared helpers ---
+
+    @staticmethod
+    def _build_filter(filters) -> Optional[Filter]:
+        """Turns a {key: value} dict into a Qdrant filter matching every pair."""
+        if not isinstance(filters, dict) or not filters:
+            return None
+        must_conditions = []
+        for key, value in filters.items():
+            if value is None:
+                continue
+            try:
+                must_conditions.append(
+                    FieldCondition(key=key, match=MatchValue(value=value))
                 )
+            except Exception:
+                continue
+        return Filter(must=must_conditions) if must_conditions else None
 
-                for point in points:
-                    if current_offset >= offset:
-                        documents.append(
-                            point.payload.get("page_content", "No text found")
-                        )
+    @staticmethod
+    def _format_results(search_results) -> list[dict]:
+        results = []
+        for point in search_results:
+            results.append(
+                {
+                    "id": point.id,
+                    "page_content": point.payload.get("page_content", ""),
+                    "score": point.score,
+                    "payload": {k: v for k, v in point.payload.items() if k != "page_content"},
+                }
+            )
+        return results
 
-                    current_offset += 1
+    @staticmethod
+    def point_id(collection_name: str, document_id, chunk_index: int, text: str) -> str:
+        """
+        Deterministic point id of a chunk: uuid5 over (collection, document id, chunk
+        index, content hash). Re-ingesting the same chunk overwrites its point instead
+        of adding a copy.
+        """
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        document_id = "" if document_id is None else document_id
+        return str(
+            uuid.uuid5(POINT_ID_NAMESPACE, f"{collection_name}:{document_id}:{chunk_index}:{content_hash}")
+        )
+
+    def _build_points(self, texts: list[str], embeddings, embedding_model: str, payloads) -> list[PointStruct]:
+        if embeddings.shape[1] != self.vector_dimension:
+            raise ValueError(
+                f"Embedding model {embedding_model} returned {embeddings.shape[1]}-dim vectors, "
+                f"collection {self.collection_name} expects {self.vector_dimension}"
+            )
+        points = []
+        for idx, (text, embedding_vector) in enumerate(zip(texts, embeddings)):
+            payload = {"page_content": text}
+            if payloads and idx < len(payloads) and isinstance(payloads[idx], dict):
+                # Merge metadata while keeping page_content separate
+                payload.update(payloads[idx])
+            vector = embedding_vector.tolist()
+            if self.hybrid:
+                vector = {"": vector, SPARSE_VECTOR_NAME: bm25_encoder.encode_document(text)}
+            points.append(
+                PointStruct(
+                    id=self.point_id(self.collection_name, payload.get("candidate_id"), idx, text),
+                    vector=vector,
+                    payload=payload,
+                )
+            )
+        return points
+
+    def _query(self, query: str, query_embedding, top_k: int, filters, hybrid: bool) -> dict:
+        """
+        Arguments of a query_points call (or QueryRequest). Hybrid queries prefetch
+        dense and BM25 candidates and fuse them with reciprocal rank fusion.
+        """
+        query_filter = self._build_filter(filters)
+        if not (hybrid and self.hybrid):
+            return {
+                "query": query_embedding.tolist(),
+                "filter": query_filter,
+                "params": self.search_params,
+                "limit": top_k,
+            }
+        prefetch_limit = top_k * HYBRID_PREFETCH_MULTIPLIER
+        return {
+            "prefetch": [
+                Prefetch(
+                    query=query_embedding.tolist(),
+                    filter=query_filter,
+                    params=self.search_params,
+                    limit=prefetch_limit,
+                ),
+                Prefetch(
+                    query=bm25_encoder.encode_query(query),
+                    using=SPARSE_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=prefetch_limit,
+                ),
+            ],
+            "query": FusionQuery(fusion=Fusion.RRF),
+            "limit": top_k,
+        }
+
+    @staticmethod
+    def _has_text(texts: list[str]) -> bool:
+        if not texts or not any(text.strip() for text in texts):
+            logger.error("No text found in the request.")
+            return False
+        return True
+
+    def _embedding(self, embedding_model: str):
+        return Embedding(embedding_model, self.vector_dimension).get_embedding_model()
 
-                    # Stop when limit is reached
-                    if len(documents) >= limit:
-                        return {"documents": documents, "next_offset": next_offset}
+    # --- retrieve ---
 
-                if not next_offset:
-                    break  # Stop if no more data
+    @staticmethod
+    def _parse_page_offset(page_offset):
+        """
+        Turns the ``next_page_offset`` token of a previous page back into a point id.
+        Raises ValueError for tokens that cannot be a point id.
+        """
+        if page_offset is None or page_offset == "":
+            return None
+        if isinstance(page_offset, int):
+            return page_offset
+        if page_offset.isdigit():
+            return int(page_offset)
+        try:
+            return str(uuid.UUID(page_offset))
+        except ValueError:
+            raise ValueError(f"Invalid page_offset: {page_offset}")
+
+    @staticmethod
+    def _page(points, next_page_offset) -> dict:
+        return {
+            "documents": [point.payload.get("page_content", "No text found") for point in points],
+            "next_page_offset": next_page_offset,
+        }
 
+    @staticmethod
+    def _to_record(point, with_vectors: bool) -> dict:
+        record = {"id": point.id, "payload": point.payload}
+        if with_vectors:
+            vector = point.vector
+            if isinstance(vector, dict):
+                # Named vectors; sparse ones are models, not lists
+                vector = {
+                    name: v.model_dump() if hasattr(v, "model_dump") else v
+                    for name, v in vector.items()
+                }
+            record["vector"] = vector
+        return record
+
+    async def aretrieve(self, limit=100, page_offset=None):
+        """
+        Retrieves one page of stored documents.
+
+        :param limit: Page size.
+        :param page_offset: ``next_page_offset`` of the previous page; None for the first page.
+        :return: {"documents": [...], "next_page_offset": token or None on the last page}
+        """
+        offset = self._parse_page_offset(page_offset)
+        try:
+            points, next_page_offset = await self.async_client.scroll(
+                collection_name=self.collection_name,
+                limit=limit,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
         except Exception as e:
             logger.error(f"Error retrieving documents: {e}")
+            return {"documents": [], "next_page_offset": None}
+        return self._page(points, next_page_offset)
 
-        return {"documents": documents, "next_offset": None}
+    async def aexport(
+        self, with_vectors: bool = False, batch_size: int = EXPORT_BATCH_SIZE
+    ) -> AsyncIterator[dict]:
+        """
+        Walks the whole collection page by page, yielding one record per point
+        ({"id", "payload"} plus "vector" when requested). Only one page is held in memory.
+        """
+        offset = None
+        while True:
+            points, offset = await self.async_client.scroll(
+                collection_name=self.collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+            for point in points:
+                yield self._to_record(point, with_vectors)
+            if offset is None:
+                return
 
-    def search(self, query: str, embedding_model: str, top_k=3, filters=None):
-        """Performs a similarity search in Qdrant with optional payload filters."""
+    # --- search ---
+
+    async def asearch(self, query: str, embedding_model: str, top_k=3, filters=None, hybrid=True):
+        """
+        Performs a similarity search in Qdrant with optional payload filters.
+        With ``hybrid`` (and a collection holding sparse vectors) dense and BM25
+        results are fused with RRF in one query, and scores are fusion scores.
+        """
         try:
-            embedding = Embedding(embedding_model).get_embedding_model()
-            query_embedding = embedding.embed_query(query)
-
-            query_filter = None
-            if isinstance(filters, dict) and filters:
-                must_conditions = []
-                for key, value in filters.items():
-                    if value is None:
-                        continue
-                    try:
-                        must_conditions.append(
-                            FieldCondition(key=key, match=MatchValue(value=value))
-                        )
-                    except Exception:
-                        continue
-                if must_conditions:
-                    query_filter = Filter(must=must_conditions)
-
-            search_results = self.client.search(
+            query_embedding = await self._embedding(embedding_model).aembed_query(query)
+            query_args = self._query(query, query_embedding, top_k, filters, hybrid)
+            response = await self.async_client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_embedding,
-                limit=top_k,
+                query_filter=query_args.pop("filter", None),
+                search_params=query_args.pop("params", None),
                 with_payload=True,
-                query_filter=query_filter,
+                **query_args,
             )
-            results = []
-            for point in search_results:
-                results.append(
-                    {
-                        "id": point.id,
-                        "page_content": point.payload.get("page_content", ""),
-                        "score": point.score,
-                        "payload": {k: v for k, v in point.payload.items() if k != "page_content"},
-                    }
-                )
-            return results
+            return self._format_results(response.points)
 
         except Exception as e:
             logger.error(f"Error searching Qdrant: {e}")
+            # The collection may have been dropped or recreated behind our back
+            collection_info_cache.invalidate(self.collection_name)
             return []
 
-    def add(self, texts: list[str], embedding_model: str, payloads: list[dict] | None = None):
+    def _batch_requests(self, queries: list[dict], embeddings, hybrid: bool) -> list[QueryRequest]:
+        return [
+            QueryRequest(
+                with_payload=True,
+                **self._query(
+                    item["query"], embedding_vector, item.get("top_k", 3), item.get("filters"), hybrid
+                ),
+            )
+            for item, embedding_vector in zip(queries, embeddings)
+        ]
+
+    async def asearch_batch(self, queries: list[dict], embedding_model: str, hybrid=True):
+        """
+        Runs several searches with one embedding call and one Qdrant request.
+
+        :param queries: Dicts with "query" and optional "top_k" and "filters".
+        :return: One result list per query, in order.
+        """
+        try:
+            embeddings = await self._embedding(embedding_model).aembed_queries(
+                [item["query"] for item in queries]
+            )
+            responses = await self.async_client.query_batch_points(
+                collection_name=self.collection_name,
+                requests=self._batch_requests(queries, embeddings, hybrid),
+            )
+            return [self._format_results(response.points) for response in responses]
+
+        except Exception as e:
+            logger.error(f"Error batch searching Qdrant: {e}")
+            collection_info_cache.invalidate(self.collection_name)
+            return [[] for _ in queries]
+
+    # --- add ---
+
+    async def aadd(self, texts: list[str], embedding_model: str, payloads: list[dict] | None = None):
         """Adds multiple documents into Qdrant with embeddings and optional payloads per text."""
-        if not texts or not any(text.strip() for text in texts):
-            logger.error("No text found in the request.")
+        if not self._has_text(texts):
             return False
 
         try:
-            embedding = Embedding(embedding_model).get_embedding_model()
-            embeddings = embedding.embed_documents(texts)
-            points = []
-            for idx, (text, embedding_vector) in enumerate(zip(texts, embeddings)):
-                payload = {"page_content": text}
-                if payloads and idx < len(payloads) and isinstance(payloads[idx], dict):
-                    # Merge metadata while keeping page_content separate
-                    payload.update(payloads[idx])
-                points.append(
-                    PointStruct(
-                        id=str(uuid.uuid4()),
-                        vector=embedding_vector,
-                        payload=payload,
-                    )
-                )
-
-            self.client.upsert(collection_name=self.collection_name, points=points)
+            embeddings = await self._embedding(embedding_model).aembed_documents(texts)
+            points = self._build_points(texts, embeddings, embedding_model, payloads)
+            await self.async_client.upsert(collection_name=self.collection_name, points=points)
             return True
 
         except Exception as e:
             logger.exception(f"Error adding documents to Qdrant: {e}")
+            collection_info_cache.invalidate(self.collection_name)
             return False
 
+    def _stale_filter(self, candidate_id, points: list[PointStruct]) -> Filter:
+        """Points of ``candidate_id`` that are not among the freshly written ``points``."""
+        return Filter(
+            must=[FieldCondition(key="candidate_id", match=MatchValue(value=candidate_id))],
+            must_not=[HasIdCondition(has_id=[point.id for point in points])],
+        )
+
     @staticmethod
-    def get_or_create_qdrant_collection(
-        qdrant_host=None,
-        qdrant_port=None,
-        vector_dimension=3072,
-        collection_name=DEFAULT_COLLECTION_NAME,
-    ):
-        """Gets or creates a Qdrant collection."""
-        import os
-        if qdrant_host is None:
-            qdrant_host = os.getenv("QDRANT_HOST", "qdrant")
-        if qdrant_port is None:
-            qdrant_port = int(os.getenv("QDRANT_PORT", 6333))
+    def _with_candidate_id(texts: list[str], candidate_id, payloads) -> list[dict]:
+        """Per-text payloads, each tagged with ``candidate_id``."""
+        payloads = payloads or []
+        tagged = []
+        for idx in range(len(texts)):
+            payload = payloads[idx] if idx < len(payloads) and isinstance(payloads[idx], dict) else {}
+            tagged.append({**payload, "candidate_id": candidate_id})
+        return tagged
 
-        # TLS configuration
-        tls_enabled = os.getenv("QDRANT_TLS_ENABLED", "false").lower() == "true"
-        ca_path = os.getenv("CA_PATH", "")
+    async def areplace(self, candidate_id, texts: list[str], embedding_model: str, payloads: list[dict] | None = None):
+        """
+        Replaces every chunk stored for ``candidate_id`` with ``texts``.
+
+        The new chunks are upserted first and only then the stale ones are deleted,
+        so searches never see the document missing; they may briefly see both versions.
+        :return: {"candidate_id", "chunks", "removed"} or False on failure.
+        """
+        if not self._has_text(texts):
+            return False
 
         try:
-            if tls_enabled:
-                # Use HTTPS when TLS is enabled
-                # Note: For self-signed certs, we use verify=False
-                # In production with proper CA, set verify=True or provide CA path via REQUESTS_CA_BUNDLE env var
-                url = f"https://{qdrant_host}:{qdrant_port}"
-                client = qdrant_client.QdrantClient(
-                    url=url,
-                    https=True,
-                    verify=False,  # Skip certificate verification for self-signed certs
+            payloads = self._with_candidate_id(texts, candidate_id, payloads)
+            embeddings = await self._embedding(embedding_model).aembed_documents(texts)
+            points = self._build_points(texts, embeddings, embedding_model, payloads)
+            await self.async_client.upsert(collection_name=self.collection_name, points=points, wait=True)
+            stale_filter = self._stale_filter(candidate_id, points)
+            removed = (
+                await self.async_client.count(
+                    collection_name=self.collection_name, count_filter=stale_filter, exact=True
                 )
-            else:
-                client = qdrant_client.QdrantClient(qdrant_host, port=qdrant_port)
-
-            if not client.collection_exists(collection_name):
-                logger.error(f"Creating new Qdrant collection: {collection_name}")
-                client.create_collection(
-                    collection_name=collection_name,
-                    vectors_config=VectorParams(
-                        size=vector_dimension, distance=Distance.COSINE
-                    ),
+            ).count
+            if removed:
+                await self.async_client.delete(
+                    collection_name=self.collection_name,
+                    points_selector=FilterSelector(filter=stale_filter),
+                    wait=True,
                 )
-
-            return client, client.get_collection(collection_name)
+            return {"candidate_id": candidate_id, "chunks": len(points), "removed": removed}
 
         except Exception as e:
-            logger.error(f"Failed to connect to Qdrant: {e}")
-            raise
+            logger.exception(f"Error replacing documents of candidate {candidate_id} in Qdrant: {e}")
+            collection_info_cache.invalidate(self.collection_name)
+            return False
+
+    # --- payload indexes ---
+
+    @staticmethod
+    def configured_payload_indexes(collection_name: str) -> Dict[str, str]:
+        """Payload indexes declared for a collection in PAYLOAD_INDEXES (field -> type)."""
+        indexes = dict(PAYLOAD_INDEXES.get("*", {}))
+        indexes.update(PAYLOAD_INDEXES.get(collection_name, {}))
+        return indexes
+
+    @staticmethod
+    def _missing_payload_indexes(collection_info, indexes: Dict[str, str]) -> Dict[str, PayloadSchemaType]:
+        """
+        Indexes not yet present on the collection. Raises ValueError for unknown types.
+        """
+        existing = collection_info.payload_schema or {}
+        missing = {}
+        for field_name, field_type in indexes.items():
+            try:
+                schema = PayloadSchemaType(field_type)
+            except ValueError:
+                raise ValueError(f"Unknown payload index type {field_type} for {field_name}")
+            if field_name not in existing:
+                missing[field_name] = schema
+        return missing
+
+    @staticmethod
+    def describe_payload_indexes(collection_name: str, collection_info) -> dict:
+        """Existing, declared and missing payload indexes of a collection."""
+        existing = {
+            field_name: {"data_type": info.data_type.value, "points": info.points}
+            for field_name, info in (collection_info.payload_schema or {}).items()
+        }
+        configured = QdrantDB.configured_payload_indexes(collection_name)
+        return {
+            "indexes": existing,
+            "configured": configured,
+            "missing": [field_name for field_name in configured if field_name not in existing],
+        }
+
+    @staticmethod
+    async def aensure_payload_indexes(client, collection_name: str, collection_info, indexes=None) -> list[str]:
+        """
+        Creates the missing payload indexes (the declared ones by default).
+        Existing indexes are left alone, so this is safe to call repeatedly.
+
+        :return: Names of the fields that were indexed.
+        """
+        if indexes is None:
+            indexes = QdrantDB.configured_payload_indexes(collection_name)
+        missing = QdrantDB._missing_payload_indexes(collection_info, indexes)
+        for field_name, schema in missing.items():
+            logger.info(f"Creating {schema.value} payload index {collection_name}.{field_name}")
+            await client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=schema,
+                wait=True,
+            )
+        if missing:
+            collection_info_cache.invalidate(collection_name)
+        return list(missing)
+
+    # --- collections ---
+
+    @staticmethod
+    async def aget_existing_collection(collection_name: str):
+        """
+        Returns the info of an existing collection without ever creating it.
+        Raises CollectionNotFoundError when the collection does not exist.
+        """
+        collection_info = collection_info_cache.get(collection_name)
+        if collection_info is None:
+            client = get_async_qdrant_client()
+            if not await client.collection_exists(collection_name):
+                raise CollectionNotFoundError(f"Collection {collection_name} not found")
+            collection_info = await client.get_collection(collection_name)
+            collection_info_cache.set(collection_name, collection_info)
+        return collection_info
+
+    @staticmethod
+    def get_vector_size(collection_info) -> int:
+        """Returns the dense vector size configured for a collection."""
+        vectors = collection_info.config.params.vectors
+        if isinstance(vectors, dict):
+            # Named vectors: use the default (unnamed) one, else the first
+            vectors = vectors.get("", next(iter(vectors.values())))
+        return vectors.size
+
+    @staticmethod
+    def has_sparse_vector(collection_info) -> bool:
+        """True if the collection stores the BM25 sparse vector used by hybrid search."""
+        sparse_vectors = collection_info.config.params.sparse_vectors or {}
+        return SPARSE_VECTOR_NAME in sparse_vectors
+
+    @staticmethod
+    def _sparse_vectors_config() -> Optional[dict]:
+        if not HYBRID_SEARCH_ENABLED:
+            return None
+        # Qdrant keeps the document frequencies and applies IDF at query time
+        return {SPARSE_VECTOR_NAME: SparseVectorParams(modifier=Modifier.IDF)}
+
+    @staticmethod
+    def _create_options(collection_name: str, vector_dimension) -> dict:
+        """create_collection arguments, including the collection's declared storage settings."""
+        settings = collection_config.collection_settings(collection_name)
+        quantization = collection_config.quantization_config(settings.get("quantization"))
+        return {
+            "vectors_config": VectorParams(
+                size=vector_dimension or DEFAULT_EMBEDDING_DIMENSIONS,
+                distance=Distance.COSINE,
+                on_disk=settings.get("on_disk"),
+            ),
+            "sparse_vectors_config": QdrantDB._sparse_vectors_config(),
+            "hnsw_config": collection_config.hnsw_config(settings.get("hnsw")),
+            "quantization_config": None if quantization == Disabled.DISABLED else quantization,
+        }
+
+    @staticmethod
+    def _update_options(quantization=None, on_disk=None, hnsw=None) -> dict:
+        """update_collection arguments; only the given settings change."""
+        options = {
+            "hnsw_config": collection_config.hnsw_config(hnsw),
+            "quantization_config": collection_config.quantization_config(quantization),
+        }
+        if on_disk is not None:
+            # "" is the default (unnamed) dense vector
+            options["vectors_config"] = {"": VectorParamsDiff(on_disk=on_disk)}
+        return options
+
+    @staticmethod
+    async def aupdate_collection_config(collection_name: str, quantization=None, on_disk=None, hnsw=None):
+        """
+        Changes quantization, on-disk storage and HNSW settings of an existing collection.
+        Qdrant rebuilds the affected segments in the background.
+
+        :return: The collection's configuration after the update.
+        """
+        options = QdrantDB._update_options(quantization, on_disk, hnsw)
+        if not any(value is not None for value in options.values()):
+            raise ValueError("Nothing to update")
+        client = get_async_qdrant_client()
+        await client.update_collection(collection_name=collection_name, **options)
+        collection_info_cache.invalidate(collection_name)
+        collection_info = await client.get_collection(collection_name)
+        return collection_config.describe(collection_info, collection_config.collection_settings(collection_name))
+
+    @staticmethod
+    def _check_dimension(collection_name: str, collection_info, vector_dimension) -> None:
+        existing_dimension = QdrantDB.get_vector_size(collection_info)
+        if vector_dimension is not None and existing_dimension != vector_dimension:
+            raise ValueError(
+                f"Collection {collection_name} stores {existing_dimension}-dim vectors, "
+                f"requested {vector_dimension}"
+            )
+
+    @staticmethod
+    async def aget_or_create_qdrant_collection(
+        vector_dimension=None,
+        collection_name=DEFAULT_COLLECTION_NAME,
+    ):
+        """
+        Gets or creates a Qdrant collection and returns its info.
+        Collection metadata is served from the cache after the first lookup.
+        Raises ValueError if an existing collection has a different vector dimension.
+        """
+        client = get_async_qdrant_client()
+        collection_info = collection_info_cache.get(collection_name)
+        if collection_info is None:
+            try:
+                if not await client.collection_exists(collection_name):
+                    logger.error(f"Creating new Qdrant collection: {collection_name}")
+                    await client.create_collection(
+                        collection_name=collection_name,
+                        **QdrantDB._create_options(collection_name, vector_dimension),
+                    )
+
+                collection_info = await client.get_collection(collection_name)
+                try:
+                    if await QdrantDB.aensure_payload_indexes(client, collection_name, collection_info):
+                        collection_info = await client.get_collection(collection_name)
+                except Exception as e:
+                    # Searches still work without indexes, only slower
+                    logger.error(f"Failed to create payload indexes on {collection_name}: {e}")
+
+            except Exception as e:
+                logger.error(f"Failed to connect to Qdrant: {e}")
+                raise
+            collection_info_cache.set(collection_name, collection_info)
+
+        QdrantDB._check_dimension(collection_name, collection_info, vector_dimension)
+        return collection_info
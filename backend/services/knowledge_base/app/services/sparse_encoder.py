@@ -0,0 +1,70 @@
+import re
+import zlib
+from collections import Counter
+from typing import List
+
+from qdrant_client.http.models import SparseVector
+
+from config.constants import BM25_K1, BM25_B, BM25_AVG_DOC_LENGTH
+
+# Keeps technology names whole: c++, c#, node.js, pl/sql, ci/cd
+_TOKEN_RE = re.compile(r"\w[\w+#./-]*[\w+#]|\w", re.UNICODE)
+_SPLIT_RE = re.compile(r"[./-]")
+_STOP_WORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the to was were will with".split()
+)
+
+
+class BM25Encoder:
+    """
+    Local BM25 sparse vectors for lexical matching.
+
+    Documents get BM25 term-frequency weights; the IDF part is applied by Qdrant
+    (sparse vector with Modifier.IDF), which keeps the statistics of the whole
+    collection. Queries weight each distinct term 1. Terms map to indices by CRC32.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B, avg_doc_length: float = BM25_AVG_DOC_LENGTH):
+        self.k1 = k1
+        self.b = b
+        self.avg_doc_length = avg_doc_length
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        """Lowercased terms; compound names also yield their parts (pl/sql -> pl/sql, pl, sql)."""
+        tokens = []
+        for token in _TOKEN_RE.findall(text.lower()):
+            if token in _STOP_WORDS:
+                continue
+            tokens.append(token)
+            parts = [part for part in _SPLIT_RE.split(token) if part]
+            if len(parts) > 1:
+                tokens.extend(part for part in parts if part not in _STOP_WORDS)
+        return tokens
+
+    @staticmethod
+    def _index(term: str) -> int:
+        return zlib.crc32(term.encode("utf-8"))
+
+    def _vector(self, weights: dict) -> SparseVector:
+        by_index = {}
+        for term, weight in weights.items():
+            index = self._index(term)
+            by_index[index] = by_index.get(index, 0.0) + weight
+        return SparseVector(indices=list(by_index), values=list(by_index.values()))
+
+    def encode_document(self, text: str) -> SparseVector:
+        tokens = self.tokenize(text)
+        length_norm = 1 - self.b + self.b * len(tokens) / self.avg_doc_length
+        return self._vector(
+            {
+                term: tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+                for term, tf in Counter(tokens).items()
+            }
+        )
+
+    def encode_query(self, text: str) -> SparseVector:
+        return self._vector({term: 1.0 for term in set(self.tokenize(text))})
+
+
+bm25_encoder = BM25Encoder()
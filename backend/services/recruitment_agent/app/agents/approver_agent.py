@@ -37,7 +37,7 @@ class ApproverAgent(BaseAgent):
                 f"Candidate Profile:\n{state.parsed_cv}"
             )
 
-            raw_response = self.llm.invoke(prompt)
+            raw_response = self.llm.invoke(prompt, stage="approve_summary")
             # Safely extract string content
             if isinstance(raw_response, dict):
                 content = raw_response.get("data", "")
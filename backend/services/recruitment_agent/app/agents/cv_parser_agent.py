@@ -79,7 +79,11 @@ CV:
         cv_text = ensure_text(extract_text_from_pdf(state.cv_file_path))
         logger.debug("[cv_parser] start")
 
-        main_resp = self.llm.invoke(self._build_main_parse_prompt(cv_text))
+        main_resp = self.llm.invoke(
+            self._build_main_parse_prompt(cv_text),
+            stage="cv_parse",
+            response_format={"type": "json_object"},
+        )
         raw = getattr(main_resp, "content", None) or getattr(main_resp, "text", None) or str(main_resp or "")
         raw = unwrap_maybe_wrapper(ensure_text(raw)).strip()
         if not raw:
@@ -97,7 +101,7 @@ CV:
         parsed = coerce_types(parsed)
         logger.debug("[cv_parser] main parse ok")
 
-        lang_resp = self.llm.invoke(self._build_languages_prompt(cv_text))
+        lang_resp = self.llm.invoke(self._build_languages_prompt(cv_text), stage="cv_parse")
         lang_raw = getattr(lang_resp, "content", None) or getattr(lang_resp, "text", None) or str(lang_resp or "")
         lang_raw = unwrap_maybe_wrapper(ensure_text(lang_raw)).strip()
         lang_clean = clean_json_from_text(lang_raw)
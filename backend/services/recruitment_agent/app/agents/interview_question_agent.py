@@ -89,7 +89,7 @@ No explanation or formatting outside this JSON array.
         logger.debug(f"[InterviewQuestionAgent] Prompt sent to LLM:\n{prompt}")
 
         try:
-            response = self.llm.invoke(prompt)
+            response = self.llm.invoke(prompt, stage="interview_questions")
         except Exception as e:
             logger.error(f"[InterviewQuestionAgent] LLM invocation failed: {e}")
             state.interview_questions = []
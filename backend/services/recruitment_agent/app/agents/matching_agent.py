@@ -8,6 +8,27 @@ from config.log_config import AppLogger
 from utils.utils import *
 logger = AppLogger(__name__)
 
+# Structured output for the scoring reply, so providers return the bare JSON object
+SCORING_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ats_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "main_skills_score": {"type": "number"},
+                "extras_score": {"type": "number"},
+                "total_score": {"type": "number"},
+                "rationale": {"type": "string"},
+                "justification": {"type": "string"},
+            },
+            "required": ["main_skills_score", "extras_score", "total_score", "rationale", "justification"],
+            "additionalProperties": False,
+        },
+    },
+}
+
 
 def _build_scoring_prompt(cv_skills: List[str], jd_skills: List[str], education: List[Dict[str, Any]], languages: List[Dict[str, str]]) -> str:
     return f"""
@@ -88,6 +109,7 @@ class MatchingAgent(BaseAgent):
         best_jd_skills: List[str] = []
         best_scores_payload: Dict[str, Any] = {}
 
+        candidates: List[Tuple[Dict[str, Any], List[str]]] = []
         for jd in state.jd_list:
             jd_skills_list = jd.get("skills_required", [])
             if isinstance(jd_skills_list, str):
@@ -99,10 +121,27 @@ class MatchingAgent(BaseAgent):
             if not isinstance(jd_skills_list, list):
                 logger.error("[MatchingAgent] JD skills_required must be list or JSON-encoded list.")
                 continue
-
-            prompt = _build_scoring_prompt(cv_skills, jd_skills_list, education, languages)
+            candidates.append((jd, jd_skills_list))
+
+        # Score every JD in one batched round trip instead of one call per JD
+        prompts = [_build_scoring_prompt(cv_skills, jd_skills_list, education, languages) for _, jd_skills_list in candidates]
+        try:
+            responses = (
+                self.llm.batch_invoke(prompts, stage="match", response_format=SCORING_RESPONSE_FORMAT)
+                if prompts
+                else []
+            )
+        except Exception as e:
+            logger.error(f"[MatchingAgent] LLM batch scoring failed: {e}")
+            responses = [None] * len(prompts)
+        if len(responses) != len(prompts):
+            logger.error(f"[MatchingAgent] Expected {len(prompts)} LLM responses, got {len(responses)}")
+            responses = (list(responses) + [None] * len(prompts))[:len(prompts)]
+
+        for (jd, jd_skills_list), resp in zip(candidates, responses):
             try:
-                resp = self.llm.invoke(prompt)
+                if resp is None:
+                    raise ValueError("no response")
                 raw = getattr(resp, "content", None) or getattr(resp, "text", None) or getattr(resp, "data", None) or resp
                 main, extra, total, rationale, justification = _parse_llm_scores(raw)
                 logger.debug(f"[MatchingAgent] JD='{jd.get('position','')}' scores: main={main:.2f} extra={extra:.2f} total={total:.2f}")
@@ -41,6 +41,8 @@ SMTP_USERNAME = os.getenv("SMTP_USERNAME", "your_email@gmail.com")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "your_app_password")
 DEFAULT_CANDIDATE_EMAIL = os.getenv("DEFAULT_CANDIDATE_EMAIL", "")
 DEFAULT_MODEL = os.getenv("OPENAI_DEFAULT_MODEL", "gpt-4o-mini")
+# Must not exceed CHAT_BATCH_MAX_ITEMS on the gen_ai_provider
+CHAT_BATCH_MAX_ITEMS = int(os.getenv("CHAT_BATCH_MAX_ITEMS", 100))
 
 # Knowledge Base / RAG settings
 KNOWLEDGE_BASE_HOST = os.getenv("KNOWLEDGE_BASE_HOST", "soai_knowledge_base:8006")
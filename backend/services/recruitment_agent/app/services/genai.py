@@ -1,5 +1,6 @@
 import ssl
 import threading
+from typing import List, Optional
 import httpx
 from config.log_config import AppLogger
 from config.constants import *
@@ -31,14 +32,31 @@ def get_sync_http_client() -> httpx.Client:
 
 
 class GenAI:
-    def __init__(self, model=DEFAULT_MODEL, temperature=0.5):
+    def __init__(self, model=DEFAULT_MODEL, temperature=0.5, priority="cv_parsing"):
         self.model = model
         self.temperature = temperature
+        # Scheduling class on the gen_ai_provider (interactive, cv_parsing or bulk)
+        self.priority = priority
 
-    def invoke(self, message) -> str:
+    def _headers(self, stage: Optional[str]) -> dict:
+        headers = {
+            "Content-Type": "application/json",
+            "X-Request-Priority": self.priority,
+        }
+        if stage:
+            # Pipeline stage label for gen_ai_provider latency/token/cost metrics
+            headers["X-Caller-Stage"] = stage
+        return headers
+
+    def invoke(
+        self, message, stage: Optional[str] = None, response_format: Optional[dict] = None
+    ) -> str:
         """
         Send a message to the GenAI agent and return the response.
         Uses httpx with connection pooling for better performance.
+
+        :param stage: Pipeline stage (cv_parse, match, approve_summary, interview_questions).
+        :param response_format: Structured output, e.g. {"type": "json_object"} or a JSON schema.
         """
         messages = [{"role": "user", "content": message}]
 
@@ -48,7 +66,9 @@ class GenAI:
             "model": self.model,
             "temperature": self.temperature,
         }
-        headers = {"Content-Type": "application/json"}
+        if response_format:
+            payload["response_format"] = response_format
+        headers = self._headers(stage)
 
         try:
             client = get_sync_http_client()
@@ -66,3 +86,72 @@ class GenAI:
         except httpx.RequestError as req_err:
             logger.error(f"Request Error: {req_err}")
             raise
+
+    def batch_invoke(
+        self,
+        messages: List[str],
+        stage: Optional[str] = None,
+        response_format: Optional[dict] = None,
+    ) -> List[Optional[str]]:
+        """
+        Send several independent messages to the batch chat endpoint, in chunks of at most
+        CHAT_BATCH_MAX_ITEMS (the server-side limit).
+        Returns one reply per message, in order. Messages the batch endpoint could not
+        answer (failed chunk or failed item) are retried one by one with invoke; None
+        marks a message that failed both ways.
+        """
+        replies: List[Optional[str]] = []
+        for start in range(0, len(messages), CHAT_BATCH_MAX_ITEMS):
+            chunk = messages[start:start + CHAT_BATCH_MAX_ITEMS]
+            try:
+                chunk_replies = self._post_batch(chunk, stage, response_format)
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"GenAI batch of {len(chunk)} failed, falling back to single calls: {e}")
+                chunk_replies = [None] * len(chunk)
+            for message, reply in zip(chunk, chunk_replies):
+                if reply is None:
+                    reply = self._invoke_or_none(message, stage, response_format)
+                replies.append(reply)
+        return replies
+
+    def _post_batch(
+        self, messages: List[str], stage: Optional[str], response_format: Optional[dict]
+    ) -> List[Optional[str]]:
+        """One /chat/batch round trip. Returns a reply per message, None for failed items."""
+        url = f"{SCHEMA}://{GENAI_HOST}/api/v1/gen-ai/chat/batch"
+        payload = {
+            "requests": [[{"role": "user", "content": message}] for message in messages],
+            "model": self.model,
+            "temperature": self.temperature,
+        }
+        if response_format:
+            payload["response_format"] = response_format
+        headers = self._headers(stage)
+
+        client = get_sync_http_client()
+        # Items run in parallel upstream, but the slowest one bounds the whole batch
+        response = client.post(
+            url, json=payload, headers=headers, timeout=httpx.Timeout(180.0, connect=10.0)
+        )
+        response.raise_for_status()
+        results = response.json().get("data", [])
+        if len(results) != len(messages):
+            logger.error(f"GenAI batch returned {len(results)} results for {len(messages)} messages")
+            return [None] * len(messages)
+        replies = []
+        for i, result in enumerate(results):
+            if result.get("status") == "success":
+                replies.append(result.get("data", ""))
+            else:
+                logger.error(f"GenAI batch item {i} failed: {result.get('error')}")
+                replies.append(None)
+        return replies
+
+    def _invoke_or_none(
+        self, message: str, stage: Optional[str], response_format: Optional[dict]
+    ) -> Optional[str]:
+        try:
+            return self.invoke(message, stage=stage, response_format=response_format)
+        except httpx.HTTPError:
+            # invoke already logged the error
+            return None
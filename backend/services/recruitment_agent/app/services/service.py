@@ -264,14 +264,16 @@ class RecruitmentService:
                 for _ in chunks
             ]
 
+            # Replace keeps re-processed CVs from piling up duplicate or stale chunks
             request_body = {
+                "candidate_id": cv_application.id,
                 "texts": chunks,
                 "collection_name": QDRANT_COLLECTION,
                 "embedding_model": EMBEDDING_MODEL,
                 "payloads": payloads,
             }
             url = (
-                f"{SCHEMA}://{KNOWLEDGE_BASE_HOST}/api/v1/knowledge-base/documents/add/"
+                f"{SCHEMA}://{KNOWLEDGE_BASE_HOST}/api/v1/knowledge-base/documents/replace/"
             )
             headers = {"Content-Type": "application/json"}
 